@@ -0,0 +1,155 @@
+"""Seeded synthetic user.status corpora, shaped like the real API's results.
+
+A corpus is one problemset plus the submissions of a user and any number of
+compare handles on it. The same arguments always give the same corpus.
+
+The mixes follow what real handles look like:
+
+- contests have 5 to 8 problems, sometimes with split problems (D1/D2), and
+  ratings rise with the problem index; about 8% of problems are unrated;
+- tags are drawn by how often they appear on Codeforces (implementation,
+  math and greedy far more than 2-sat or schedules), 0 to 4 per problem;
+- a user mostly submits to problems near their own rating, and retries a
+  problem until it is accepted or given up on;
+- verdicts are about 45% OK, then wrong answers, time limits, runtime
+  errors, compilation errors and the rare memory limit;
+- contest, virtual and practice participations are mixed.
+
+Problem objects are shared between the submissions that point to them, so
+a 500k-submission corpus fits in memory; the code under test only reads
+them.
+
+    python benchmarks/corpus.py --submissions 1000 --seed 1 > user.status.json
+"""
+import argparse
+import itertools
+import json
+import random
+
+# (tag, relative frequency)
+TAGS = (
+    ("implementation", 30), ("math", 28), ("greedy", 27), ("dp", 20),
+    ("data structures", 17), ("brute force", 15), ("constructive algorithms", 15),
+    ("sortings", 11), ("graphs", 10), ("binary search", 10), ("number theory", 9),
+    ("dfs and similar", 8), ("trees", 8), ("strings", 8), ("combinatorics", 6),
+    ("two pointers", 6), ("bitmasks", 5), ("geometry", 3), ("dsu", 3),
+    ("shortest paths", 3), ("probabilities", 2), ("divide and conquer", 2),
+    ("hashing", 2), ("games", 2), ("interactive", 2), ("*special", 1), ("flows", 1),
+    ("matrices", 1), ("fft", 1), ("graph matchings", 1), ("ternary search", 1),
+    ("expression parsing", 1), ("meet-in-the-middle", 1), ("2-sat", 1),
+    ("chinese remainder theorem", 1), ("schedules", 1), ("string suffix structures", 1),
+)
+
+VERDICTS = (
+    ("OK", 45), ("WRONG_ANSWER", 30), ("TIME_LIMIT_EXCEEDED", 10), ("RUNTIME_ERROR", 5),
+    ("COMPILATION_ERROR", 5), ("MEMORY_LIMIT_EXCEEDED", 2), ("IDLENESS_LIMIT_EXCEEDED", 1),
+    ("CHALLENGED", 1), ("SKIPPED", 1),
+)
+
+PARTICIPANT_TYPES = (("PRACTICE", 55), ("CONTESTANT", 35), ("VIRTUAL", 7),
+                     ("OUT_OF_COMPETITION", 3))
+
+LANGUAGES = ("GNU C++17", "GNU C++20 (64)", "Python 3", "PyPy 3-64", "Java 21", "Rust 2021")
+
+DEFAULT_PROBLEMS = 10000  # about the size of the real problemset
+START_TIME = 1_400_000_000
+
+
+def _weighted(rng, pairs, k=1):
+    return rng.choices([item for item, _ in pairs], [weight for _, weight in pairs], k=k)
+
+
+def problemset(problems=DEFAULT_PROBLEMS, seed=0):
+    """A list of API-style problem objects, in contest order"""
+    rng = random.Random(seed)
+    result = []
+    contest_id = 0
+    while len(result) < problems:
+        contest_id += 1
+        count = rng.randint(5, 8)
+        indices = [chr(ord("A") + i) for i in range(count)]
+        if rng.random() < 0.1:
+            split = rng.randrange(2, count)
+            indices[split:split + 1] = [indices[split] + "1", indices[split] + "2"]
+        for position, index in enumerate(indices[:problems - len(result)]):
+            tags = sorted(set(_weighted(rng, TAGS, rng.choice((0, 1, 2, 2, 3, 3, 4)))))
+            problem = {"contestId": contest_id, "index": index,
+                       "name": f"Synthetic Problem {contest_id}{index}", "type": "PROGRAMMING",
+                       "tags": tags}
+            if rng.random() > 0.08:
+                base = 800 + position * 350 + rng.randint(-300, 300)
+                problem["rating"] = max(800, min(3500, base // 100 * 100))
+            result.append(problem)
+    return result
+
+
+def user_status(handle, submissions, problems, seed=0):
+    """submissions submissions by handle on problems, newest first like user.status"""
+    rng = random.Random(f"{handle}:{seed}")
+    skill = rng.randint(1000, 3000)
+    # Problems near the user's rating are tried far more often
+    cum_weights = list(itertools.accumulate(
+        1.0 / (1 + (abs(p.get("rating", skill) - skill) / 300) ** 2) for p in problems))
+    authors = {}
+    result = []
+    time = START_TIME
+    while len(result) < submissions:
+        problem = rng.choices(problems, cum_weights=cum_weights)[0]
+        attempts = rng.randint(1, 4)
+        participant_type = _weighted(rng, PARTICIPANT_TYPES)[0]
+        author = authors.get((problem["contestId"], participant_type))
+        if author is None:
+            author = authors[(problem["contestId"], participant_type)] = {
+                "contestId": problem["contestId"], "members": [{"handle": handle}],
+                "participantType": participant_type, "ghost": False,
+                "startTimeSeconds": time}
+        for attempt in range(attempts):
+            if len(result) == submissions:
+                break
+            time += rng.randint(30, 3600 if attempt else 86400)
+            verdict = _weighted(rng, VERDICTS)[0]
+            result.append({
+                "id": 0, "contestId": problem["contestId"], "creationTimeSeconds": time,
+                "relativeTimeSeconds": 2147483647, "problem": problem, "author": author,
+                "programmingLanguage": rng.choice(LANGUAGES), "verdict": verdict,
+                "testset": "TESTS", "passedTestCount": rng.randint(0, 60),
+                "timeConsumedMillis": rng.randint(15, 2000),
+                "memoryConsumedBytes": rng.randint(0, 256) * 1024 * 1024})
+            if verdict == "OK":
+                break
+    result.reverse()
+    for position, submission in enumerate(result):
+        submission["id"] = 100_000_000 + submissions - position
+    return result
+
+
+def corpus(submissions, compare=0, compare_submissions=None, problems=DEFAULT_PROBLEMS, seed=0):
+    """Return (user submissions, {compare handle: submissions}) on one problemset.
+
+    Compare handles get compare_submissions each, by default as many as the
+    user but at most 20000, so fifty of them stay affordable.
+    """
+    problem_list = problemset(problems, seed)
+    if compare_submissions is None:
+        compare_submissions = min(submissions, 20000)
+    user = user_status("bench_user", submissions, problem_list, seed)
+    others = {f"bench_compare{i}": user_status(f"bench_compare{i}", compare_submissions,
+                                               problem_list, seed)
+              for i in range(compare)}
+    return user, others
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=1000)
+    parser.add_argument("--problems", type=int, default=DEFAULT_PROBLEMS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--handle", default="bench_user")
+    args = parser.parse_args(argv)
+    result = user_status(args.handle, args.submissions, problemset(args.problems, args.seed),
+                         args.seed)
+    print(json.dumps({"status": "OK", "result": result}))
+
+
+if __name__ == "__main__":
+    main()
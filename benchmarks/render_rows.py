@@ -0,0 +1,64 @@
+"""Per-row cost of rendering a tag page.
+
+Renders synthetic tag pages of increasing size and reports the time per
+problem row, which is the slope between the smallest and largest page, so
+the fixed cost of the page head and tail drops out.
+
+    python benchmarks/render_rows.py [--repeat 7] [--compare 0,1,5]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codeforces_analyzer.comparison import Comparison, mask_of  # noqa: E402
+from codeforces_analyzer.records import ProblemTable  # noqa: E402
+from codeforces_analyzer.render import render_tag_page  # noqa: E402
+
+SIZES = (100, 1000, 10000)
+
+
+def synthetic_page(rows, compare_count, seed=1):
+    """A tag with `rows` problems and compare_count handles solving ~30% each"""
+    rng = random.Random(seed)
+    table = ProblemTable()
+    for i in range(rows):
+        table.add({"contestId": 1 + i // 6, "index": "ABCDEF"[i % 6],
+                   "name": f"Problem {i}", "rating": rng.choice((0, 800, 1200, 1900, 2600)),
+                   "tags": ["dp"]})
+    comparison = Comparison(table)
+    for h in range(compare_count):
+        comparison.add_handle(f"handle{h}",
+                              mask_of([key for key in range(rows) if rng.random() < 0.3]))
+    comparison.tag_masks["dp"] = (1 << rows) - 1
+    problems = sorted(table.records, key=lambda p: p.sort_key())
+    return list(comparison.handles), problems, comparison
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--compare", default="0,1,5",
+                        help="comma separated compare handle counts (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    print(f"{'compare':>7} " + " ".join(f"{size:>9}" for size in SIZES) + "   per row")
+    for compare_count in (int(n) for n in args.compare.split(",")):
+        times = []
+        for size in SIZES:
+            handles, problems, comparison = synthetic_page(size, compare_count)
+            number = max(1, 20000 // size)
+            best = min(timeit.repeat(
+                lambda: render_tag_page("me", handles, "dp", problems, comparison),
+                number=number, repeat=args.repeat)) / number
+            times.append(best)
+        per_row = (times[-1] - times[0]) / (SIZES[-1] - SIZES[0])
+        print(f"{compare_count:>7} " + " ".join(f"{t * 1000:7.2f}ms" for t in times)
+              + f" {per_row * 1e6:7.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Time and memory profile of each build phase on synthetic corpora.
+
+For every submission count and compare handle count, a corpus is made with
+corpus.py (no network, no Tk) and these phases are measured on their own:
+
+    organize_problems_by_tags   submissions -> problems by tag + comparison
+    create_css_file             the stylesheet
+    generate_multi_page_site    the whole site, into an empty directory
+    create_tag_page             the largest tag page
+    compute_stats               the rating histogram and tag x rating matrix
+
+Each phase is timed `--repeat` times (best and median are reported), then
+run once more under tracemalloc for its peak allocation. The results are
+written as JSON. Given a --baseline from an earlier run, phases that got
+slower than --threshold times the baseline are listed, and the exit status
+is 1:
+
+    python benchmarks/suite.py --out before.json
+    python benchmarks/suite.py --baseline before.json --out after.json
+
+The default sizes finish in a few minutes; the generator goes from 1k to
+500k submissions and up to 50 compare handles:
+
+    python benchmarks/suite.py --submissions 1000,100000,500000 --compare 0,1,50
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import corpus  # noqa: E402
+from codeforces_analyzer import (  # noqa: E402
+    __version__,
+    create_css_file,
+    create_tag_page,
+    generate_multi_page_site,
+    organize_problems_by_tags,
+)
+from codeforces_analyzer.render import tag_file_name  # noqa: E402
+from codeforces_analyzer.stats import compute_stats  # noqa: E402
+
+FORMAT = 1
+NOISE_SECONDS = 0.001  # smaller slowdowns are not reported, whatever the ratio
+PHASES = ("organize_problems_by_tags", "create_css_file", "generate_multi_page_site",
+          "create_tag_page", "compute_stats")
+
+
+def _int_list(value):
+    return [int(n) for n in value.split(",")]
+
+
+def measure(run, repeat, setup=None):
+    """Time run() repeat times, then trace one more run for its peak memory.
+
+    setup() is called before every run, outside the timing, and its result
+    is passed to run.
+    """
+    seconds = []
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        started = time.perf_counter()
+        run(argument)
+        seconds.append(time.perf_counter() - started)
+
+    argument = setup() if setup else None
+    tracemalloc.start()
+    try:
+        run(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"best": min(seconds), "median": statistics.median(seconds), "runs": seconds,
+            "peak_bytes": peak}
+
+
+def run_case(submissions, compare, compare_submissions, problems, seed, repeat, scratch):
+    user, others = corpus.corpus(submissions, compare, compare_submissions, problems, seed)
+    handles = list(others)
+    problems_by_tag, comparison = organize_problems_by_tags(user, others)
+    largest_tag = max(problems_by_tag, key=lambda tag: len(problems_by_tag[tag]))
+
+    def fresh_dir():
+        return tempfile.mkdtemp(dir=scratch)
+
+    phases = {
+        "organize_problems_by_tags": measure(
+            lambda _: organize_problems_by_tags(user, others), repeat),
+        "create_css_file": measure(create_css_file, repeat, fresh_dir),
+        "generate_multi_page_site": measure(
+            lambda site_dir: generate_multi_page_site("bench_user", handles, problems_by_tag,
+                                                      comparison, site_dir),
+            repeat, fresh_dir),
+        "create_tag_page": measure(
+            lambda site_dir: create_tag_page("bench_user", handles, largest_tag,
+                                             problems_by_tag[largest_tag], site_dir,
+                                             tag_file_name(largest_tag), comparison),
+            repeat, fresh_dir),
+        "compute_stats": measure(lambda _: compute_stats(problems_by_tag), repeat),
+    }
+    return {
+        "submissions": submissions,
+        "compare": compare,
+        "compare_submissions": sum(len(s) for s in others.values()),
+        "problems": problems,
+        "seed": seed,
+        "solved": len({problem.key for tag in problems_by_tag.values() for problem in tag}),
+        "tags": len(problems_by_tag),
+        "largest_tag_rows": len(problems_by_tag[largest_tag]),
+        "phases": phases,
+    }
+
+
+def _case_key(case):
+    return (case["submissions"], case["compare"], case["compare_submissions"], case["problems"],
+            case["seed"])
+
+
+def regressions(results, baseline, threshold):
+    """(case, phase, baseline best, best) for phases slower than threshold x baseline"""
+    before = {_case_key(case): case for case in baseline["cases"]}
+    slower = []
+    for case in results["cases"]:
+        old = before.get(_case_key(case))
+        if old is None:
+            continue
+        for phase, timing in case["phases"].items():
+            old_best = old["phases"].get(phase, {}).get("best")
+            if (old_best and timing["best"] > old_best * threshold
+                    and timing["best"] - old_best > NOISE_SECONDS):
+                slower.append((case, phase, old_best, timing["best"]))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=_int_list, default=[1000, 10000, 100000],
+                        help="comma separated submission counts (default: 1000,10000,100000)")
+    parser.add_argument("--compare", type=_int_list, default=[0, 1, 10],
+                        help="comma separated compare handle counts (default: 0,1,10)")
+    parser.add_argument("--compare-submissions", type=int,
+                        help="submissions per compare handle (default: as many as the user, "
+                             "at most 20000)")
+    parser.add_argument("--problems", type=int, default=corpus.DEFAULT_PROBLEMS,
+                        help="problemset size (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="write the JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=1.10,
+                        help="slowdown over the baseline that counts as a regression "
+                             "(default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    results = {
+        "format": FORMAT,
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "repeat": args.repeat,
+        "cases": [],
+    }
+    scratch = tempfile.mkdtemp(prefix="cf-bench-")
+    try:
+        for submissions in args.submissions:
+            for compare in args.compare:
+                print(f"{submissions} submissions, {compare} compare handles...", file=sys.stderr)
+                case = run_case(submissions, compare, args.compare_submissions, args.problems,
+                                args.seed, args.repeat, scratch)
+                results["cases"].append(case)
+                for phase in PHASES:
+                    timing = case["phases"][phase]
+                    print(f"  {phase:<26} {timing['best'] * 1000:10.1f} ms "
+                          f"{timing['peak_bytes'] / 2**20:8.1f} MiB peak", file=sys.stderr)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    output = json.dumps(results, indent=1)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        slower = regressions(results, baseline, args.threshold)
+        print(f"Compared with {args.baseline} (version {baseline.get('version')}): "
+              f"{len(slower)} regressions", file=sys.stderr)
+        for case, phase, old_best, best in slower:
+            print(f"  {case['submissions']} submissions, {case['compare']} compare: {phase} "
+                  f"{old_best * 1000:.1f} ms -> {best * 1000:.1f} ms ({best / old_best:.2f}x)",
+                  file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""Codeforces Problem Directory Generator.
+
+The package root imports nothing itself: the names below are loaded from
+the GUI-free core on first use, so `python -m codeforces_analyzer --help`
+only pays for the command line. The tkinter desktop app lives in
+codeforces_analyzer.gui and is imported when it is launched.
+"""
+# Recorded in every site's manifest.json
+__version__ = "1.1.0"
+
+_EXPORTS = {
+    "NoSubmissionsError": "core",
+    "fetch_user_submissions": "core",
+    "organize_problems_by_tags": "core",
+    "generate_directory": "core",
+    "update_directory": "core",
+    "read_site_info": "core",
+    "create_css_file": "render",
+    "generate_multi_page_site": "render",
+    "create_tag_page": "render",
+    "write_site": "render",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
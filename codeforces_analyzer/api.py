@@ -0,0 +1,243 @@
+"""Shared HTTP client for the Codeforces API.
+
+Every API call goes through one CodeforcesClient so that connections are
+kept alive, the documented call rate is respected across threads, and
+transient failures (HTTP 429/5xx, "Call limit exceeded") are retried with
+jittered exponential backoff instead of surfacing as empty results.
+"""
+import random
+import threading
+import time
+
+from .jsonstream import EnvelopeError, iter_result
+
+API_URL = "https://codeforces.com/api"
+
+# https://codeforces.com/apiHelp: "API may be requested at most 1 time per two seconds"
+DEFAULT_RATE = 0.5  # calls per second
+DEFAULT_BURST = 1
+DEFAULT_TIMEOUT = (5.0, 60.0)  # (connect, read) seconds
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 2.0  # seconds, doubled per attempt
+MAX_BACKOFF = 60.0
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class CodeforcesAPIError(Exception):
+    """An API call failed; retryable tells whether trying later may help"""
+
+    def __init__(self, message, retryable=False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class TokenBucket:
+    """Thread-safe token bucket: rate tokens per second, at most burst stored"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Take the token now, possibly going negative; callers queue up
+            # behind each other instead of racing for the next refill
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class CodeforcesClient:
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, timeout=DEFAULT_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF, log=None):
+        self.limiter = TokenBucket(rate, burst)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.log = log
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._session_lock:
+            if self._session is None:
+                # Imported here so that startup does not pay for the network stack
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def call(self, method, params=None, log=None, metrics=None):
+        """Call an API method and return its "result" field.
+
+        metrics, if given, counts the calls, retries and bytes received
+        (see metrics.Metrics).
+        """
+        log = log or self.log
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            self._before_attempt(method, attempt, last_error, log, metrics)
+            try:
+                return self._call_once(method, params, metrics)
+            except CodeforcesAPIError as e:
+                if not e.retryable:
+                    raise
+                last_error = e
+        raise self._gave_up(method, last_error)
+
+    def stream(self, method, params=None, log=None, metrics=None):
+        """Call an API method whose result is a list and yield its items.
+
+        The body is decoded incrementally, so only one item is held at a
+        time. A failure before the first item is retried like call(); once
+        items have been handed out it is raised to the caller.
+        """
+        log = log or self.log
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            self._before_attempt(method, attempt, last_error, log, metrics)
+            started = False
+            try:
+                for item in self._stream_once(method, params, metrics):
+                    started = True
+                    yield item
+                return
+            except CodeforcesAPIError as e:
+                if started or not e.retryable:
+                    raise
+                last_error = e
+        raise self._gave_up(method, last_error)
+
+    def _before_attempt(self, method, attempt, last_error, log, metrics=None):
+        if metrics is not None:
+            metrics.count("api_calls")
+        if attempt:
+            if metrics is not None:
+                metrics.count("api_retries")
+            delay = self._retry_delay(attempt, last_error)
+            if log:
+                log(f"{method}: {last_error}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+        self.limiter.acquire()
+
+    def _gave_up(self, method, last_error):
+        return CodeforcesAPIError(
+            f"{method} failed after {self.max_retries + 1} attempts: {last_error}",
+            retryable=True)
+
+    def _get(self, method, params, stream=False):
+        import requests
+        try:
+            response = self.session.get(f"{API_URL}/{method}", params=params,
+                                        timeout=self.timeout, stream=stream)
+        except requests.RequestException as e:
+            raise CodeforcesAPIError(str(e), retryable=True)
+
+        if response.status_code in RETRY_STATUS_CODES:
+            response.close()
+            error = CodeforcesAPIError(f"HTTP {response.status_code}", retryable=True)
+            error.retry_after = response.headers.get("Retry-After")
+            raise error
+        return response
+
+    def _stream_once(self, method, params, metrics=None):
+        import requests
+        response = self._get(method, params, stream=True)
+        received = [0, 0.0]  # bytes, seconds waiting for them
+        decoding = 0.0  # seconds in iter_result, network waits included
+        items = 0
+
+        def chunks():
+            body = response.iter_content(STREAM_CHUNK_SIZE)
+            while True:
+                started = time.perf_counter()
+                chunk = next(body, None)
+                received[1] += time.perf_counter() - started
+                if chunk is None:
+                    return
+                received[0] += len(chunk)
+                yield chunk
+
+        try:
+            result = iter_result(chunks())
+            while True:
+                started = time.perf_counter()
+                item = next(result, None)
+                decoding += time.perf_counter() - started
+                if item is None:
+                    return
+                items += 1
+                yield item
+        except EnvelopeError as e:
+            comment = str(e) if e.envelope is not None else f"HTTP {response.status_code}: {e}"
+            # A body that is not JSON or is cut off is treated as transient
+            raise CodeforcesAPIError(comment, retryable=e.envelope is None
+                                     or "limit exceeded" in comment.lower())
+        except requests.RequestException as e:
+            raise CodeforcesAPIError(str(e), retryable=True)
+        finally:
+            response.close()
+            # Counted once per call; per item would cost more than the decoding
+            if metrics is not None:
+                metrics.count("api_bytes", received[0])
+                metrics.count("api_network_seconds", received[1])
+                metrics.count("json_decode_seconds", decoding - received[1])
+                metrics.count("submissions_parsed", items)
+
+    def _call_once(self, method, params, metrics=None):
+        response = self._get(method, params)
+        if metrics is not None:
+            metrics.count("api_bytes", len(response.content))
+        try:
+            data = response.json()
+        except ValueError:
+            # Cloudflare and maintenance pages come back as HTML
+            raise CodeforcesAPIError(f"HTTP {response.status_code}: response is not JSON",
+                                     retryable=response.status_code >= 500)
+
+        if data.get("status") != "OK":
+            comment = data.get("comment") or f"HTTP {response.status_code}"
+            raise CodeforcesAPIError(comment, retryable="limit exceeded" in comment.lower())
+        return data.get("result")
+
+    def _retry_delay(self, attempt, error):
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        # Full jitter keeps parallel workers from retrying in lockstep
+        return random.uniform(self.backoff / 2, min(MAX_BACKOFF, self.backoff * 2 ** (attempt - 1)))
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide client shared by every API call"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = CodeforcesClient()
+        return _default_client
+
+
+def configure_client(**kwargs):
+    """Replace the shared client, e.g. configure_client(timeout=(3, 30))"""
+    global _default_client
+    with _default_client_lock:
+        _default_client = CodeforcesClient(**kwargs)
+        return _default_client
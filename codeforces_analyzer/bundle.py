@@ -0,0 +1,238 @@
+"""Bundle output: one data file plus one app page, instead of a page per tag.
+
+In page mode a problem with four tags is rendered into four tables. A
+bundle stores every solved problem once, in data.js, and index.html is a
+small app that filters by tag in the browser and only creates DOM rows for
+the part of the table that is on screen. Both files stay the same size
+whatever tag a problem has, and the first paint does not wait for
+thousands of table rows.
+
+data.js is a script rather than JSON so that it also loads from file://
+URLs, where browsers refuse fetch():
+
+    window.CF_DATA = {"user": "tourist", "compare": ["Petr"],
+                      "tags": ["dp", "math", ...],
+                      "problems": [[1520, "F", "Name", 1900, [0, 3], [0]], ...]};
+
+Each problem row is contestId, index, name, rating (0 if unrated), tag
+indices into "tags", and compare indices of the handles that solved it.
+Rows are in the same order as on the tag pages.
+"""
+import json
+
+from .records import PROBLEM_URL
+from .search import SEARCH_FILE
+from .stats import STATS_FILE
+from .timeline import TIMELINE_FILE
+from .templates import Template
+
+DATA_FILE = "data.js"
+FORMAT = 1
+
+
+def build_bundle(problems_by_tag):
+    """Return the tag list and every distinct problem once, with its tag indices"""
+    tags = list(problems_by_tag)
+    problems = {}
+    for tag_id, tag in enumerate(tags):
+        for problem in problems_by_tag[tag]:
+            problems.setdefault(problem.key, (problem, []))[1].append(tag_id)
+    return tags, sorted(problems.values(), key=lambda item: item[0].sort_key())
+
+
+def render_data(username, compare_handles, problems_by_tag, comparison):
+    tags, problems = build_bundle(problems_by_tag)
+    compare_ids = {handle: i for i, handle in enumerate(compare_handles)}
+    rows = []
+    for problem, tag_ids in problems:
+        solvers = ([compare_ids[handle] for handle in comparison.solvers(problem.key)]
+                   if compare_handles else [])
+        rows.append([problem.contest_id, problem.index, problem.name, problem.rating,
+                     tag_ids, solvers])
+    data = {"format": FORMAT, "user": username, "compare": list(compare_handles),
+            "tags": tags, "problems": rows}
+    return ("window.CF_DATA = " + json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+            + ";\n")
+
+
+APP_PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Codeforces Problems - {username}</title>
+    <link rel="stylesheet" href="style.css">
+    <style>
+        .app-controls {{ display: flex; gap: 15px; align-items: center; flex-wrap: wrap; }}
+        .app-controls select, .app-controls input {{ padding: 8px; font-size: 1rem; border-radius: 4px; }}
+        .app-controls input {{ flex: 1; min-width: 200px; border: 1px solid #ccc; }}
+        .vtable {{ box-shadow: var(--card-shadow); margin-top: 20px; background: white; }}
+        .vtable-row {{ display: grid; grid-template-columns: 70px 1fr 100px {compare_width};
+                      height: 44px; align-items: center; padding: 0 15px;
+                      border-bottom: 1px solid #e0e0e0; box-sizing: border-box;
+                      white-space: nowrap; overflow: hidden; }}
+        .vtable-head {{ background-color: var(--primary-color); color: white; font-weight: 500; }}
+        .vtable-body {{ height: 70vh; overflow-y: auto; position: relative; }}
+        .vtable-rows {{ position: absolute; left: 0; right: 0; }}
+        .vtable-row > * {{ overflow: hidden; text-overflow: ellipsis; }}
+    </style>
+    <script>
+{update_script}    </script>
+</head>
+<body>
+    <header>
+        <div class="header-content">
+            <h1>Codeforces Problems Solved by {username}</h1>
+            {comparison_info}
+            <p class="timestamp">Generated on: {timestamp}</p>
+            <div class="update-container">
+                <button id="update-button" class="update-button" onclick="updateData()">Update Data</button>
+                <p id="update-status" class="last-updated"></p>
+            </div>
+        </div>
+    </header>
+
+    <div class="container">
+        <p class="stats-link"><a href="{stats_file}">Solved problems by rating and tag</a> ·
+            <a href="{timeline_file}">Solve timeline and streaks</a></p>
+        <div class="app-controls">
+            <label for="tag-filter">Tag</label>
+            <select id="tag-filter"></select>
+            <input id="search-input" type="search" placeholder="Search, e.g. 1520F or segment tree 1900" autocomplete="off">
+            <span id="row-count"></span>
+        </div>
+        <div class="vtable">
+            <div class="vtable-row vtable-head"><span>#</span><span>Problem</span><span>Rating</span>{compare_header}</div>
+            <div class="vtable-body" id="vtable-body"><div id="vtable-spacer"><div class="vtable-rows" id="vtable-rows"></div></div></div>
+        </div>
+    </div>
+
+    <footer>
+        <p>Generated using Codeforces Problem Directory Generator</p>
+    </footer>
+    <script src="{data_file}"></script>
+    <script src="{search_file}"></script>
+    <script>
+    (function () {{
+        var ROW_HEIGHT = 44, OVERSCAN = 8;
+        var data = window.CF_DATA, problems = data.problems, compare = data.compare;
+        var body = document.getElementById('vtable-body');
+        var spacer = document.getElementById('vtable-spacer');
+        var rowsBox = document.getElementById('vtable-rows');
+        var select = document.getElementById('tag-filter');
+        var search = document.getElementById('search-input');
+        var counter = document.getElementById('row-count');
+
+        // Problem positions per tag, built once
+        var byTag = data.tags.map(function () {{ return []; }});
+        var all = [];
+        problems.forEach(function (p, i) {{
+            all.push(i);
+            p[4].forEach(function (t) {{ byTag[t].push(i); }});
+        }});
+        var option = new Option('All tags (' + all.length + ')', '');
+        select.add(option);
+        data.tags.forEach(function (tag, t) {{
+            select.add(new Option(tag + ' (' + byTag[t].length + ')', tag));
+        }});
+
+        var current = all, drawn = null, shownTag = '';
+
+        function cell(tag, text, cls) {{
+            var el = document.createElement(tag);
+            el.textContent = text;
+            if (cls) el.className = cls;
+            return el;
+        }}
+
+        function row(n, p) {{
+            var el = document.createElement('div');
+            el.className = 'vtable-row';
+            el.appendChild(cell('span', n + 1));
+            var link = cell('a', p[0] + p[1] + ' - ' + p[2], 'problem-link');
+            link.href = '{problem_url}/' + p[0] + '/' + p[1];
+            link.target = '_blank';
+            var name = document.createElement('span');
+            name.appendChild(link);
+            el.appendChild(name);
+            el.appendChild(cell('span', p[3] > 0 ? p[3] : 'Unknown', 'rating'));
+            if (compare.length === 1) {{
+                el.appendChild(cell('span', p[5].length ? '✓' : ''));
+            }} else if (compare.length) {{
+                var solved = cell('span', p[5].length ? p[5].length + '/' + compare.length : '');
+                solved.title = p[5].map(function (c) {{ return compare[c]; }}).join(', ');
+                el.appendChild(solved);
+            }}
+            return el;
+        }}
+
+        // Only the rows in view (plus a margin) exist in the DOM
+        function draw() {{
+            var first = Math.max(0, Math.floor(body.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            var last = Math.min(current.length,
+                                Math.ceil((body.scrollTop + body.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+            var key = first + ':' + last;
+            if (key === drawn) return;
+            drawn = key;
+            var fragment = document.createDocumentFragment();
+            for (var n = first; n < last; n++) fragment.appendChild(row(n, problems[current[n]]));
+            rowsBox.style.top = (first * ROW_HEIGHT) + 'px';
+            rowsBox.replaceChildren(fragment);
+        }}
+
+        // Rows of the tag, narrowed to the search results (search.js)
+        function show(tag) {{
+            var t = data.tags.indexOf(tag);
+            shownTag = t < 0 ? '' : tag;
+            current = t < 0 ? all : byTag[t];
+            if (search.value.trim() && window.CF_SEARCH) {{
+                var found = new Set(window.CF_SEARCH.query(search.value));
+                current = current.filter(function (i) {{ return found.has(i); }});
+            }}
+            select.value = shownTag;
+            counter.textContent = current.length + ' problems';
+            spacer.style.height = (current.length * ROW_HEIGHT) + 'px';
+            body.scrollTop = 0;
+            drawn = null;
+            draw();
+        }}
+
+        var pending = false;
+        body.addEventListener('scroll', function () {{
+            if (pending) return;
+            pending = true;
+            requestAnimationFrame(function () {{ pending = false; draw(); }});
+        }});
+        window.addEventListener('resize', function () {{ drawn = null; draw(); }});
+        select.addEventListener('change', function () {{
+            location.hash = select.value ? 'tag=' + encodeURIComponent(select.value) : '';
+        }});
+        function fromHash() {{
+            var match = /tag=([^&]*)/.exec(location.hash);
+            show(match ? decodeURIComponent(match[1]) : '');
+        }}
+        window.addEventListener('hashchange', fromHash);
+        search.addEventListener('input', function () {{ show(shownTag); }});
+        fromHash();
+    }})();
+    </script>
+</body>
+</html>
+""", "app_page", problem_url=PROBLEM_URL, data_file=DATA_FILE, search_file=SEARCH_FILE,
+                    stats_file=STATS_FILE, timeline_file=TIMELINE_FILE)
+
+
+def render_app(username, compare_handles, timestamp, update_script=""):
+    """The app page; update_script is the Update Data button's script (render.UPDATE_SCRIPT)"""
+    if compare_handles:
+        comparison_info = f'<div class="comparison-info">Comparing with: {", ".join(compare_handles)}</div>'
+        if len(compare_handles) == 1:
+            compare_header = f"<span>Solved by {compare_handles[0]}</span>"
+        else:
+            compare_header = f"<span>Solved by (of {len(compare_handles)})</span>"
+        compare_width = "160px"
+    else:
+        comparison_info = compare_header = compare_width = ""
+    return APP_PAGE.render(username=username, comparison_info=comparison_info,
+                           timestamp=timestamp, update_script=update_script,
+                           compare_header=compare_header, compare_width=compare_width)
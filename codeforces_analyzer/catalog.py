@@ -0,0 +1,183 @@
+"""Local copy of the Codeforces problemset (problemset.problems).
+
+The problem objects embedded in a user's submissions are snapshots from
+when they were submitted, so a problem that is re-rated or re-tagged keeps
+its old data there forever. The catalog is the current data for every
+problem, including how many people solved it, and it is refreshed on its
+own schedule, at most once per max_age. Problems are looked up by
+(contestId, index) when the site is organized (see ProblemTable), so a
+catalog refresh re-tags every site without fetching any user again.
+
+The cache is one JSON file under data_dir(), rows in API field order:
+
+    {"fetched_at": 1709287500.0,
+     "problems": [[1, "A", "Theatre Square", 1000, ["math"], 213000], ...]}
+
+A failed download touches problemset.json.failed next to it, and for
+RETRY_AFTER after that every process uses the copy it has (or none)
+without trying again, so an API outage costs one round of retries, not
+one per site.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+from .api import CodeforcesAPIError, get_client
+from .paths import data_dir
+
+MAX_AGE = 24 * 3600  # seconds
+RETRY_AFTER = 15 * 60  # seconds after a failed download
+
+
+def _ignore(*args):
+    pass
+
+
+class ProblemCatalog:
+    def __init__(self, problems, fetched_at):
+        self.problems = problems  # (contestId, index) -> API-style problem dict
+        self.fetched_at = fetched_at
+
+    def __len__(self):
+        return len(self.problems)
+
+    def get(self, contest_id, index):
+        return self.problems.get((contest_id, index))
+
+    def age(self):
+        return time.time() - self.fetched_at
+
+    @classmethod
+    def from_api(cls, result, fetched_at=None):
+        """Build a catalog from the result of problemset.problems"""
+        solved_counts = {(s.get("contestId"), s.get("index")): s.get("solvedCount", 0)
+                         for s in result.get("problemStatistics", ())}
+        problems = {}
+        for problem in result.get("problems", ()):
+            key = (problem.get("contestId"), problem.get("index"))
+            problems[key] = dict(problem, solvedCount=solved_counts.get(key, 0))
+        return cls(problems, fetched_at or time.time())
+
+    def rows(self):
+        return [[p.get("contestId"), p.get("index"), p.get("name"), p.get("rating", 0),
+                 p.get("tags", []), p.get("solvedCount", 0)] for p in self.problems.values()]
+
+    @classmethod
+    def from_rows(cls, rows, fetched_at):
+        problems = {}
+        for contest_id, index, name, rating, tags, solved_count in rows:
+            problems[(contest_id, index)] = {
+                "contestId": contest_id, "index": index, "name": name, "rating": rating,
+                "tags": tags, "solvedCount": solved_count}
+        return cls(problems, fetched_at)
+
+
+class CatalogCache:
+    """The catalog file, loaded at most once per process unless it changes"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(data_dir(), "problemset.json")
+        self.failed_path = self.path + ".failed"
+        self._catalog = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """The cached catalog, or None if there is none"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return None
+        if self._catalog is None or mtime != self._mtime:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._catalog = ProblemCatalog.from_rows(data["problems"], data["fetched_at"])
+                self._mtime = mtime
+            except (OSError, ValueError, KeyError):
+                return None
+        return self._catalog
+
+    def save(self, catalog):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # A unique temp name: other processes may be saving the catalog too
+        fd, tmp_path = tempfile.mkstemp(prefix="problemset.", suffix=".tmp",
+                                        dir=os.path.dirname(self.path))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"fetched_at": catalog.fetched_at, "problems": catalog.rows()}, f,
+                          separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self._catalog = catalog
+        self._mtime = os.path.getmtime(self.path)
+
+    def refresh(self, log=None, metrics=None):
+        """Download the problemset now and cache it"""
+        log = log or _ignore
+        log("Downloading the problemset catalog...")
+        catalog = ProblemCatalog.from_api(get_client().call("problemset.problems", log=log,
+                                                            metrics=metrics))
+        self.save(catalog)
+        if os.path.exists(self.failed_path):
+            os.remove(self.failed_path)
+        log(f"Catalog updated: {len(catalog)} problems")
+        return catalog
+
+    def last_failure(self):
+        """Time of the last failed download, or None"""
+        try:
+            return os.path.getmtime(self.failed_path)
+        except OSError:
+            return None
+
+    def _record_failure(self):
+        try:
+            os.makedirs(os.path.dirname(self.failed_path), exist_ok=True)
+            with open(self.failed_path, 'w', encoding='utf-8') as f:
+                f.write(f"{time.time()}\n")
+        except OSError:
+            pass
+
+    def get(self, log=None, max_age=MAX_AGE, metrics=None):
+        """The catalog, refreshed first if it is older than max_age.
+
+        If the refresh fails the stale copy is used; with no copy at all the
+        result is None and problems keep the data from the submissions.
+        Within RETRY_AFTER of a failed refresh no new one is tried.
+        """
+        log = log or _ignore
+        # Sites refreshed together should not each download the catalog
+        with self._lock:
+            catalog = self.load()
+            if catalog is not None and catalog.age() < max_age:
+                return catalog
+            failed_at = self.last_failure()
+            if failed_at is not None and time.time() - failed_at < RETRY_AFTER:
+                log(f"Not refreshing the problemset catalog: the last attempt failed "
+                    f"{(time.time() - failed_at) / 60:.0f} minutes ago")
+                return catalog
+            try:
+                return self.refresh(log, metrics)
+            except (CodeforcesAPIError, OSError) as e:
+                self._record_failure()
+                if catalog is None:
+                    log(f"Warning: could not download the problemset catalog: {e}")
+                else:
+                    log(f"Warning: could not refresh the problemset catalog, "
+                        f"using the copy from {catalog.age() / 3600:.0f} hours ago: {e}")
+                return catalog
+
+
+_default_cache = None
+
+
+def default_catalog():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CatalogCache()
+    return _default_cache
@@ -0,0 +1,369 @@
+"""Command line entry point.
+
+    python -m codeforces_analyzer                       launch the desktop app
+    python -m codeforces_analyzer generate --handle X   build a site headlessly
+    python -m codeforces_analyzer update --dir DIR      refresh an existing site
+    python -m codeforces_analyzer rollback --dir DIR    serve the previous release again
+    python -m codeforces_analyzer roster FILE           build the site of every handle in a roster
+    python -m codeforces_analyzer sites list            show every generated site
+    python -m codeforces_analyzer sites refresh         update sites not refreshed lately
+    python -m codeforces_analyzer sites schedule        keep every site refreshed until stopped
+    python -m codeforces_analyzer catalog refresh       download the problemset catalog now
+    python -m codeforces_analyzer serve                 serve sites with a working Update button
+"""
+import argparse
+import datetime
+import json
+import os
+import signal
+import sys
+
+# Only what building the parser needs is imported here; each command
+# imports the modules it runs, so --help and the desktop app stay fast
+from . import api
+from .events import EventStream, LogFile, PROGRESS
+from .metrics import FORMATS, Metrics, MetricsFile
+from .modes import OUTPUTS, POOLS
+from .scheduler import DEFAULT_WORKERS
+
+DEFAULT_OUTPUT_DIR = os.path.expanduser("~/codeforces_problems")
+
+
+def _log(message):
+    print(message, flush=True)
+
+
+def _print_event(event):
+    if event.kind == PROGRESS:
+        print(f"[{event.percent:3d}%] {event.message}", flush=True)
+    else:
+        print(event.message, flush=True)
+
+
+def _events(args):
+    """Event stream for a run: the terminal, plus --log-file if given"""
+    events = EventStream()
+    events.subscribe(_print_event)
+    if args.log_file:
+        events.subscribe(LogFile(args.log_file))
+    return events
+
+
+def _metrics(args):
+    """Metrics for a run, saved to --metrics-file at its end if given"""
+    metrics = Metrics()
+    if args.metrics_file:
+        metrics.subscribe(MetricsFile(args.metrics_file, args.metrics_format))
+    return metrics
+
+
+def cmd_gui(args):
+    # tkinter is only imported when the desktop app is actually wanted
+    from . import gui
+    gui.main()
+    return 0
+
+
+def cmd_generate(args):
+    from . import core
+    output_dir = args.out
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    events = _events(args)
+    index_path = core.generate_directory(
+        args.handle, args.compare, output_dir, log=events.log, progress=events.progress,
+        refetch=args.refetch, render_workers=args.render_workers, render_pool=args.render_pool,
+        output=args.output, compress=args.compress, metrics=_metrics(args))
+    events.log(f"Main page saved at: {index_path}")
+    return 0
+
+
+def cmd_update(args):
+    from . import core
+    username = args.handle
+    compare_handles = core.parse_handles(args.compare)
+    if not username:
+        info = core.read_site_info(args.dir)
+        if info is None or not info["username"]:
+            raise SystemExit(f"error: could not determine username from {args.dir}")
+        username = info["username"]
+        compare_handles = compare_handles or info["compare_handles"]
+    events = _events(args)
+    index_path = core.update_directory(
+        args.dir, username, compare_handles, log=events.log, progress=events.progress,
+        refetch=args.refetch, render_workers=args.render_workers, render_pool=args.render_pool,
+        output=args.output, compress=args.compress, metrics=_metrics(args))
+    events.log(f"Main page saved at: {index_path}")
+    return 0
+
+
+def cmd_roster(args):
+    from . import roster
+    try:
+        entries = roster.load_roster(args.file)
+    except roster.RosterError as e:
+        raise SystemExit(f"error: {e}")
+    if not entries:
+        raise SystemExit(f"error: {args.file} lists no handles")
+    events = _events(args)
+    summary = roster.build_roster(
+        entries, args.out, log=events.log, progress=events.progress, workers=args.workers,
+        pool=args.pool, refetch=args.refetch, render_workers=args.render_workers,
+        render_pool=args.render_pool, output=args.output, compress=args.compress,
+        metrics=_metrics(args))
+    if args.summary_file:
+        with open(args.summary_file, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+            f.write("\n")
+    return 1 if summary["failed"] else 0
+
+
+def cmd_rollback(args):
+    from . import publish
+    try:
+        release = publish.rollback(args.dir)
+    except FileNotFoundError as e:
+        raise SystemExit(f"error: {e}")
+    _log(f"{args.dir} now serves {release}")
+    return 0
+
+
+def _format_time(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def cmd_sites_list(args):
+    from .registry import default_registry
+    sites = default_registry().sites(args.handle)
+    for site in sites:
+        compare = f" vs {', '.join(site['compare_handles'])}" if site["compare_handles"] else ""
+        missing = "" if os.path.isdir(site["path"]) else "  (missing)"
+        _log(f"{_format_time(site['refreshed_at'])}  {site['username']}{compare}  "
+             f"{site['path']}{missing}")
+    if not sites:
+        _log("No sites registered yet")
+    return 0
+
+
+def cmd_sites_refresh(args):
+    from . import core
+    from .registry import default_registry
+    registry = default_registry()
+    for path in registry.prune():
+        _log(f"Forgetting {path}: directory no longer exists")
+    sites = registry.sites() if args.all else registry.stale(args.older_than * 3600)
+    if not sites:
+        _log("Every site is up to date")
+        return 0
+    events = _events(args)
+    results = core.refresh_sites(sites, log=events.log, progress=events.progress,
+                                 workers=args.workers)
+    return 1 if any(isinstance(result, Exception) for result in results.values()) else 0
+
+
+def cmd_sites_schedule(args):
+    from .scheduler import RefreshScheduler
+    events = _events(args)
+    scheduler = RefreshScheduler(args.interval * 60, args.workers, log=events.log,
+                                 progress=events.progress)
+
+    # Finish the sites being refreshed, then exit
+    def stop(signum, frame):
+        events.log("Stopping after the sites being refreshed now...")
+        scheduler.stop()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    scheduler.run(args.cycles)
+    return 0
+
+
+def cmd_sites_forget(args):
+    from .registry import default_registry
+    if not default_registry().forget(args.dir):
+        raise SystemExit(f"error: {args.dir} is not registered")
+    _log(f"Forgot {args.dir}")
+    return 0
+
+
+def cmd_catalog_status(args):
+    from .catalog import default_catalog
+    catalog = default_catalog().load()
+    if catalog is None:
+        _log("No problemset catalog downloaded yet")
+    else:
+        _log(f"{len(catalog)} problems, downloaded {_format_time(catalog.fetched_at)} "
+             f"({catalog.age() / 3600:.1f} hours ago)")
+    return 0
+
+
+def cmd_catalog_refresh(args):
+    from .catalog import default_catalog
+    default_catalog().refresh(_log)
+    return 0
+
+
+def cmd_serve(args):
+    from . import server
+    try:
+        server.serve(args.out, args.host, args.port, args.ttl, log=_log)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _run_options():
+    """Options of the commands that build sites, shared through parents=[...]"""
+    log_options = argparse.ArgumentParser(add_help=False)
+    log_options.add_argument("--log-file", help="also append progress and log lines to this file")
+    build_options = argparse.ArgumentParser(add_help=False, parents=[log_options])
+    build_options.add_argument("--render-workers", type=int, default=1,
+                               help="render tag pages in a pool of this many workers "
+                                    "(default: %(default)s)")
+    build_options.add_argument("--render-pool", choices=POOLS, default="thread",
+                               help="kind of worker pool for --render-workers "
+                                    "(default: %(default)s)")
+    build_options.add_argument("--output", choices=OUTPUTS,
+                               help="a page per tag, or one data file and an app page "
+                                    "(default: pages, or what the site already uses)")
+    build_options.add_argument("--compress", action="store_const", const=True,
+                               help="also write .gz (and .br, with brotli installed) copies of "
+                                    "changed files (default: what the site already uses)")
+    build_options.add_argument("--no-compress", dest="compress", action="store_const",
+                               const=False, help="stop writing compressed copies")
+    build_options.add_argument("--metrics-file",
+                               help="at the end of the run, save phase timings and counters here")
+    build_options.add_argument("--metrics-format", choices=FORMATS,
+                               help="format of --metrics-file (default: prometheus for .prom "
+                                    "files, otherwise json)")
+    return log_options, build_options
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="codeforces_analyzer",
+        description="Generate an organized directory of problems solved on Codeforces")
+    parser.add_argument("--rate", type=float, default=api.DEFAULT_RATE,
+                        help="API calls per second (default: %(default)s)")
+    parser.add_argument("--connect-timeout", type=float, default=api.DEFAULT_TIMEOUT[0],
+                        help="connect timeout in seconds (default: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=api.DEFAULT_TIMEOUT[1],
+                        help="read timeout in seconds (default: %(default)s)")
+    parser.add_argument("--max-retries", type=int, default=api.DEFAULT_MAX_RETRIES,
+                        help="retries for rate-limited or failed calls (default: %(default)s)")
+    log_options, build_options = _run_options()
+    subparsers = parser.add_subparsers(dest="command")
+
+    gui_parser = subparsers.add_parser("gui", help="launch the desktop app (default)")
+    gui_parser.set_defaults(func=cmd_gui)
+
+    generate_parser = subparsers.add_parser("generate", parents=[build_options],
+                                            help="build a new directory")
+    generate_parser.add_argument("--handle", required=True, help="Codeforces username")
+    generate_parser.add_argument("--compare", action="append",
+                                 help="handle(s) to compare with; repeat or separate with commas")
+    generate_parser.add_argument("--out", default=DEFAULT_OUTPUT_DIR,
+                                 help="output directory (default: %(default)s)")
+    generate_parser.add_argument("--refetch", action="store_true",
+                                 help="ignore stored submissions and download the full history")
+    generate_parser.set_defaults(func=cmd_generate)
+
+    update_parser = subparsers.add_parser("update", parents=[build_options],
+                                          help="refresh an existing directory")
+    update_parser.add_argument("--dir", required=True, help="generated codeforces_<handle> directory")
+    update_parser.add_argument("--handle", help="override the handle read from the directory")
+    update_parser.add_argument("--compare", action="append",
+                               help="override the compare handles read from the directory")
+    update_parser.add_argument("--refetch", action="store_true",
+                               help="ignore stored submissions and download the full history")
+    update_parser.set_defaults(func=cmd_update)
+
+    roster_parser = subparsers.add_parser(
+        "roster", parents=[build_options],
+        help="build the sites of every handle in a CSV or JSON roster")
+    roster_parser.add_argument("file", help="CSV with handle and compare columns, or a .json list")
+    roster_parser.add_argument("--out", default=DEFAULT_OUTPUT_DIR,
+                               help="output directory (default: %(default)s)")
+    roster_parser.add_argument("--workers", type=int,
+                               help="sites built at once (default: one per core)")
+    roster_parser.add_argument("--pool", choices=POOLS, default="process",
+                               help="build the sites in threads or processes (default: %(default)s)")
+    roster_parser.add_argument("--refetch", action="store_true",
+                               help="ignore stored submissions and download the full histories")
+    roster_parser.add_argument("--summary-file",
+                               help="save the run's summary, failures included, here as JSON")
+    roster_parser.set_defaults(func=cmd_roster)
+
+    rollback_parser = subparsers.add_parser("rollback", help="go back to the previous release")
+    rollback_parser.add_argument("--dir", required=True, help="generated codeforces_<handle> directory")
+    rollback_parser.set_defaults(func=cmd_rollback)
+
+    sites_parser = subparsers.add_parser("sites", help="list and refresh every generated site")
+    sites_subparsers = sites_parser.add_subparsers(dest="sites_command", required=True)
+    list_parser = sites_subparsers.add_parser("list", help="show registered sites, newest first")
+    list_parser.add_argument("--handle", help="only sites for this handle")
+    list_parser.set_defaults(func=cmd_sites_list)
+    refresh_parser = sites_subparsers.add_parser("refresh", parents=[log_options],
+                                                 help="update stale sites")
+    refresh_parser.add_argument("--older-than", type=float, default=24, metavar="HOURS",
+                                help="refresh sites not refreshed for this long (default: %(default)s)")
+    refresh_parser.add_argument("--all", action="store_true", help="refresh every site")
+    refresh_parser.add_argument("--workers", type=int, default=1,
+                                help="sites refreshed at once (default: %(default)s)")
+    refresh_parser.set_defaults(func=cmd_sites_refresh)
+    schedule_parser = sites_subparsers.add_parser(
+        "schedule", parents=[log_options],
+        help="refresh every site at an interval until stopped")
+    schedule_parser.add_argument("--interval", type=float, default=60, metavar="MINUTES",
+                                 help="time between the starts of two cycles (default: %(default)s)")
+    schedule_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                                 help="sites refreshed at once (default: %(default)s)")
+    schedule_parser.add_argument("--cycles", type=int,
+                                 help="stop after this many cycles (default: run until stopped)")
+    schedule_parser.set_defaults(func=cmd_sites_schedule)
+    forget_parser = sites_subparsers.add_parser("forget", help="remove a site from the registry")
+    forget_parser.add_argument("--dir", required=True, help="generated codeforces_<handle> directory")
+    forget_parser.set_defaults(func=cmd_sites_forget)
+
+    catalog_parser = subparsers.add_parser(
+        "catalog", help="the cached problemset that supplies ratings and tags")
+    catalog_subparsers = catalog_parser.add_subparsers(dest="catalog_command", required=True)
+    status_parser = catalog_subparsers.add_parser("status", help="show the cached catalog's age and size")
+    status_parser.set_defaults(func=cmd_catalog_status)
+    download_parser = catalog_subparsers.add_parser("refresh", help="download the problemset now")
+    download_parser.set_defaults(func=cmd_catalog_refresh)
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="serve the generated sites locally, with a working Update Data button")
+    serve_parser.add_argument("--out", default=DEFAULT_OUTPUT_DIR,
+                              help="directory holding the codeforces_<handle> sites "
+                                   "(default: %(default)s)")
+    serve_parser.add_argument("--host", default="127.0.0.1",
+                              help="address to listen on (default: %(default)s)")
+    serve_parser.add_argument("--port", type=int, default=8000,
+                              help="port to listen on (default: %(default)s)")
+    serve_parser.add_argument("--ttl", type=float, default=60, metavar="SECONDS",
+                              help="reuse a refresh result this long (default: %(default)s)")
+    serve_parser.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    api.configure_client(rate=args.rate, timeout=(args.connect_timeout, args.timeout),
+                         max_retries=args.max_retries)
+    func = getattr(args, "func", cmd_gui)
+    try:
+        sys.exit(func(args))
+    except api.CodeforcesAPIError as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        # Only the commands that build sites have loaded core by now
+        from .core import NoSubmissionsError
+        if not isinstance(e, NoSubmissionsError):
+            raise
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,104 @@
+"""Solved-set bitsets for comparing one handle against many.
+
+Every problem seen in a run has an integer key in the shared ProblemTable
+(records.py), which is also its bit position. A handle's solved set is then
+a single Python int with those bits set, so overlaps are an AND plus a
+popcount, however many problems there are.
+
+"Solved by k of N" is kept as a bit-sliced counter: plane i holds bit i of
+every problem's count, built by rippling each handle's mask through the
+planes like a binary adder. Reading a count costs len(planes) bit tests,
+i.e. about log2(N). Single-bit tests go through byte copies of the planes
+and masks, because shifting a bitset with thousands of problems to read
+one bit costs time proportional to its length.
+"""
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+else:
+    def popcount(mask):
+        return bin(mask).count("1")
+
+
+def mask_of(keys):
+    """Build a bitset from problem keys in one pass over a bytearray"""
+    if not keys:
+        return 0
+    bits = bytearray(max(keys) // 8 + 1)
+    for key in keys:
+        bits[key >> 3] |= 1 << (key & 7)
+    return int.from_bytes(bits, "little")
+
+
+class Comparison:
+    """Solved sets of the compare handles over a shared ProblemTable.
+
+    tag_masks holds, per tag, the problems the main handle solved, so the
+    per-tag overlap counts on the index cards are popcounts too.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.tag_masks = {}
+        self.handles = []
+        self.masks = {}
+        self.union = 0
+        self.planes = []
+        self._bytes = None
+
+    def add_handle(self, handle, mask):
+        self.handles.append(handle)
+        self.masks[handle] = mask
+        self.union |= mask
+        # Ripple-carry the new mask into the per-problem counters
+        carry = mask
+        for i, plane in enumerate(self.planes):
+            self.planes[i], carry = plane ^ carry, plane & carry
+            if not carry:
+                break
+        if carry:
+            self.planes.append(carry)
+        self._bytes = None
+
+    def __bool__(self):
+        return bool(self.handles)
+
+    def __len__(self):
+        return len(self.handles)
+
+    def _byte_views(self):
+        # Rebuilt when a handle is added or the table has grown past them
+        size = len(self.table) // 8 + 1
+        if self._bytes is None or self._bytes[0] != size:
+            self._bytes = (
+                size,
+                [plane.to_bytes(size, "little") for plane in self.planes],
+                [(handle, self.masks[handle].to_bytes(size, "little")) for handle in self.handles],
+            )
+        return self._bytes
+
+    def solved_count(self, key):
+        """How many compare handles solved the problem with this key"""
+        _, planes, _ = self._byte_views()
+        byte, bit = key >> 3, key & 7
+        count = 0
+        for i, plane in enumerate(planes):
+            count |= ((plane[byte] >> bit) & 1) << i
+        return count
+
+    def solvers(self, key):
+        _, _, masks = self._byte_views()
+        byte, bit = key >> 3, key & 7
+        return [handle for handle, mask in masks if (mask[byte] >> bit) & 1]
+
+    def overlap(self, mask):
+        """Problems in mask solved by at least one compare handle"""
+        return popcount(mask & self.union)
+
+    def overlap_by_handle(self, mask):
+        return {handle: popcount(mask & self.masks[handle]) for handle in self.handles}
+
+    def tag_overlap(self, tag):
+        return self.overlap(self.tag_masks.get(tag, 0))
+
+    def tag_overlap_by_handle(self, tag):
+        return self.overlap_by_handle(self.tag_masks.get(tag, 0))
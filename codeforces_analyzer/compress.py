@@ -0,0 +1,100 @@
+"""Precompressed copies of the site's files, for web servers that serve them.
+
+With compression on, every file the site writes gets a gzip copy next to it
+(index.html.gz), and a brotli copy (index.html.br) when the brotli module
+is installed. A server such as nginx with gzip_static/brotli_static then
+sends those as they are instead of compressing each response.
+
+Copies are made when their file is written, so an update only compresses
+the pages that changed. Compression is deterministic (no timestamp in the
+gzip header), so an unchanged page always has the same copies.
+"""
+import gzip
+import os
+import tempfile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+# Copies are served like the pages they are made from
+FILE_MODE = 0o644
+
+
+def _gzip(data):
+    return gzip.compress(data, GZIP_LEVEL, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+
+# (suffix, compress) for every encoding available here
+ENCODINGS = [(".gz", _gzip)]
+if brotli is not None:
+    ENCODINGS.append((".br", _brotli))
+
+# Every suffix this module ever writes, so stale copies are found even if
+# the encoding is not available in this run
+SUFFIXES = (".gz", ".br")
+
+
+def compressed_paths(path):
+    return [path + suffix for suffix in SUFFIXES]
+
+
+def has_compressed(path):
+    return all(os.path.exists(path + suffix) for suffix, _ in ENCODINGS)
+
+
+def compress_file(path):
+    """Write the compressed copies of path; returns {suffix: size}"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    sizes = {}
+    for suffix, compress in ENCODINGS:
+        compressed = compress(data)
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + suffix + ".",
+                                        suffix=".tmp", dir=os.path.dirname(path) or ".")
+        try:
+            os.chmod(tmp_path, FILE_MODE)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path + suffix)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        sizes[suffix] = len(compressed)
+    return sizes
+
+
+def remove_compressed(path):
+    """Delete any compressed copies of path; returns the suffixes removed"""
+    removed = []
+    for suffix in SUFFIXES:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+            removed.append(suffix)
+    return removed
+
+
+def size_report(files):
+    """Lines of a raw vs compressed size table for [(name, raw size, {suffix: size})]"""
+    suffixes = [suffix for suffix, _ in ENCODINGS]
+    width = max([len(name) for name, _, _ in files] + [len("total")])
+    lines = [f"{'file':<{width}}  {'raw':>10}" + "".join(f"  {suffix:>16}" for suffix in suffixes)]
+
+    def line(name, raw, sizes):
+        cells = "".join(f"  {sizes[suffix]:>10,} {sizes[suffix] / raw if raw else 0:>5.0%}"
+                        for suffix in suffixes)
+        return f"{name:<{width}}  {raw:>10,}" + cells
+
+    for name, raw, sizes in files:
+        lines.append(line(name, raw, sizes))
+    if len(files) > 1:
+        totals = {suffix: sum(sizes[suffix] for _, _, sizes in files) for suffix in suffixes}
+        lines.append(line("total", sum(raw for _, raw, _ in files), totals))
+    return lines
@@ -0,0 +1,638 @@
+"""GUI-free core: fetch submissions, organize them and write the site.
+
+Nothing in here touches tkinter, so it can run from cron on a headless box.
+Progress is reported through two optional callbacks:
+
+    log(message)                 one line for the process log
+    progress(percent, message)   a step of the overall run
+"""
+import datetime
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import publish
+from .manifest import FORMAT, GENERATOR, MANIFEST_NAME, load_manifest
+from .render import write_site
+from .api import CodeforcesAPIError, get_client
+from .catalog import default_catalog
+from .comparison import Comparison, mask_of
+from .metrics import Metrics
+from .records import Problem, ProblemTable
+from .registry import default_registry
+from .store import StoredSubmissions, default_store
+from .timeline import Timeline, load_timeline
+
+# Handles fetched at once; the shared client's rate limiter still spaces out
+# the calls, this only lets slow downloads overlap
+FETCH_WORKERS = 4
+
+# Incremental fetches start small and double, so a refresh costs roughly
+# as many submissions as were made since the last run
+FIRST_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 5000
+
+UNCATEGORIZED = ("Uncategorized",)
+
+
+class NoSubmissionsError(Exception):
+    """Raised when a handle has no submissions to build a directory from"""
+
+
+def _ignore(*args):
+    pass
+
+
+def _iter_new_submissions(username, last_id, log, metrics=None):
+    """Yield submissions newer than last_id, newest first, as they are decoded"""
+    client = get_client()
+    if last_id is None:
+        yield from client.stream("user.status", {"handle": username}, log=log, metrics=metrics)
+        return
+
+    # Page through user.status until reaching last_id
+    start = 1
+    count = FIRST_PAGE_SIZE
+    while True:
+        params = {"handle": username, "from": start, "count": count}
+        seen = 0
+        for submission in client.stream("user.status", params, log=log, metrics=metrics):
+            if submission["id"] <= last_id:
+                return
+            seen += 1
+            yield submission
+        if seen < count:
+            return
+        start += count
+        count = min(count * 2, MAX_PAGE_SIZE)
+
+
+def fetch_user_submissions(username, log=None, store=None, refetch=False, metrics=None):
+    """Return the accepted submissions of username, newest first.
+
+    Only submissions newer than the store's high-water mark are downloaded,
+    and they are streamed straight into the store. The result is a lazy,
+    re-iterable view that reads the store when iterated.
+    """
+    log = log or _ignore
+    store = store or default_store()
+    if refetch:
+        store.clear(username)
+    last_id = store.last_id(username)
+    try:
+        return store.update(username, _iter_new_submissions(username, last_id, log, metrics))
+    except CodeforcesAPIError as e:
+        # A transient outage should not wipe out a handle we already know
+        if last_id is None or not e.retryable:
+            raise
+        log(f"Warning: could not fetch new submissions for {username}: {e}")
+        log(f"Using stored submissions for {username}")
+        return StoredSubmissions(store, username)
+
+
+class _Flight:
+    __slots__ = ("done", "result", "finished")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.finished = None
+
+
+class SingleFlight:
+    """Runs a function at most once at a time per key, sharing its result.
+
+    Callers that ask for a key whose function is running wait for it
+    instead of running it again. The result, or the exception raised, is
+    then handed out for max_age seconds, or for good without a max_age.
+    With keep_errors=False an exception only reaches the callers that
+    waited for that run, and the next caller runs the function again.
+    """
+
+    def __init__(self, max_age=None, keep_errors=True):
+        self.max_age = max_age
+        self.keep_errors = keep_errors
+        self.runs = 0
+        self.hits = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def _expired(self, flight):
+        return (self.max_age is not None and flight.done.is_set()
+                and time.monotonic() - flight.finished > self.max_age)
+
+    def do(self, key, function):
+        return self.run(key, function)[0]
+
+    def run(self, key, function):
+        """Like do(), but returns (result, shared): shared is True when the
+        result came from another caller's run"""
+        with self._lock:
+            flight = self._flights.get(key)
+            owner = flight is None or self._expired(flight)
+            if owner:
+                flight = self._flights[key] = _Flight()
+                self.runs += 1
+            else:
+                self.hits += 1
+        if owner:
+            try:
+                flight.result = function()
+            except Exception as e:
+                flight.result = e
+            finally:
+                flight.finished = time.monotonic()
+                flight.done.set()
+            if isinstance(flight.result, Exception) and not self.keep_errors:
+                with self._lock:
+                    if self._flights.get(key) is flight:
+                        del self._flights[key]
+        else:
+            flight.done.wait()
+        if isinstance(flight.result, Exception):
+            raise flight.result
+        return flight.result, not owner
+
+
+class FetchCache:
+    """Fetch results shared by several runs, so that each handle is fetched once.
+
+    A handle that another thread is already fetching is waited for rather
+    than fetched again. Failures are kept too, unless keep_errors is False:
+    every run that wants the handle gets the same exception. With max_age,
+    a handle is fetched again once its last result is older than that many
+    seconds.
+    """
+
+    def __init__(self, refetch=False, max_age=None, keep_errors=True):
+        self.refetch = refetch
+        self._flights = SingleFlight(max_age, keep_errors)
+
+    @property
+    def fetches(self):
+        return self._flights.runs
+
+    @property
+    def hits(self):
+        return self._flights.hits
+
+    def fetch(self, handle, log=None, metrics=None):
+        # Handles are case-insensitive
+        return self._flights.do(handle.lower(), lambda: fetch_user_submissions(
+            handle, log, refetch=self.refetch, metrics=metrics))
+
+
+def _solved_keys(submissions, table):
+    keys = set()
+    for submission in submissions:
+        if submission.get("verdict") == "OK" and "problem" in submission:
+            keys.add(table.add(submission["problem"]))
+    return keys
+
+
+def organize_problems_by_tags(submissions, compare_submissions=None, table=None, catalog=None):
+    """Group the solved problems of submissions by tag.
+
+    compare_submissions maps each compare handle to its submissions. Pass
+    the same table to several calls to share one set of problem records
+    between them. With a catalog, names, ratings and tags come from it
+    rather than from the submissions. Returns (problems_by_tag, comparison): problems_by_tag
+    maps each tag to Problem records, and comparison holds the shared
+    table and the compare handles' solved bitsets.
+    """
+    table = table if table is not None else ProblemTable(catalog)
+    problems_by_tag = defaultdict(list)
+    tag_keys = defaultdict(list)
+    solved = set()  # To avoid duplicates
+
+    for submission in submissions:
+        if submission.get("verdict") == "OK" and "problem" in submission:
+            key = table.add(submission["problem"])
+            if key not in solved:
+                solved.add(key)
+                problem = table[key]
+
+                # Add to each tag category
+                for tag in problem.tags or UNCATEGORIZED:
+                    problems_by_tag[tag].append(problem)
+                    tag_keys[tag].append(key)
+
+    # One bitset per compare handle over the same problem table
+    comparison = Comparison(table)
+    for handle, handle_submissions in (compare_submissions or {}).items():
+        comparison.add_handle(handle, mask_of(_solved_keys(handle_submissions, table)))
+    comparison.tag_masks = {tag: mask_of(keys) for tag, keys in tag_keys.items()}
+
+    # Sort problems by rating within each tag
+    for tag in problems_by_tag:
+        problems_by_tag[tag].sort(key=Problem.sort_key)
+
+    # Sort tags alphabetically
+    return dict(sorted(problems_by_tag.items())), comparison
+
+
+def parse_handles(value):
+    """Turn "a, b c" or ["a", "b,c"] into ["a", "b", "c"], dropping duplicates"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    handles = []
+    for item in value:
+        handles.extend(h for h in item.replace(",", " ").split() if h)
+    return list(dict.fromkeys(handles))
+
+
+def site_dir_for(output_dir, username):
+    return os.path.join(output_dir, f"codeforces_{username}")
+
+
+def fetch_handles(handles, log=None, progress=None, refetch=False, max_workers=FETCH_WORKERS,
+                  start=10, end=30, metrics=None, cache=None):
+    """Fetch several handles concurrently.
+
+    Returns a dict mapping each handle to its submissions, or to the
+    exception that fetching it raised. progress is reported per handle as
+    each one finishes, moving from start to end percent. With a FetchCache,
+    handles it already holds are not fetched again.
+    """
+    log = log or _ignore
+    progress = progress or _ignore
+    metrics = metrics or Metrics()
+    handles = list(dict.fromkeys(handles))  # drop duplicates, keep order
+    results = {}
+    if not handles:
+        return results
+
+    def fetch(handle):
+        if cache is not None:
+            return cache.fetch(handle, log, metrics)
+        return fetch_user_submissions(handle, log, refetch=refetch, metrics=metrics)
+
+    # A roster can have hundreds of handles; name them only when there are a few
+    names = ', '.join(handles) if len(handles) <= 5 else f"{len(handles)} handles"
+    progress(start, f"Fetching submissions for {names}...")
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(handles))) as executor:
+        futures = {executor.submit(fetch, handle): handle for handle in handles}
+        for done, future in enumerate(as_completed(futures), 1):
+            handle = futures[future]
+            try:
+                results[handle] = future.result()
+                metrics.count("submissions_new", results[handle].new_count)
+                metrics.count("submissions_total", results[handle].total)
+                message = (f"Fetched {results[handle].new_count} new submissions for {handle} "
+                           f"({results[handle].total} in total)")
+            except Exception as e:
+                results[handle] = e
+                metrics.count("fetch_errors")
+                message = f"Error fetching submissions for {handle}: {e}"
+            progress(start + (end - start) * done // len(handles),
+                     f"{message} ({done}/{len(handles)})")
+    return results
+
+
+def _handle_info(result):
+    """Manifest entry for one fetched handle"""
+    if isinstance(result, Exception):
+        return {"error": str(result)}
+    return {"last_id": result.store.last_id(result.handle), "submissions": result.total,
+            "new": result.new_count}
+
+
+def _fetch_and_organize(username, compare_handles, log, progress, refetch, metrics,
+                        fetch_cache=None, site_dir=None, catalog_cache=None):
+    """Return problems_by_tag, the comparison, the solve timeline and the site's manifest fields.
+
+    The timeline saved in site_dir is brought up to date with the
+    submissions it has not seen yet.
+    """
+    # Step 1: Fetch the user's and every compare handle's submissions together;
+    # the problemset catalog is only downloaded when the cached one is stale
+    with metrics.phase("catalog"):
+        catalog = (catalog_cache or default_catalog()).get(log, metrics=metrics)
+    with metrics.phase("fetch"):
+        results = fetch_handles([username] + compare_handles, log, progress, refetch,
+                                metrics=metrics, cache=fetch_cache)
+
+    submissions = results[username]
+    if isinstance(submissions, Exception):
+        raise submissions
+    if not submissions:
+        raise NoSubmissionsError(f"No submissions found for {username}")
+
+    # Step 2: A missing compare handle only weakens the comparison
+    compare_submissions = {}
+    for compare_handle in compare_handles:
+        handle_submissions = results[compare_handle]
+        if isinstance(handle_submissions, Exception):
+            log(f"Warning: could not fetch {compare_handle}: {handle_submissions}; "
+                f"comparison will omit it")
+            handle_submissions = []
+        elif not handle_submissions:
+            log(f"Warning: No submissions found for comparison handle {compare_handle}")
+            handle_submissions = []
+        compare_submissions[compare_handle] = handle_submissions
+
+    # Step 3: Extract solved problems and organize by tags
+    progress(30, "Organizing problems by tags...")
+    with metrics.phase("organize"):
+        problems_by_tag, comparison = organize_problems_by_tags(submissions, compare_submissions,
+                                                                catalog=catalog)
+    metrics.count("problems", len({problem.key for problems in problems_by_tag.values()
+                                   for problem in problems}))
+    metrics.count("tags", len(problems_by_tag))
+    metrics.count("compare_handles", len(compare_handles))
+
+    # Step 4: Fold the submissions since the last run into the solve timeline
+    with metrics.phase("timeline"):
+        timeline = None if refetch or site_dir is None else load_timeline(site_dir, username)
+        incremental = timeline is not None
+        timeline = timeline or Timeline(username)
+        new_solves = timeline.update(submissions, comparison.table,
+                                     submissions.store.last_id(submissions.handle))
+    metrics.count("timeline_solves", new_solves)
+    log(f"Timeline: {new_solves} newly solved problems "
+        f"({'incremental' if incremental else 'full pass'}), {len(timeline)} in total")
+
+    info = {
+        "format": FORMAT,
+        "generator": GENERATOR,
+        "generated_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "username": username,
+        "compare_handles": compare_handles,
+        "handles": {handle: _handle_info(result) for handle, result in results.items()},
+        "catalog": {"fetched_at": catalog.fetched_at, "problems": len(catalog)} if catalog else None,
+        "timeline": {"solved": len(timeline), "new": new_solves, "incremental": incremental},
+        "timing": {
+            "fetch": round(metrics.phases["catalog"] + metrics.phases["fetch"], 3),
+            "organize": round(metrics.phases["organize"], 3),
+            "timeline": round(metrics.phases["timeline"], 3),
+        },
+    }
+    return problems_by_tag, comparison, timeline, info
+
+
+def _build_and_publish(site_dir, username, compare_handles, problems_by_tag, comparison, info,
+                       log, metrics, render_workers=1, render_pool="thread", output=None,
+                       compress=None, timeline=None):
+    """Write the site into a staging release and swap it in if anything changed"""
+    # Runs on the same site take turns, from staging until the old releases are pruned
+    with publish.site_lock(site_dir):
+        # A site keeps the output mode and compression it was generated with unless told otherwise
+        manifest = load_manifest(site_dir)
+        info["output"] = output or manifest.get("output") or "pages"
+        info["compress"] = compress if compress is not None else manifest.get("compress", False)
+        with metrics.phase("render"):
+            staging = publish.stage(site_dir)
+            try:
+                writer = write_site(username, compare_handles, problems_by_tag, comparison,
+                                    staging, render_workers, render_pool, info, info["output"],
+                                    info["compress"], timeline)
+            except BaseException:
+                publish.discard(staging)
+                raise
+        metrics.count("pages_written", len(writer.written))
+        metrics.count("pages_unchanged", len(writer.skipped))
+        metrics.count("pages_removed", len(writer.removed))
+        metrics.count("bytes_written", writer.bytes_written)
+        metrics.count("files_compressed", len(writer.compressed))
+        log(writer.summary())
+        for line in writer.size_report():
+            log(line)
+        search_info = writer.manifest["search"]
+        log(f"Search index: {search_info['tokens']} tokens, "
+            f"{search_info['bytes'] / 1024:.0f} KiB, "
+            f"built in {writer.manifest['timing']['search'] * 1000:.0f} ms")
+        with metrics.phase("publish"):
+            if writer.written or writer.removed or writer.compressed or writer.removed_copies:
+                publish.publish(site_dir, staging)
+            else:
+                # No page changed, so keep serving the live release; only its manifest
+                # (high-water marks, timing) is brought up to date, with one rename
+                os.replace(os.path.join(staging, MANIFEST_NAME),
+                           os.path.join(site_dir, MANIFEST_NAME))
+                publish.discard(staging)
+
+    try:
+        default_registry().record(site_dir, username, compare_handles)
+    except sqlite3.Error as e:
+        # The site itself is fine; it just won't show up in auto-detect
+        log(f"Warning: could not record {site_dir} in the site registry: {e}")
+    return os.path.join(site_dir, "index.html")
+
+
+def generate_directory(username, compare_handles, output_dir, log=None, progress=None,
+                       refetch=False, render_workers=1, render_pool="thread", output=None,
+                       compress=None, metrics=None, fetch_cache=None, catalog_cache=None):
+    """Build a fresh site under output_dir and return the path of its index page.
+
+    compare_handles is a list of handles, or a comma separated string.
+    render_workers > 1 renders the tag pages in a "thread" or "process" pool.
+    output is "pages" (a page per tag) or "bundle" (a data file and an app
+    page); by default an existing site keeps its mode and a new one gets pages.
+    compress writes .gz (and .br, with brotli installed) copies of changed
+    files; it is also kept from the last run unless given.
+    metrics collects the run's phase timings and counters (see metrics.py).
+    fetch_cache is a FetchCache shared with other runs, e.g. of a refresh
+    cycle, so handles they have in common are fetched only once.
+    catalog_cache supplies the problemset catalog (default_catalog() by
+    default) through its get() method.
+    """
+    log = log or _ignore
+    progress = progress or _ignore
+    compare_handles = [h for h in parse_handles(compare_handles) if h != username]
+    metrics = metrics or Metrics()
+    metrics.labels.setdefault("handle", username)
+
+    # Build next to the live site; pages already there are only rewritten if they changed
+    site_dir = site_dir_for(output_dir, username)
+
+    with metrics.run():
+        problems_by_tag, comparison, timeline, info = _fetch_and_organize(
+            username, compare_handles, log, progress, refetch, metrics, fetch_cache, site_dir,
+            catalog_cache)
+
+        # Step 5: Generate the directory files
+        progress(60, "Generating directory files...")
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Generate the stylesheet, index and tag pages, then publish them at once
+        index_path = _build_and_publish(site_dir, username, compare_handles, problems_by_tag,
+                                        comparison, info, log, metrics, render_workers, render_pool,
+                                        output, compress, timeline)
+
+        # Step 6: Complete
+        log(metrics.summary())
+        progress(100, f"Directory generated successfully at {index_path}")
+        return index_path
+
+
+def update_directory(dir_path, username, compare_handles, log=None, progress=None,
+                     refetch=False, render_workers=1, render_pool="thread", output=None,
+                     compress=None, metrics=None, fetch_cache=None, catalog_cache=None):
+    """Refresh an existing site in place and return the path of its index page"""
+    log = log or _ignore
+    progress = progress or _ignore
+    compare_handles = [h for h in parse_handles(compare_handles) if h != username]
+    metrics = metrics or Metrics()
+    metrics.labels.setdefault("handle", username)
+
+    with metrics.run():
+        log(f"Starting update for directory: {dir_path}")
+        log(f"Username: {username}")
+        if compare_handles:
+            log(f"Compare handles: {', '.join(compare_handles)}")
+
+        problems_by_tag, comparison, timeline, info = _fetch_and_organize(
+            username, compare_handles, log, progress, refetch, metrics, fetch_cache, dir_path,
+            catalog_cache)
+
+        # Step 5: Update the directory files
+        progress(50, "Updating directory files...")
+
+        # Rewrite the stylesheet, index and tag pages that changed, then publish them at once
+        index_path = _build_and_publish(dir_path, username, compare_handles, problems_by_tag,
+                                        comparison, info, log, metrics, render_workers, render_pool,
+                                        output, compress, timeline)
+
+        # Step 6: Complete
+        log(metrics.summary())
+        progress(100, "Directory updated successfully")
+        return index_path
+
+
+def refresh_sites(sites, log=None, progress=None, workers=1, fetch_cache=None, stop=None):
+    """Update each registered site (see registry.SiteRegistry), workers at a time.
+
+    Handles that several sites use, e.g. a shared compare handle, are
+    fetched once through fetch_cache (a new FetchCache by default). A
+    failing site does not stop the others. Once the stop Event is set,
+    sites not started yet are skipped. Returns a dict mapping each
+    refreshed site's path to its index page, or to the exception its
+    update raised.
+    """
+    log = log or _ignore
+    progress = progress or _ignore
+    fetch_cache = fetch_cache or FetchCache()
+    results = {}
+    if not sites:
+        progress(100, "No sites to refresh")
+        return results
+
+    def refresh(site):
+        if stop is not None and stop.is_set():
+            return None
+
+        def site_log(message):
+            # Lines of sites refreshed side by side would be impossible to tell apart
+            log(f"[{site['username']}] {message}" if workers > 1 else message)
+
+        return update_directory(site["path"], site["username"], site["compare_handles"],
+                                log=site_log, fetch_cache=fetch_cache)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sites)))) as executor:
+        futures = {executor.submit(refresh, site): site for site in sites}
+        for done, future in enumerate(as_completed(futures), 1):
+            path = futures[future]["path"]
+            try:
+                result = future.result()
+                if result is None:
+                    continue
+                results[path] = result
+                message = f"Refreshed {path}"
+            except Exception as e:
+                log(f"Error refreshing {path}: {e}")
+                results[path] = e
+                message = f"Failed to refresh {path}"
+            progress(100 * done // len(sites), f"{message} ({done}/{len(sites)})")
+    failed = sum(isinstance(result, Exception) for result in results.values())
+    progress(100, f"Refreshed {len(results) - failed} sites, {failed} failed")
+    return results
+
+
+def read_site_info(dir_path):
+    """Read handle, compare handles and generation time from a site's manifest.
+
+    The full manifest is included under "manifest". Returns None when
+    dir_path does not look like a generated directory.
+    """
+    manifest = load_manifest(dir_path)
+    if manifest.get("username"):
+        return {
+            "username": manifest["username"],
+            "compare_handles": manifest.get("compare_handles", []),
+            "last_update": manifest.get("generated_at", "Unknown"),
+            "manifest": manifest,
+        }
+    # Sites generated before the manifest carried these fields
+    return _scrape_site_info(dir_path)
+
+
+def _scrape_site_info(dir_path):
+    """Recover handle, compare handle and generation time from index.html"""
+    index_path = os.path.join(dir_path, "index.html")
+    if not os.path.isfile(index_path):
+        return None
+
+    with open(index_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Extract username and comparison handle using simple parsing
+    # This is a basic implementation - could be improved with HTML parsing libraries
+    username = None
+    compare_handles = []
+
+    # Find username pattern
+    username_match = re.search(r'Problems Solved by ([^<]+)</h1>', content)
+    if username_match:
+        username = username_match.group(1).strip()
+
+    # Find comparison handle if present
+    compare_match = re.search(r'Comparing with: ([^<]+)</div>', content)
+    if compare_match:
+        compare_handles = parse_handles(compare_match.group(1))
+
+    # Find generation timestamp
+    timestamp_match = re.search(r'Generated on: ([^<]+)</p>', content)
+    last_update = timestamp_match.group(1).strip() if timestamp_match else "Unknown"
+
+    return {
+        "username": username,
+        "compare_handles": compare_handles,
+        "last_update": last_update,
+        "manifest": load_manifest(dir_path),
+    }
+
+
+def latest_site(fallback_dir=None):
+    """Most recently refreshed site from the registry.
+
+    Only if the registry knows of none (e.g. every site predates it) is
+    fallback_dir scanned instead.
+    """
+    try:
+        site = default_registry().latest()
+    except sqlite3.Error:
+        site = None
+    if site:
+        return site["path"]
+    return find_latest_site(fallback_dir) if fallback_dir else None
+
+
+def find_latest_site(output_dir):
+    """Return the most recently modified codeforces_* site under output_dir, if any"""
+    if not os.path.isdir(output_dir):
+        return None
+    # Look for subdirectories with "codeforces_" prefix
+    candidates = [os.path.join(output_dir, d) for d in os.listdir(output_dir)
+                  if os.path.isdir(os.path.join(output_dir, d)) and
+                  d.startswith("codeforces_")]
+    if not candidates:
+        return None
+    # Sort by modification time (newest first)
+    candidates.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+    return candidates[0]
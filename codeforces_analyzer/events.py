@@ -0,0 +1,101 @@
+"""Progress events emitted by a run, fanned out to any number of subscribers.
+
+An EventStream stands in for the log(message) and progress(percent,
+message) callbacks the core functions take, so one run can feed the
+desktop app, the terminal and a log file at the same time:
+
+    events = EventStream()
+    events.subscribe(LogFile("run.log"))
+    core.generate_directory(handle, [], out, log=events.log, progress=events.progress)
+
+Subscribers are called on whichever thread emitted the event. A UI keeps
+them cheap by subscribing an EventBuffer and draining it on its own
+thread, at most a few times per second.
+"""
+import collections
+import datetime
+import threading
+
+LOG = "log"
+PROGRESS = "progress"
+DONE = "done"  # the run finished; message is its result, e.g. the index path
+ERROR = "error"  # the run failed; message is what to tell the user
+
+
+class Event:
+    __slots__ = ("kind", "message", "percent", "time")
+
+    def __init__(self, kind, message, percent=None):
+        self.kind = kind
+        self.message = message
+        self.percent = percent
+        self.time = datetime.datetime.now()
+
+    def __repr__(self):
+        return f"Event({self.kind!r}, {self.message!r}, percent={self.percent})"
+
+
+class EventStream:
+    def __init__(self):
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers = self._subscribers + [callback]
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s is not callback]
+
+    def emit(self, event):
+        # The list is replaced, never mutated, so it can be read without the lock
+        for callback in self._subscribers:
+            callback(event)
+
+    def log(self, message):
+        self.emit(Event(LOG, message))
+
+    def progress(self, percent, message):
+        self.emit(Event(PROGRESS, message, percent))
+
+    def done(self, result):
+        self.emit(Event(DONE, result))
+
+    def error(self, message):
+        self.emit(Event(ERROR, message))
+
+
+class EventBuffer:
+    """Subscriber that queues events until the consumer drains them in a batch"""
+
+    def __init__(self):
+        self._events = collections.deque()
+
+    def __call__(self, event):
+        self._events.append(event)
+
+    def drain(self):
+        events = []
+        while self._events:
+            events.append(self._events.popleft())
+        return events
+
+
+class LogFile:
+    """Subscriber that appends every event to a text file, one timestamped line each"""
+
+    def __init__(self, path):
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        percent = f" {event.percent:3d}%" if event.percent is not None else ""
+        line = f"{event.time:%Y-%m-%d %H:%M:%S} {event.kind}{percent} {event.message}\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,617 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+import os
+import webbrowser
+import threading
+import datetime
+
+from . import core
+from .events import EventBuffer, EventStream, DONE, ERROR, PROGRESS
+
+# The worker threads never touch Tk; their events are drained this often
+UI_UPDATES_PER_SECOND = 10
+
+class CodeforcesProblemDirectory:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Codeforces Problem Directory Generator")
+        self.root.geometry("850x650")
+        
+        # Set theme and colors
+        self.primary_color = "#1a73e8"
+        self.accent_color = "#ff8f00"
+        self.bg_color = "#f5f5f7"
+        self.card_bg = "white"
+        
+        # Configure root background
+        self.root.configure(bg=self.bg_color)
+        
+        # Create custom styles
+        self.setup_styles()
+        
+        # Create main frame
+        self.main_frame = ttk.Frame(self.root, style="Main.TFrame")
+        self.main_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
+        
+        # Create header
+        self.create_header()
+        
+        # Create tab control
+        self.tab_control = ttk.Notebook(self.main_frame)
+        
+        # Create tabs
+        self.setup_tab = ttk.Frame(self.tab_control, style="Tab.TFrame")
+        self.output_tab = ttk.Frame(self.tab_control, style="Tab.TFrame")
+        self.update_tab = ttk.Frame(self.tab_control, style="Tab.TFrame")  # New update tab
+        
+        self.tab_control.add(self.setup_tab, text="Setup")
+        self.tab_control.add(self.output_tab, text="Output")
+        self.tab_control.add(self.update_tab, text="Update")  # Add update tab
+        self.tab_control.pack(expand=1, fill=tk.BOTH, padx=5, pady=5)
+        
+        # Create setup tab content
+        self.create_setup_tab()
+        
+        # Create output tab content
+        self.create_output_tab()
+        
+        # Create update tab content
+        self.create_update_tab()  # Add this method call
+        
+        # Initialize variables
+        self.generated_file_path = None
+        self.last_update_time = None
+        
+    def setup_styles(self):
+        # Configure style for all widgets
+        self.style = ttk.Style()
+        
+        # Try to use a modern theme if available
+        available_themes = self.style.theme_names()
+        if 'clam' in available_themes:
+            self.style.theme_use('clam')
+        
+        # Configure frame styles
+        self.style.configure('Main.TFrame', background=self.bg_color)
+        self.style.configure('Tab.TFrame', background=self.bg_color)
+        self.style.configure('Card.TFrame', background=self.card_bg,
+                           relief='raised', borderwidth=1)
+        
+        # Configure label styles
+        self.style.configure('TLabel', background=self.bg_color, font=('Segoe UI', 10))
+        self.style.configure('Header.TLabel', font=('Segoe UI', 16, 'bold'))
+        self.style.configure('Subheader.TLabel', font=('Segoe UI', 12, 'bold'))
+        self.style.configure('CardTitle.TLabel', background=self.card_bg, font=('Segoe UI', 11, 'bold'))
+        
+        # Configure button styles
+        self.style.configure('TButton', font=('Segoe UI', 10))
+        self.style.configure('Primary.TButton', background=self.primary_color)
+        
+        # Configure entry styles
+        self.style.configure('TEntry', font=('Segoe UI', 10))
+        
+        # Create a style for card labels
+        self.style.configure('Card.TLabel', background=self.card_bg)
+        
+    def create_header(self):
+        header_frame = ttk.Frame(self.main_frame, style='Main.TFrame')
+        header_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        # Logo/Icon would go here if available
+        
+        # Title
+        title_label = ttk.Label(header_frame, text="Codeforces Problem Directory Generator",
+                               style='Header.TLabel')
+        title_label.pack(pady=10)
+        
+        # Description 
+        desc_text = "Generate an organized directory of problems you've solved on Codeforces"
+        desc_label = ttk.Label(header_frame, text=desc_text)
+        desc_label.pack(pady=5)
+    
+    def create_setup_tab(self):
+        # Input frame with card-like appearance
+        input_frame = ttk.Frame(self.setup_tab, style='Card.TFrame')
+        input_frame.pack(fill=tk.X, padx=20, pady=15, ipady=10)
+        
+        # User Input Section
+        ttk.Label(input_frame, text="User Configuration", style='Subheader.TLabel').grid(row=0, column=0, columnspan=3, padx=15, pady=(15, 10), sticky=tk.W)
+        
+        # Codeforces Username
+        ttk.Label(input_frame, text="Codeforces Username:", style='Card.TLabel').grid(
+            row=1, column=0, sticky=tk.W, padx=15, pady=8)
+        
+        self.username_var = tk.StringVar()
+        username_entry = ttk.Entry(input_frame, textvariable=self.username_var, width=30)
+        username_entry.grid(row=1, column=1, sticky=tk.W, pady=8)
+        
+        # Compare Handle
+        ttk.Label(input_frame, text="Compare with (optional, comma separated):", style='Card.TLabel').grid(
+            row=2, column=0, sticky=tk.W, padx=15, pady=8)
+        
+        self.compare_handle_var = tk.StringVar()
+        compare_handle_entry = ttk.Entry(input_frame, textvariable=self.compare_handle_var, width=30)
+        compare_handle_entry.grid(row=2, column=1, sticky=tk.W, pady=8)
+        
+        # Output directory
+        ttk.Label(input_frame, text="Output Directory:", style='Card.TLabel').grid(
+            row=3, column=0, sticky=tk.W, padx=15, pady=8)
+        
+        dir_frame = ttk.Frame(input_frame, style='Card.TFrame')
+        dir_frame.grid(row=3, column=1, columnspan=2, sticky=tk.W, pady=8)
+        
+        self.output_dir_var = tk.StringVar(value=os.path.expanduser("~/codeforces_problems"))
+        output_dir_entry = ttk.Entry(dir_frame, textvariable=self.output_dir_var, width=30)
+        output_dir_entry.pack(side=tk.LEFT)
+        
+        browse_button = ttk.Button(dir_frame, text="Browse...", command=self.browse_output_dir)
+        browse_button.pack(side=tk.LEFT, padx=5)
+        
+        # Spacer
+        ttk.Frame(input_frame, height=10, style='Card.TFrame').grid(row=4, column=0, columnspan=3)
+        
+        # Generate Button
+        button_frame = ttk.Frame(input_frame, style='Card.TFrame')
+        button_frame.grid(row=5, column=0, columnspan=3, pady=15)
+        
+        self.generate_button = ttk.Button(button_frame, text="Generate Directory", 
+                                       command=self.start_generation, style='Primary.TButton',
+                                       width=20)
+        self.generate_button.pack()
+        
+        # Status frame
+        status_frame = ttk.Frame(self.setup_tab, style='Card.TFrame')
+        status_frame.pack(fill=tk.X, padx=20, pady=15, ipady=10)
+        
+        ttk.Label(status_frame, text="Generation Status", style='Card.TLabel').grid(row=0, column=0, padx=15, pady=(15, 10), sticky=tk.W)
+        
+        # Progress bar
+        self.progress_var = tk.DoubleVar()
+        progress_frame = ttk.Frame(status_frame, style='Card.TFrame')
+        progress_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), padx=15, pady=5)
+        
+        self.progress = ttk.Progressbar(progress_frame, variable=self.progress_var, 
+                                     maximum=100, length=400)
+        self.progress.pack(fill=tk.X)
+        
+        # Status message
+        status_msg_frame = ttk.Frame(status_frame, style='Card.TFrame')
+        status_msg_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), padx=15, pady=5)
+        
+        self.status_var = tk.StringVar(value="Ready")
+        status_label = ttk.Label(status_msg_frame, textvariable=self.status_var,
+                                style='Card.TLabel')
+        status_label.pack(anchor=tk.W)
+        
+        # Results info (appears after generation)
+        self.results_frame = ttk.Frame(self.setup_tab, style='Card.TFrame')
+        
+    def create_output_tab(self):
+        # Create output text frame
+        output_frame = ttk.Frame(self.output_tab)
+        output_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Output log title
+        ttk.Label(output_frame, text="Process Log", style='Subheader.TLabel').pack(anchor=tk.W, pady=(0, 5))
+        
+        # Output text with scrollbar
+        text_frame = ttk.Frame(output_frame)
+        text_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.output_text = tk.Text(text_frame, wrap=tk.WORD, font=('Consolas', 10))
+        self.output_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.output_text.config(state=tk.DISABLED)
+        
+        scrollbar = ttk.Scrollbar(text_frame, command=self.output_text.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.output_text.config(yscrollcommand=scrollbar.set)
+
+        # Button to open file (initially hidden)
+        self.open_file_button = ttk.Button(output_frame, text="Open Generated Directory", 
+                                        command=lambda: self.open_generated_file(self.generated_file_path),
+                                        state=tk.DISABLED)
+        self.open_file_button.pack(pady=10)
+    
+    # New method to create update tab
+    def create_update_tab(self):
+        # Create update frame
+        update_frame = ttk.Frame(self.update_tab, style='Card.TFrame')
+        update_frame.pack(fill=tk.X, padx=20, pady=15, ipady=10)
+        
+        # Update Section Header
+        ttk.Label(update_frame, text="Update Existing Directory", style='Subheader.TLabel').grid(
+            row=0, column=0, columnspan=3, padx=15, pady=(15, 10), sticky=tk.W)
+        
+        # Select directory to update
+        ttk.Label(update_frame, text="Select Directory:", style='Card.TLabel').grid(
+            row=1, column=0, sticky=tk.W, padx=15, pady=8)
+        
+        dir_select_frame = ttk.Frame(update_frame, style='Card.TFrame')
+        dir_select_frame.grid(row=1, column=1, columnspan=2, sticky=tk.W, pady=8)
+        
+        self.update_dir_var = tk.StringVar()
+        update_dir_entry = ttk.Entry(dir_select_frame, textvariable=self.update_dir_var, width=30)
+        update_dir_entry.pack(side=tk.LEFT)
+        
+        browse_update_button = ttk.Button(dir_select_frame, text="Browse...", 
+                                        command=self.browse_update_dir)
+        browse_update_button.pack(side=tk.LEFT, padx=5)
+        
+        # Auto-detect button (finds the last generated directory)
+        auto_detect_button = ttk.Button(dir_select_frame, text="Auto-detect Last", 
+                                     command=self.auto_detect_directory)
+        auto_detect_button.pack(side=tk.LEFT, padx=5)
+        
+        # Directory info frame
+        self.directory_info_frame = ttk.Frame(update_frame, style='Card.TFrame')
+        self.directory_info_frame.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), padx=15, pady=8)
+        self.directory_info_frame.grid_remove()  # Hide initially
+        
+        # Update button
+        update_button_frame = ttk.Frame(update_frame, style='Card.TFrame')
+        update_button_frame.grid(row=3, column=0, columnspan=3, pady=15)
+        
+        self.update_button = ttk.Button(update_button_frame, text="Update Solve Information", 
+                                     command=self.start_update, style='Primary.TButton',
+                                     width=25, state=tk.DISABLED)
+        self.update_button.pack()
+        
+        # Update status frame
+        update_status_frame = ttk.Frame(self.update_tab, style='Card.TFrame')
+        update_status_frame.pack(fill=tk.X, padx=20, pady=15, ipady=10)
+        
+        ttk.Label(update_status_frame, text="Update Status", style='Card.TLabel').grid(
+            row=0, column=0, padx=15, pady=(15, 10), sticky=tk.W)
+        
+        # Update progress bar
+        self.update_progress_var = tk.DoubleVar()
+        update_progress_frame = ttk.Frame(update_status_frame, style='Card.TFrame')
+        update_progress_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), padx=15, pady=5)
+        
+        self.update_progress = ttk.Progressbar(update_progress_frame, 
+                                            variable=self.update_progress_var,
+                                            maximum=100, length=400)
+        self.update_progress.pack(fill=tk.X)
+        
+        # Update status message
+        update_msg_frame = ttk.Frame(update_status_frame, style='Card.TFrame')
+        update_msg_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), padx=15, pady=5)
+        
+        self.update_status_var = tk.StringVar(value="Select a directory to update")
+        update_status_label = ttk.Label(update_msg_frame, textvariable=self.update_status_var,
+                                      style='Card.TLabel')
+        update_status_label.pack(anchor=tk.W)
+        
+        # Update log
+        update_log_frame = ttk.Frame(self.update_tab)
+        update_log_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=15)
+        
+        ttk.Label(update_log_frame, text="Update Log", style='Subheader.TLabel').pack(anchor=tk.W, pady=(0, 5))
+        
+        # Update log text with scrollbar
+        update_text_frame = ttk.Frame(update_log_frame)
+        update_text_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.update_text = tk.Text(update_text_frame, wrap=tk.WORD, font=('Consolas', 10), height=10)
+        self.update_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.update_text.config(state=tk.DISABLED)
+        
+        update_scrollbar = ttk.Scrollbar(update_text_frame, command=self.update_text.yview)
+        update_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.update_text.config(yscrollcommand=update_scrollbar.set)
+    
+    def browse_output_dir(self):
+        directory = filedialog.askdirectory()
+        if directory:
+            self.output_dir_var.set(directory)
+    
+    def browse_update_dir(self):
+        directory = filedialog.askdirectory()
+        if directory:
+            self.update_dir_var.set(directory)
+            self.check_update_directory()
+    
+    def auto_detect_directory(self):
+        """Try to find the last generated directory"""
+        if self.generated_file_path and os.path.exists(self.generated_file_path):
+            # Get the directory containing the index file
+            dir_path = os.path.dirname(self.generated_file_path)
+            self.update_dir_var.set(dir_path)
+            self.check_update_directory()
+        else:
+            # Otherwise the most recently refreshed site in the registry
+            latest = core.latest_site(os.path.expanduser("~/codeforces_problems"))
+            if latest:
+                self.update_dir_var.set(latest)
+                self.check_update_directory()
+            else:
+                messagebox.showinfo("Auto-detect", "No existing directories found.")
+    
+    def check_update_directory(self):
+        """Check if the selected directory is a valid Codeforces directory and show info"""
+        dir_path = self.update_dir_var.get().strip()
+        
+        if not dir_path or not os.path.isdir(dir_path):
+            self.update_button.configure(state=tk.DISABLED)
+            self.update_status_var.set("Invalid directory selected")
+            self.directory_info_frame.grid_remove()
+            return
+        
+        # Parse the index.html to extract user information
+        try:
+            info = core.read_site_info(dir_path)
+            if info is None:
+                self.update_button.configure(state=tk.DISABLED)
+                self.update_status_var.set("Selected directory is not a valid Codeforces directory")
+                self.directory_info_frame.grid_remove()
+                return
+            
+            username = info["username"]
+            compare_handles = info["compare_handles"]
+            last_update = info["last_update"]
+            
+            # Clear existing widgets in directory_info_frame
+            for widget in self.directory_info_frame.winfo_children():
+                widget.destroy()
+            
+            # Display directory info
+            ttk.Label(self.directory_info_frame, text="Directory Information:", 
+                    style='CardTitle.TLabel').grid(row=0, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
+            
+            ttk.Label(self.directory_info_frame, text="Username:", 
+                    style='Card.TLabel').grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
+            ttk.Label(self.directory_info_frame, text=username or "Not found", 
+                    style='Card.TLabel').grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
+            
+            ttk.Label(self.directory_info_frame, text="Compare Handles:", 
+                    style='Card.TLabel').grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
+            ttk.Label(self.directory_info_frame, text=", ".join(compare_handles) or "None", 
+                    style='Card.TLabel').grid(row=2, column=1, sticky=tk.W, padx=5, pady=2)
+            
+            ttk.Label(self.directory_info_frame, text="Last Updated:", 
+                    style='Card.TLabel').grid(row=3, column=0, sticky=tk.W, padx=5, pady=2)
+            ttk.Label(self.directory_info_frame, text=last_update, 
+                    style='Card.TLabel').grid(row=3, column=1, sticky=tk.W, padx=5, pady=2)
+            
+            # Show the frame
+            self.directory_info_frame.grid()
+            
+            # Enable update button if we found a username
+            if username:
+                self.update_button.configure(state=tk.NORMAL)
+                self.update_status_var.set("Ready to update")
+                
+                # Save the parsed information for later use during update
+                self.update_username = username
+                self.update_compare_handles = compare_handles
+            else:
+                self.update_button.configure(state=tk.DISABLED)
+                self.update_status_var.set("Could not determine username from directory")
+        
+        except Exception as e:
+            self.update_button.configure(state=tk.DISABLED)
+            self.update_status_var.set(f"Error analyzing directory: {str(e)}")
+            self.directory_info_frame.grid_remove()
+    
+    def start_generation(self):
+        self.tab_control.select(1)  # Switch to output tab
+        username = self.username_var.get().strip()
+        compare_handles = core.parse_handles(self.compare_handle_var.get())
+        
+        if not username:
+            messagebox.showerror("Error", "Please enter a Codeforces username")
+            return
+            
+        output_dir = self.output_dir_var.get().strip()
+        if not output_dir:
+            messagebox.showerror("Error", "Please select an output directory")
+            return
+            
+        # Create output directory if it doesn't exist
+        if not os.path.exists(output_dir):
+            try:
+                os.makedirs(output_dir)
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not create output directory: {str(e)}")
+                return
+        
+        self.generate_button.configure(state=tk.DISABLED)
+        self.status_var.set("Generating problem directory...")
+        self.progress_var.set(0)
+        
+        # Clear output text
+        self.output_text.config(state=tk.NORMAL)
+        self.output_text.delete(1.0, tk.END)
+        self.output_text.config(state=tk.DISABLED)
+        
+        # Run generation in a separate thread
+        events = self.watch_events(self.progress_var, self.status_var, self.output_text,
+                                   self.on_generation_done, self.on_generation_error)
+        threading.Thread(target=self.generate_directory, 
+                        args=(username, compare_handles, output_dir, events), 
+                        daemon=True).start()
+    
+    def start_update(self):
+        """Start the update process for an existing directory"""
+        self.update_button.configure(state=tk.DISABLED)
+        self.update_status_var.set("Updating solve information...")
+        self.update_progress_var.set(0)
+        
+        # Clear update text
+        self.update_text.config(state=tk.NORMAL)
+        self.update_text.delete(1.0, tk.END)
+        self.update_text.config(state=tk.DISABLED)
+        
+        dir_path = self.update_dir_var.get().strip()
+        
+        # Run update in a separate thread
+        events = self.watch_events(self.update_progress_var, self.update_status_var,
+                                   self.update_text, self.on_update_done, self.on_update_error)
+        threading.Thread(target=self.update_directory, 
+                        args=(dir_path, self.update_username, self.update_compare_handles, events), 
+                        daemon=True).start()
+    
+    def watch_events(self, progress_var, status_var, text_widget, on_done, on_error):
+        """Return an EventStream for a worker; its events reach the widgets in batches"""
+        events = EventStream()
+        buffer = events.subscribe(EventBuffer())
+        self.root.after(1000 // UI_UPDATES_PER_SECOND, self.pump_events,
+                        buffer, progress_var, status_var, text_widget, on_done, on_error)
+        return events
+    
+    def pump_events(self, buffer, progress_var, status_var, text_widget, on_done, on_error):
+        """Apply everything the worker emitted since the last call, on the Tk thread"""
+        lines = []
+        last_progress = None
+        finished = None
+        for event in buffer.drain():
+            if event.kind in (DONE, ERROR):
+                finished = event
+                continue
+            if event.kind == PROGRESS:
+                last_progress = event
+            lines.append(event.message)
+        
+        # One insert and one variable update per batch, however many events arrived
+        if lines:
+            text_widget.config(state=tk.NORMAL)
+            text_widget.insert(tk.END, "\n".join(lines) + "\n")
+            text_widget.see(tk.END)
+            text_widget.config(state=tk.DISABLED)
+        if last_progress:
+            progress_var.set(last_progress.percent)
+            status_var.set(last_progress.message)
+        
+        if finished is None:
+            self.root.after(1000 // UI_UPDATES_PER_SECOND, self.pump_events,
+                            buffer, progress_var, status_var, text_widget, on_done, on_error)
+        elif finished.kind == DONE:
+            on_done(finished.message)
+        else:
+            on_error(finished.message)
+    
+    def generate_directory(self, username, compare_handles, output_dir, events):
+        try:
+            index_path = core.generate_directory(
+                username, compare_handles, output_dir,
+                log=events.log, progress=events.progress)
+            
+            events.log(f"Directory generated successfully!")
+            events.log(f"Main page saved at: {index_path}")
+            events.done(index_path)
+            
+        except core.NoSubmissionsError as e:
+            events.error(str(e))
+        except Exception as e:
+            events.log(f"Error: {str(e)}")
+            events.error(f"An error occurred: {str(e)}")
+    
+    def update_directory(self, dir_path, username, compare_handles, events):
+        """Update an existing directory with fresh solve information"""
+        try:
+            index_path = core.update_directory(
+                dir_path, username, compare_handles,
+                log=events.log, progress=events.progress)
+            
+            events.log(f"Directory updated successfully!")
+            events.log(f"Main page saved at: {index_path}")
+            events.done(index_path)
+            
+        except core.NoSubmissionsError as e:
+            events.log(f"Error: {str(e)}")
+            events.error(str(e))
+        except Exception as e:
+            events.log(f"Error: {str(e)}")
+            events.error(f"An error occurred during update: {str(e)}")
+    
+    def on_generation_done(self, index_path):
+        self.generated_file_path = index_path
+        self.last_update_time = datetime.datetime.now()
+        self.open_file_button.configure(state=tk.NORMAL)
+        self.show_success_message(index_path)
+        self.reset_ui()
+    
+    def on_generation_error(self, message):
+        messagebox.showerror("Error", message)
+        self.reset_ui()
+    
+    def on_update_done(self, index_path):
+        self.last_update_time = datetime.datetime.now()
+        self.show_update_success_message(index_path)
+        self.reset_update_ui()
+    
+    def on_update_error(self, message):
+        messagebox.showerror("Error", message)
+        self.reset_update_ui()
+    
+    def reset_ui(self):
+        self.generate_button.configure(state=tk.NORMAL)
+    
+    def reset_update_ui(self):
+        self.update_button.configure(state=tk.NORMAL)
+    
+    def show_success_message(self, file_path):
+        # Create a results frame if not already showing
+        if not self.results_frame.winfo_ismapped():
+            self.results_frame.pack(fill=tk.X, padx=20, pady=15, ipady=10)
+            
+            ttk.Label(self.results_frame, text="Generation Results", style='Card.TLabel').grid(row=0, column=0, padx=15, pady=(15, 10), sticky=tk.W)
+            
+            success_icon = "✓ "  # Could be replaced with an image
+            success_msg = ttk.Label(self.results_frame, 
+                                  text=f"{success_icon}Directory generated successfully!", 
+                                  style='Card.TLabel',
+                                  foreground="#4caf50",
+                                  font=('Segoe UI', 11, 'bold'))
+            success_msg.grid(row=1, column=0, padx=15, pady=5, sticky=tk.W)
+            
+            path_msg = ttk.Label(self.results_frame, 
+                              text=f"Output saved at:",
+                              style='Card.TLabel')
+            path_msg.grid(row=2, column=0, padx=15, pady=(5, 0), sticky=tk.W)
+            
+            path_value = ttk.Label(self.results_frame, 
+                                text=file_path,
+                                style='Card.TLabel',
+                                foreground="#1a73e8")
+            path_value.grid(row=3, column=0, padx=25, pady=(0, 10), sticky=tk.W)
+            
+            button_frame = ttk.Frame(self.results_frame, style='Card.TFrame')
+            button_frame.grid(row=4, column=0, padx=15, pady=10)
+            
+            open_button = ttk.Button(button_frame, text="Open Directory", 
+                                  command=lambda: self.open_generated_file(file_path))
+            open_button.pack(side=tk.LEFT, padx=5)
+            
+            new_button = ttk.Button(button_frame, text="Generate Another", 
+                                  command=self.reset_results_frame)
+            new_button.pack(side=tk.LEFT, padx=5)
+            
+            # Add a button to switch to update tab
+            update_button = ttk.Button(button_frame, text="Go to Update Tab", 
+                                     command=lambda: self.tab_control.select(2))  # Select update tab
+            update_button.pack(side=tk.LEFT, padx=5)
+    
+    def show_update_success_message(self, file_path):
+        """Show a success message after updating a directory"""
+        messagebox.showinfo("Update Successful", 
+                           f"Directory has been successfully updated!\n\nUpdated at: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        # Enable opening the updated directory
+        self.open_generated_file(file_path)
+    
+    def reset_results_frame(self):
+        """Hide the results frame to start a new generation"""
+        self.results_frame.pack_forget()
+        self.tab_control.select(0)  # Switch back to setup tab
+    
+    def open_generated_file(self, file_path):
+        if os.path.exists(file_path):
+            webbrowser.open(f"file://{os.path.abspath(file_path)}")
+
+def main():
+    root = tk.Tk()
+    app = CodeforcesProblemDirectory(root)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Incremental decoding of the API's {"status": "OK", "result": [...]} envelope.
+
+iter_result() takes the response body as an iterable of byte chunks and
+yields the elements of the result list one at a time, so a handle with
+100k submissions never has its whole history parsed into memory at once.
+Only one chunk plus one partially received element is buffered.
+"""
+import codecs
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_RESULT_START = re.compile(r'"result"\s*:\s*\[')
+_STATUS_OK = re.compile(r'"status"\s*:\s*"OK"')
+_SEPARATORS = " \t\r\n,"
+
+
+class EnvelopeError(ValueError):
+    """The body was not an OK envelope with a list result; envelope is the
+    decoded body when it was valid JSON at all"""
+
+    def __init__(self, message, envelope=None):
+        super().__init__(message)
+        self.envelope = envelope
+
+
+def iter_result(chunks):
+    chunks = iter(chunks)
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+
+    # Read until the start of the result list
+    while True:
+        match = _RESULT_START.search(buffer)
+        if match:
+            break
+        chunk = next(chunks, None)
+        if chunk is None:
+            # Error replies ({"status": "FAILED", "comment": ...}) are small
+            buffer += text.decode(b"", final=True)
+            try:
+                envelope = json.loads(buffer)
+            except ValueError:
+                raise EnvelopeError("response is not JSON")
+            raise EnvelopeError(envelope.get("comment") or "response has no result", envelope)
+        buffer += text.decode(chunk)
+
+    if not _STATUS_OK.search(buffer, 0, match.start()):
+        raise EnvelopeError("response status is not OK")
+
+    pos = match.end()
+    while True:
+        while pos < len(buffer) and buffer[pos] in _SEPARATORS:
+            pos += 1
+        if pos < len(buffer):
+            if buffer[pos] == "]":
+                return
+            try:
+                item, pos = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                pass  # element is cut off by the chunk boundary
+            else:
+                yield item
+                continue
+
+        # Drop what has been consumed and read more
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise EnvelopeError("response ended in the middle of the result list")
+        buffer = buffer[pos:] + text.decode(chunk)
+        pos = 0
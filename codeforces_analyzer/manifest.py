@@ -0,0 +1,56 @@
+"""The manifest.json kept in every generated site.
+
+It is what tools read to learn about a site, instead of parsing its HTML:
+
+    {
+     "catalog": {"fetched_at": 1709287000.0, "problems": 9650},
+     "compare_handles": ["Petr"],
+     "format": 1,
+     "generated_at": "2024-03-01 10:15:00",
+     "generator": "codeforces_analyzer 1.1.0",
+     "handles": {"Petr": {"last_id": 245001234, "new": 0, "submissions": 5120}, ...},
+     "output": "pages",
+     "pages": {"dp.html": "<sha256>", ...},
+     "timing": {"fetch": 1.92, "organize": 0.041, "render": 0.113},
+     "username": "tourist"
+    }
+
+handles holds the store's high-water mark for each handle at generation
+time (or an "error" if it could not be fetched), catalog says which copy
+of the problemset supplied ratings and tags (None if there was none), and
+timing is seconds per phase of the run that wrote the manifest.
+"""
+import json
+import os
+import tempfile
+
+from . import __version__
+
+MANIFEST_NAME = "manifest.json"
+FORMAT = 1
+GENERATOR = f"codeforces_analyzer {__version__}"
+FILE_MODE = 0o644
+
+
+def load_manifest(site_dir):
+    """Return the site's manifest, or {} if it has none (or it is unreadable)"""
+    try:
+        with open(os.path.join(site_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(site_dir, manifest):
+    path = os.path.join(site_dir, MANIFEST_NAME)
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{MANIFEST_NAME}.", suffix=".tmp", dir=site_dir)
+    try:
+        # mkstemp makes the file private; it is served with the site's pages
+        os.chmod(tmp_path, FILE_MODE)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
@@ -0,0 +1,181 @@
+"""Timings and counters for one generate or update run.
+
+A Metrics object goes along with the log and progress callbacks. The run
+times its phases with it and adds to its counters:
+
+    catalog, fetch, organize, timeline, render, publish  phases, in seconds
+    api_calls, api_retries, api_bytes                    HTTP traffic
+    api_network_seconds, json_decode_seconds             time inside fetch
+    submissions_parsed, submissions_new, submissions_total, fetch_errors
+    problems, tags, compare_handles, timeline_solves
+    pages_written, pages_unchanged, pages_removed, bytes_written, files_compressed
+
+Hooks are called as hook(kind, name, value) on whichever thread did the
+work: PHASE when a phase ends (value is its seconds), COUNT when a
+counter is added to, and FINISH once at the end (name is "ok" or
+"error", value is snapshot()). MetricsFile is a hook that saves the
+snapshot as JSON or in the Prometheus text format:
+
+    metrics = Metrics(labels={"handle": "tourist"})
+    metrics.subscribe(MetricsFile("/var/lib/node_exporter/codeforces.prom"))
+    core.update_directory(site_dir, "tourist", [], metrics=metrics)
+"""
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+PHASE = "phase"
+COUNT = "count"
+FINISH = "finish"
+
+FORMATS = ("json", "prometheus")
+PROMETHEUS_PREFIX = "codeforces_analyzer"
+FILE_MODE = 0o644
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Metrics:
+    def __init__(self, labels=None):
+        self.labels = dict(labels or {})
+        self.phases = {}  # name -> seconds, summed if a phase runs more than once
+        self.counters = {}
+        self.status = None
+        self.started_at = time.time()
+        self.duration = None
+        self._started = time.perf_counter()
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, hook):
+        with self._lock:
+            self._subscribers = self._subscribers + [hook]
+        return hook
+
+    def unsubscribe(self, hook):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s is not hook]
+
+    def _emit(self, kind, name, value):
+        for hook in self._subscribers:
+            hook(kind, name, value)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        self._emit(COUNT, name, value)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0) + seconds
+            self._emit(PHASE, name, seconds)
+
+    @contextlib.contextmanager
+    def run(self):
+        """Finish with "ok" when the block completes, or with "error" if it raises"""
+        try:
+            yield self
+        except BaseException:
+            self.finish("error")
+            raise
+        self.finish("ok")
+
+    def finish(self, status="ok"):
+        self.status = status
+        self.duration = time.perf_counter() - self._started
+        self._emit(FINISH, status, self.snapshot())
+
+    def summary(self):
+        """One log line with the time of every phase so far"""
+        return "Timing: " + ", ".join(f"{name} {seconds:.2f}s"
+                                      for name, seconds in self.phases.items())
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "labels": dict(self.labels),
+                "status": self.status,
+                "started_at": self.started_at,
+                "duration": self.duration,
+                "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+                "counters": {name: round(value, 6) if isinstance(value, float) else value
+                             for name, value in self.counters.items()},
+            }
+
+    def write(self, path, format=None):
+        write_snapshot(path, self.snapshot(), format)
+
+
+def to_json(snapshot):
+    return json.dumps(snapshot, indent=2) + "\n"
+
+
+def to_prometheus(snapshot, prefix=PROMETHEUS_PREFIX):
+    """A snapshot in the Prometheus text format, e.g. for node_exporter's textfile collector"""
+    labels = snapshot["labels"]
+
+    def sample(name, value, **extra):
+        pairs = ",".join(f'{key}="{_escape_label(label)}"'
+                         for key, label in {**labels, **extra}.items())
+        return f"{prefix}_{name}{{{pairs}}} {value}" if pairs else f"{prefix}_{name} {value}"
+
+    lines = [f"# HELP {prefix}_run_success Whether the last run finished without an error",
+             f"# TYPE {prefix}_run_success gauge",
+             sample("run_success", int(snapshot["status"] == "ok")),
+             f"# TYPE {prefix}_run_timestamp_seconds gauge",
+             sample("run_timestamp_seconds", snapshot["started_at"])]
+    if snapshot["duration"] is not None:
+        lines += [f"# TYPE {prefix}_run_duration_seconds gauge",
+                  sample("run_duration_seconds", snapshot["duration"])]
+    lines += [f"# HELP {prefix}_phase_seconds Wall time of each phase of the last run",
+              f"# TYPE {prefix}_phase_seconds gauge"]
+    lines += [sample("phase_seconds", seconds, phase=name)
+              for name, seconds in snapshot["phases"].items()]
+    for name, value in sorted(snapshot["counters"].items()):
+        lines += [f"# TYPE {prefix}_{name} gauge", sample(name, value)]
+    return "\n".join(lines) + "\n"
+
+
+def write_snapshot(path, snapshot, format=None):
+    """Save a snapshot; format is "json" or "prometheus", by default
+    prometheus for .prom files and json otherwise"""
+    format = format or ("prometheus" if path.endswith(".prom") else "json")
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}, not {format!r}")
+    content = to_prometheus(snapshot) if format == "prometheus" else to_json(snapshot)
+    # Scrapers must never read a half-written file, and runs finishing at
+    # the same time must not share a temp file
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                                    dir=os.path.dirname(path) or ".")
+    try:
+        # mkstemp makes the file private; the scraper may run as another user
+        os.chmod(tmp_path, FILE_MODE)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class MetricsFile:
+    """Hook that saves the snapshot to path when the run finishes"""
+
+    def __init__(self, path, format=None):
+        self.path = path
+        self.format = format
+
+    def __call__(self, kind, name, value):
+        if kind == FINISH:
+            write_snapshot(self.path, value, self.format)
@@ -0,0 +1,8 @@
+"""Output modes and worker pools that runs can be asked for.
+
+Kept apart from render.py so the command line can offer them as choices
+without loading the templates.
+"""
+
+POOLS = ("thread", "process")
+OUTPUTS = ("pages", "bundle")
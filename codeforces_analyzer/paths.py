@@ -0,0 +1,7 @@
+"""Locations of the tool's own persistent data (caches, stores)."""
+import os
+
+
+def data_dir():
+    """Root for persistent state; override with CODEFORCES_ANALYZER_HOME"""
+    return os.environ.get("CODEFORCES_ANALYZER_HOME") or os.path.expanduser("~/.codeforces_analyzer")
@@ -0,0 +1,254 @@
+"""Build sites off to the side and publish them atomically.
+
+A published site is a symlink to one of its releases:
+
+    codeforces_tourist -> .codeforces_tourist.releases/20240301-101500-000000
+    .codeforces_tourist.releases/
+        20240229-101500-000000/    previous release, kept for rollback
+        20240301-101500-000000/    live
+        previous                   name of the previous release
+
+stage() creates a new release directory pre-filled with hard links to the
+live release's files. Pages are always written to a temp name and renamed
+over the link, so the live release is never modified. publish() then swaps
+the symlink with a single rename, and readers see either the old site or
+the new one, never a mix and never a 404.
+
+The previous release is the one that was live just before the current
+one, whatever the order of their names: after a rollback and a new
+publish it is the release rolled back to, not the one rolled back from.
+Releases older than the previous one are pruned on publish.
+
+Runs on the same site, from any process, take turns: a run holds
+site_lock() from stage() until publish() has pruned, and rollback() takes
+it too. Releases are compared by name inside the releases directory, so
+a site whose parent directory is reached through a symlink is handled
+like any other.
+
+Where symlinks are not available (e.g. Windows without developer mode) the
+live directory is swapped with two renames instead, which leaves a very
+short window in which the path does not exist. The same two renames move a
+site from before releases existed aside on its first publish.
+"""
+import datetime
+import errno
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: runs are only serialized within a process
+    fcntl = None
+
+# Sorts before every timestamped release
+LEGACY_RELEASE = "00000000-000000-legacy"
+PREVIOUS_FILE = "previous"
+LOCK_FILE = "lock"
+
+# symlink() errors that mean the filesystem or OS cannot make links; 1314 is
+# Windows' "a required privilege is not held by the client"
+NO_SYMLINK_ERRNOS = {errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP, errno.ENOSYS}
+NO_SYMLINK_WINERROR = 1314
+
+_locks = {}
+_locks_lock = threading.Lock()
+
+
+def releases_dir(live_path):
+    parent, name = os.path.split(os.path.abspath(live_path))
+    return os.path.join(parent, f".{name}.releases")
+
+
+@contextmanager
+def site_lock(live_path):
+    """Hold the site's lock, in this process and, where flock exists, in every other"""
+    root = releases_dir(live_path)
+    with _locks_lock:
+        lock = _locks.setdefault(root, threading.Lock())
+    with lock:
+        os.makedirs(root, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(root, LOCK_FILE), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def current_release(live_path):
+    """Directory currently served at live_path, or None if nothing is published"""
+    if os.path.islink(live_path):
+        return os.path.realpath(live_path)
+    if os.path.isdir(live_path):
+        return live_path
+    return None
+
+
+def list_releases(live_path):
+    root = releases_dir(live_path)
+    if not os.path.isdir(root):
+        return []
+    return sorted(os.path.join(root, name) for name in os.listdir(root)
+                  if os.path.isdir(os.path.join(root, name)))
+
+
+def previous_release(live_path):
+    """Release that was live before the current one, or None"""
+    root = releases_dir(live_path)
+    try:
+        with open(os.path.join(root, PREVIOUS_FILE), 'r', encoding='utf-8') as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    path = os.path.join(root, name)
+    return path if name and os.path.isdir(path) else None
+
+
+def _set_previous(live_path, release):
+    path = os.path.join(releases_dir(live_path), PREVIOUS_FILE)
+    if release is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{PREVIOUS_FILE}.", dir=os.path.dirname(path))
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(os.path.basename(release) + "\n")
+    os.replace(tmp_path, path)
+
+
+def _new_release_path(live_path):
+    """Create and return an empty release directory named after the current time"""
+    root = releases_dir(live_path)
+    os.makedirs(root, exist_ok=True)
+    while True:
+        release_id = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = os.path.join(root, release_id)
+        try:
+            os.mkdir(path)
+            return path
+        except FileExistsError:
+            continue
+
+
+def _park(live_path):
+    """Directory-swap mode: move the live directory in among the releases"""
+    parked = _new_release_path(live_path)
+    os.rmdir(parked)
+    os.rename(live_path, parked)
+    return parked
+
+
+def stage(live_path):
+    """Create a staging release seeded with the live release's files"""
+    staging = _new_release_path(live_path)
+    current = current_release(live_path)
+    if current:
+        for name in os.listdir(current):
+            source = os.path.join(current, name)
+            if not os.path.isfile(source):
+                continue
+            target = os.path.join(staging, name)
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copy2(source, target)
+    return staging
+
+
+def discard(staging):
+    shutil.rmtree(staging, ignore_errors=True)
+
+
+def _symlinks_supported(directory):
+    probe = os.path.join(directory, f".symlink-probe-{os.getpid()}-{threading.get_ident()}")
+    try:
+        os.symlink(".", probe)
+    except (AttributeError, NotImplementedError):
+        return False
+    except OSError as e:
+        if e.errno in NO_SYMLINK_ERRNOS or getattr(e, "winerror", None) == NO_SYMLINK_WINERROR:
+            return False
+        raise
+    os.remove(probe)
+    return True
+
+
+def _make_link(live_path, release):
+    """Symlink to release under a temp name next to live_path"""
+    # Relative to the link's own directory, which holds the releases directory
+    target = os.path.join(os.path.basename(releases_dir(live_path)), os.path.basename(release))
+    # Unique per process and thread, since several runs may publish one site
+    tmp_link = f"{live_path}.tmp-link-{os.getpid()}-{threading.get_ident()}"
+    if os.path.lexists(tmp_link):
+        os.remove(tmp_link)
+    os.symlink(target, tmp_link)
+    return tmp_link
+
+
+def _point_link(live_path, release):
+    # rename(2) replaces the old link atomically
+    os.replace(_make_link(live_path, release), live_path)
+
+
+def publish(live_path, staging):
+    """Make staging the live site and prune old releases; hold site_lock() around it"""
+    live_path = os.path.abspath(live_path)
+    root = releases_dir(live_path)
+    if _symlinks_supported(root):
+        previous = current_release(live_path)
+        if os.path.isdir(live_path) and not os.path.islink(live_path):
+            # First publish of a site from before releases existed: keep it
+            # as the previous release. A link cannot be renamed over a
+            # directory, so the path is missing between these two renames
+            tmp_link = _make_link(live_path, staging)
+            previous = os.path.join(root, LEGACY_RELEASE)
+            os.rename(live_path, previous)
+            os.replace(tmp_link, live_path)
+        else:
+            _point_link(live_path, staging)
+    else:
+        previous = _park(live_path) if os.path.isdir(live_path) else None
+        os.rename(staging, live_path)
+    _set_previous(live_path, previous)
+    prune(live_path)
+    return live_path
+
+
+def prune(live_path):
+    """Remove the releases older than the previous release.
+
+    Only releases this site has published before can be older than it;
+    stagings of other runs and the release rolled back from are newer.
+    """
+    previous = previous_release(live_path)
+    if previous is None:
+        return
+    current = current_release(live_path)
+    live_name = os.path.basename(current) if os.path.islink(live_path) and current else None
+    for release in list_releases(live_path):
+        name = os.path.basename(release)
+        if name < os.path.basename(previous) and name != live_name:
+            shutil.rmtree(release, ignore_errors=True)
+
+
+def rollback(live_path):
+    """Point live_path back at the release that was live before this one"""
+    live_path = os.path.abspath(live_path)
+    with site_lock(live_path):
+        previous = previous_release(live_path)
+        if previous is None:
+            raise FileNotFoundError(f"No previous release of {live_path} to roll back to")
+        if os.path.islink(live_path):
+            _point_link(live_path, previous)
+        else:
+            _park(live_path)
+            os.rename(previous, live_path)
+        # One step back only; the release rolled back from is pruned by a later publish
+        _set_previous(live_path, None)
+    return previous
@@ -0,0 +1,85 @@
+"""Compact problem records shared by every handle in a run.
+
+A ProblemTable holds one Problem per distinct problem, keyed by a small
+integer that doubles as the problem's bit position in the solved-set
+bitsets (see comparison.py). Tag strings are interned, so the thousands of
+"implementation" tags point at a single string. Which handle solved what is
+not stored on the record; that lives in the bitsets.
+
+Given a ProblemCatalog, a record takes its name, rating and tags from the
+catalog, and the submission's embedded copy is only used for problems the
+catalog does not have (gym problems, or no catalog downloaded yet).
+"""
+import sys
+
+PROBLEM_URL = "https://codeforces.com/problemset/problem"
+
+
+class Problem:
+    __slots__ = ("key", "contest_id", "index", "name", "rating", "tags", "solved_count")
+
+    def __init__(self, key, contest_id, index, name, rating, tags, solved_count=None):
+        self.key = key
+        self.contest_id = contest_id
+        self.index = index
+        self.name = name
+        self.rating = rating
+        self.tags = tags
+        self.solved_count = solved_count  # from the catalog; None if unknown
+
+    @property
+    def problem_id(self):
+        return f"{self.contest_id}_{self.index}"
+
+    @property
+    def link(self):
+        return f"{PROBLEM_URL}/{self.contest_id}/{self.index}"
+
+    def sort_key(self):
+        # Unrated problems go last
+        return (self.rating if self.rating > 0 else 999999, self.contest_id, self.index)
+
+    def __repr__(self):
+        return f"Problem({self.contest_id}{self.index}, rating={self.rating})"
+
+
+class ProblemTable:
+    """Every distinct problem seen in a run, addressable by integer key"""
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog
+        self.keys = {}  # (contestId, index) -> key
+        self.records = []
+        self._tags = {}
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, key):
+        return self.records[key]
+
+    def intern_tags(self, tags):
+        interned = self._tags.get(tags)
+        if interned is None:
+            interned = self._tags[tags] = tuple(sys.intern(tag) for tag in tags)
+        return interned
+
+    def key_of(self, contest_id, index):
+        return self.keys.get((contest_id, index))
+
+    def add(self, problem):
+        """Return the key for an API problem object, creating its record once"""
+        contest_id = problem.get("contestId", 0)
+        index = problem.get("index", "")
+        key = self.keys.get((contest_id, index))
+        if key is None:
+            if self.catalog is not None:
+                problem = self.catalog.get(contest_id, index) or problem
+            key = self.keys[(contest_id, index)] = len(self.records)
+            self.records.append(Problem(
+                key, contest_id, index,
+                problem.get("name", "Unknown"),
+                problem.get("rating", 0),
+                self.intern_tags(tuple(problem.get("tags") or ())),
+                problem.get("solvedCount")))
+        return key
@@ -0,0 +1,128 @@
+"""Registry of every site this tool has generated, kept in SQLite.
+
+One row per site directory, recorded whenever a run publishes or refreshes
+it, so finding the latest site, listing sites and picking the stale ones
+are indexed queries instead of directory scans:
+
+    path               /home/me/codeforces_problems/codeforces_tourist
+    username           tourist
+    compare_handles    ["Petr", "Um_nik"]
+    created_at         1709287500.0
+    refreshed_at       1709891100.0
+
+The database lives at data_dir()/sites.sqlite3. A connection is opened per
+call, so the registry can be shared between threads.
+"""
+import json
+import os
+import time
+from contextlib import closing
+
+from .paths import data_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sites (
+    path TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    compare_handles TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    refreshed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sites_refreshed_at ON sites (refreshed_at);
+CREATE INDEX IF NOT EXISTS sites_username ON sites (username COLLATE NOCASE);
+"""
+
+
+def _site(row):
+    path, username, compare_handles, created_at, refreshed_at = row
+    return {
+        "path": path,
+        "username": username,
+        "compare_handles": json.loads(compare_handles),
+        "created_at": created_at,
+        "refreshed_at": refreshed_at,
+    }
+
+
+class SiteRegistry:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(data_dir(), "sites.sqlite3")
+        self._ready = False
+
+    def _connect(self):
+        # Imported on first use; most runs only open the registry at their end
+        import sqlite3
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            conn.executescript(SCHEMA)
+            self._ready = True
+        return conn
+
+    def _query(self, sql, params=()):
+        with closing(self._connect()) as conn:
+            return [_site(row) for row in conn.execute(sql, params)]
+
+    def record(self, path, username, compare_handles, refreshed_at=None):
+        """Add the site at path, or mark it refreshed if it is already known"""
+        refreshed_at = refreshed_at or time.time()
+        path = os.path.abspath(path)
+        compare_handles = json.dumps(list(compare_handles))
+        # Not an upsert (INSERT ... ON CONFLICT), which needs SQLite 3.24; both
+        # statements run in one transaction
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR IGNORE INTO sites VALUES (?, ?, ?, ?, ?)",
+                         (path, username, compare_handles, refreshed_at, refreshed_at))
+            conn.execute("UPDATE sites SET username = ?, compare_handles = ?, refreshed_at = ? "
+                         "WHERE path = ?", (username, compare_handles, refreshed_at, path))
+
+    def forget(self, path):
+        with closing(self._connect()) as conn, conn:
+            return conn.execute("DELETE FROM sites WHERE path = ?",
+                                (os.path.abspath(path),)).rowcount > 0
+
+    def get(self, path):
+        sites = self._query("SELECT * FROM sites WHERE path = ?", (os.path.abspath(path),))
+        return sites[0] if sites else None
+
+    def sites(self, username=None):
+        """Every registered site, most recently refreshed first"""
+        if username:
+            return self._query("SELECT * FROM sites WHERE username = ? COLLATE NOCASE "
+                               "ORDER BY refreshed_at DESC", (username,))
+        return self._query("SELECT * FROM sites ORDER BY refreshed_at DESC")
+
+    def latest(self):
+        """The most recently refreshed site that still exists, or None"""
+        offset = 0
+        while True:
+            sites = self._query("SELECT * FROM sites ORDER BY refreshed_at DESC LIMIT 1 OFFSET ?",
+                                (offset,))
+            if not sites:
+                return None
+            if os.path.isdir(sites[0]["path"]):
+                return sites[0]
+            offset += 1
+
+    def stale(self, max_age):
+        """Sites not refreshed in the last max_age seconds, oldest first"""
+        return self._query("SELECT * FROM sites WHERE refreshed_at < ? ORDER BY refreshed_at",
+                           (time.time() - max_age,))
+
+    def prune(self):
+        """Forget sites whose directory is gone; returns their paths"""
+        missing = [site["path"] for site in self.sites() if not os.path.isdir(site["path"])]
+        for path in missing:
+            self.forget(path)
+        return missing
+
+
+_default_registry = None
+
+
+def default_registry():
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = SiteRegistry()
+    return _default_registry
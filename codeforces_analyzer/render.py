@@ -0,0 +1,1018 @@
+"""HTML and CSS rendering for the generated problem directory.
+
+Rendering is deterministic: the same solve data always produces the same
+bytes. Each page's SHA-256 is kept in the site's manifest.json, and
+write_site() only rewrites pages whose hash changed. The index page's
+"Generated on" time is left out of its hash, so it shows when the content
+last changed.
+
+With output="bundle", write_site() writes one data file and an app page
+instead of the tag pages (see bundle.py).
+
+Tag pages are independent of each other, so they can be rendered in a
+thread or process pool (write_site's workers and pool arguments). Results
+are consumed in tag order, so the output is the same as rendering them one
+by one.
+"""
+import os
+import hashlib
+import datetime
+import tempfile
+import time
+
+from . import bundle, compress as compression, search, stats, timeline as timelines
+from .manifest import FILE_MODE, load_manifest, save_manifest
+from .modes import OUTPUTS, POOLS
+from .records import PROBLEM_URL
+from .templates import Template
+
+
+# Stylesheet shared by every page
+CSS = """
+/* General Styles */
+:root {
+    --primary-color: #1a73e8;
+    --primary-dark: #0d47a1;
+    --accent-color: #ff8f00;
+    --text-color: #333;
+    --light-bg: #f8f9fa;
+    --card-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    --solved-color: #4caf50;
+}
+
+body {
+    font-family: 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
+    line-height: 1.6;
+    color: var(--text-color);
+    background-color: var(--light-bg);
+    margin: 0;
+    padding: 0;
+}
+
+.container {
+    width: 100%;
+    max-width: 1200px;
+    margin: 0 auto;
+    padding: 20px;
+}
+
+/* Header Styles */
+header {
+    background: linear-gradient(135deg, var(--primary-color), var(--primary-dark));
+    color: white;
+    padding: 30px 0;
+    margin-bottom: 30px;
+    box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+}
+
+.header-content {
+    text-align: center;
+    padding: 0 20px;
+}
+
+h1 {
+    margin: 0;
+    font-size: 2.2rem;
+    font-weight: 600;
+}
+
+.comparison-info {
+    margin-top: 10px;
+    background: rgba(255,255,255,0.2);
+    display: inline-block;
+    padding: 5px 15px;
+    border-radius: 20px;
+}
+
+.timestamp {
+    font-style: italic;
+    opacity: 0.8;
+    margin-top: 10px;
+}
+
+/* Update info */
+.update-button {
+    background-color: var(--accent-color);
+    color: white;
+    border: none;
+    padding: 8px 15px;
+    border-radius: 4px;
+    cursor: pointer;
+    font-weight: 500;
+    margin-top: 10px;
+    transition: background-color 0.2s;
+}
+
+.update-button:hover {
+    background-color: #e68200;
+}
+
+.last-updated {
+    margin-top: 5px;
+    font-size: 0.9rem;
+    opacity: 0.8;
+}
+
+/* Card Styles */
+.cards-container {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(280px, 1fr));
+    gap: 20px;
+    margin-top: 30px;
+}
+
+.card {
+    background: white;
+    border-radius: 8px;
+    box-shadow: var(--card-shadow);
+    overflow: hidden;
+    transition: transform 0.3s ease, box-shadow 0.3s ease;
+}
+
+.card:hover {
+    transform: translateY(-5px);
+    box-shadow: 0 10px 20px rgba(0,0,0,0.12);
+}
+
+.card-header {
+    background: var(--primary-color);
+    color: white;
+    padding: 15px 20px;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+}
+
+.card-title {
+    font-size: 1.1rem;
+    font-weight: 600;
+    margin: 0;
+}
+
+.card-count-container {
+    display: flex;
+    gap: 10px;
+    align-items: center;
+}
+
+.card-count, .comparison-count {
+    border-radius: 50%;
+    width: 30px;
+    height: 30px;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    font-weight: bold;
+}
+
+.card-count {
+    background: white;
+    color: var(--primary-color);
+}
+
+.comparison-count {
+    background: var(--solved-color);
+    color: white;
+    font-size: 0.8rem;
+}
+
+.card-body {
+    padding: 20px;
+}
+
+.card-link {
+    display: inline-block;
+    padding: 10px 20px;
+    background: var(--primary-color);
+    color: white;
+    text-decoration: none;
+    border-radius: 4px;
+    font-weight: 500;
+    margin-top: 10px;
+    transition: background-color 0.2s ease;
+}
+
+.card-link:hover {
+    background: var(--primary-dark);
+}
+
+/* Table Styles */
+.problem-table {
+    width: 100%;
+    border-collapse: collapse;
+    margin-top: 20px;
+    box-shadow: var(--card-shadow);
+}
+
+.problem-table th,
+.problem-table td {
+    padding: 15px;
+    text-align: left;
+    border-bottom: 1px solid #e0e0e0;
+}
+
+.problem-table th {
+    background-color: var(--primary-color);
+    color: white;
+    font-weight: 500;
+}
+
+.problem-table tr:nth-child(even) {
+    background-color: rgba(0,0,0,0.02);
+}
+
+.problem-table tr:hover {
+    background-color: rgba(26, 115, 232, 0.05);
+}
+
+.problem-link {
+    color: var(--primary-color);
+    text-decoration: none;
+    font-weight: 500;
+}
+
+.problem-link:hover {
+    text-decoration: underline;
+}
+
+.rating {
+    font-weight: bold;
+    color: var(--accent-color);
+}
+
+/* Solved by compare styles */
+.solved-by-compare {
+    position: relative;
+}
+
+.solved-by-compare:after {
+    content: "✓";
+    color: var(--solved-color);
+    margin-left: 8px;
+    font-weight: bold;
+}
+
+/* Back button */
+.back-link {
+    display: inline-block;
+    margin-bottom: 20px;
+    color: var(--primary-color);
+    text-decoration: none;
+    font-weight: 500;
+}
+
+.back-link:before {
+    content: '←';
+    margin-right: 5px;
+}
+
+.back-link:hover {
+    text-decoration: underline;
+}
+
+/* Search */
+.search-box {
+    margin-bottom: 30px;
+}
+
+.search-box input {
+    width: 100%;
+    box-sizing: border-box;
+    padding: 12px 15px;
+    font-size: 1rem;
+    border: 1px solid #ccc;
+    border-radius: 8px;
+}
+
+.search-results {
+    list-style: none;
+    padding: 0;
+    margin: 10px 0 0;
+}
+
+.search-results li {
+    padding: 6px 0;
+    border-bottom: 1px solid #e0e0e0;
+}
+
+/* Stats */
+.stats-link {
+    margin: 0 0 20px;
+}
+
+.stats-link a {
+    color: var(--primary-color);
+    font-weight: 500;
+    text-decoration: none;
+}
+
+.stats-link a:hover {
+    text-decoration: underline;
+}
+
+.chart-box {
+    overflow-x: auto;
+    background: white;
+    box-shadow: var(--card-shadow);
+    border-radius: 8px;
+    padding: 20px;
+    margin-bottom: 30px;
+}
+
+.chart {
+    display: block;
+    max-width: none;
+    font-size: 11px;
+}
+
+.chart .bar {
+    fill: var(--primary-color);
+}
+
+.chart .bar.unrated {
+    fill: #9e9e9e;
+}
+
+.chart text {
+    text-anchor: middle;
+    fill: var(--text-color);
+}
+
+.heatmap rect {
+    fill: var(--primary-color);
+}
+
+.heatmap rect.empty {
+    fill: #eef1f5;
+}
+
+.heatmap text.on-dark {
+    fill: white;
+}
+
+.chart .row-label {
+    text-anchor: end;
+}
+
+.chart .row-total {
+    font-weight: bold;
+}
+
+.chart-note {
+    color: #666;
+}
+
+.chart .month-label {
+    text-anchor: start;
+}
+
+.calendar rect {
+    fill: #eef1f5;
+}
+
+.calendar rect.l1 { fill: #c6dafc; }
+.calendar rect.l2 { fill: #8ab4f8; }
+.calendar rect.l3 { fill: #4285f4; }
+.calendar rect.l4 { fill: var(--primary-dark); }
+
+.rating-line .grid {
+    stroke: #e0e0e0;
+}
+
+.rating-line .line {
+    fill: none;
+    stroke: var(--accent-color);
+    stroke-width: 2;
+}
+
+.timeline-summary {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(200px, 1fr));
+    gap: 15px;
+    margin: 0 0 10px;
+}
+
+.timeline-summary div {
+    background: white;
+    box-shadow: var(--card-shadow);
+    border-radius: 8px;
+    padding: 15px;
+}
+
+.timeline-summary dt {
+    color: #666;
+    font-size: 0.9rem;
+}
+
+.timeline-summary dd {
+    margin: 5px 0 0;
+    font-size: 1.2rem;
+    font-weight: bold;
+}
+
+/* Footer */
+footer {
+    text-align: center;
+    margin-top: 50px;
+    padding: 20px;
+    color: #666;
+    font-size: 0.9rem;
+}
+
+/* Responsive adjustments */
+@media (max-width: 768px) {
+    .cards-container {
+        grid-template-columns: repeat(auto-fill, minmax(250px, 1fr));
+    }
+    
+    h1 {
+        font-size: 1.8rem;
+    }
+    
+    .card-header {
+        padding: 12px 15px;
+    }
+}
+
+@media (max-width: 480px) {
+    .cards-container {
+        grid-template-columns: 1fr;
+    }
+    
+    .container {
+        padding: 15px;
+    }
+}
+"""
+
+
+def _overlap_title(compare_handles, comparison, tag):
+    if len(compare_handles) == 1:
+        return f"Problems also solved by {compare_handles[0]}"
+    overlaps = comparison.tag_overlap_by_handle(tag)
+    return "Also solved by " + ", ".join(f"{handle}: {count}" for handle, count in overlaps.items())
+
+
+def _solved_cell(compare_handles, comparison, problem, solved_by):
+    if len(compare_handles) == 1:
+        return f'<td>{"✓" if solved_by else ""}</td>'
+    if not solved_by:
+        return '<td></td>'
+    solvers = ", ".join(comparison.solvers(problem.key))
+    return f'<td title="{solvers}">{solved_by}/{len(compare_handles)}</td>'
+
+
+def tag_file_name(tag):
+    tag_id = tag.replace(' ', '-').replace('*', '').replace('/', '-').lower()
+    return f"{tag_id}.html"
+
+
+# The Update Data button. The local server (server.py) answers POST
+# refresh next to each page by updating the site, so the reload shows the
+# new data; opened from disk, the page says how to start the server.
+UPDATE_SCRIPT = """        function updateData() {
+            const updateButton = document.getElementById('update-button');
+            const statusElement = document.getElementById('update-status');
+
+            // Disable button during update
+            updateButton.disabled = true;
+            updateButton.textContent = 'Updating...';
+            statusElement.textContent = 'Fetching latest data...';
+
+            fetch('refresh', { method: 'POST' })
+                .then(response => response.json().then(data => {
+                    if (!response.ok) throw new Error(data.error || response.statusText);
+                    return data;
+                }))
+                .then(data => {
+                    statusElement.textContent = `Updated: ${data.new_submissions} new submissions, `
+                        + `${data.pages_written} pages changed`;
+                    location.reload();
+                })
+                .catch(error => {
+                    statusElement.textContent = location.protocol === 'file:'
+                        ? 'Updating from the page needs the local server: python -m codeforces_analyzer serve'
+                        : 'Update failed: ' + error.message;
+                    updateButton.textContent = 'Update Data';
+                    updateButton.disabled = false;
+                });
+        }
+"""
+
+# Page templates, compiled once when the module is imported
+INDEX_HEAD = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Codeforces Problems - {username}</title>
+    <link rel="stylesheet" href="style.css">
+    <script>
+{update_script}    </script>
+</head>
+<body>
+    <header>
+        <div class="header-content">
+            <h1>Codeforces Problems Solved by {username}</h1>
+            {comparison_info}
+            <p class="timestamp">Generated on: {timestamp}</p>
+            <div class="update-container">
+                <button id="update-button" class="update-button" onclick="updateData()">Update Data</button>
+                <p id="update-status" class="last-updated"></p>
+            </div>
+        </div>
+    </header>
+    
+    <div class="container">
+        <div class="search-box">
+            <input id="search-input" type="search" placeholder="Search problems, e.g. 1520F or segment tree 1900" autocomplete="off">
+            <ul id="search-results" class="search-results"></ul>
+        </div>
+
+        <p class="stats-link"><a href="{stats_file}">Solved problems by rating and tag</a> ·
+            <a href="{timeline_file}">Solve timeline and streaks</a></p>
+
+        <h2>Problem Categories</h2>
+        
+        <div class="cards-container">
+""", "index_head", update_script=UPDATE_SCRIPT, stats_file=stats.STATS_FILE,
+    timeline_file=timelines.TIMELINE_FILE)
+
+INDEX_CARD = Template("""            <div class="card">
+                <div class="card-header">
+                    <h3 class="card-title">{tag}</h3>
+                    <div class="card-count-container">
+                        <span class="card-count">{count}</span>
+                        {comparison_count}
+                    </div>
+                </div>
+                <div class="card-body">
+                    <p>View {count} problems in this category</p>
+                    <a href="{tag_file}" class="card-link">View Problems</a>
+                </div>
+            </div>
+""", "index_card")
+
+INDEX_TAIL = Template("""        </div>
+    </div>
+    
+    <footer>
+        <p>Generated using Codeforces Problem Directory Generator</p>
+        <p>Generated on: <span id="generation-time">{timestamp}</span></p>
+    </footer>
+    <script src="{search_file}"></script>
+</body>
+</html>
+""", "index_tail", search_file=search.SEARCH_FILE)
+
+TAG_HEAD = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{tag} Problems - {username}</title>
+    <link rel="stylesheet" href="style.css">
+    <script>
+{update_script}    </script>
+</head>
+<body>
+    <header>
+        <div class="header-content">
+            <h1>{tag} Problems</h1>
+            <p class="timestamp">Problems solved by {username}</p>
+            {comparison_info}
+            <div class="update-container">
+                <button id="update-button" class="update-button" onclick="updateData()">Update Data</button>
+                <p id="update-status" class="last-updated"></p>
+            </div>
+        </div>
+    </header>
+    
+    <div class="container">
+        <a href="index.html" class="back-link">Back to Categories</a>
+        
+        <h2>{tag} Problems ({count})</h2>
+        
+        <table class="problem-table">
+            <thead>
+                <tr>
+                    <th>#</th>
+                    <th>Problem</th>
+                    <th>Rating</th>
+                    {compare_header}
+                </tr>
+            </thead>
+            <tbody>
+""", "tag_head", update_script=UPDATE_SCRIPT)
+
+TAG_ROW = Template("""                <tr{row_class}>
+                    <td>{number}</td>
+                    <td class="{cell_class}"><a href="{problem_url}/{contest_id}/{index}" target="_blank" class="problem-link">{contest_id}{index} - {name}</a></td>
+                    <td class="rating">{rating}</td>
+                    {solved_cell}
+                </tr>
+""", "tag_row", problem_url=PROBLEM_URL)
+
+TAG_TAIL = Template("""            </tbody>
+        </table>
+    </div>
+    
+    <footer>
+        <p>Generated using Codeforces Problem Directory Generator</p>
+    </footer>
+</body>
+</html>
+""", "tag_tail")
+
+
+STATS_PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Statistics - {username}</title>
+    <link rel="stylesheet" href="style.css">
+    <script>
+{update_script}    </script>
+</head>
+<body>
+    <header>
+        <div class="header-content">
+            <h1>Statistics</h1>
+            <p class="timestamp">Problems solved by {username}</p>
+            <div class="update-container">
+                <button id="update-button" class="update-button" onclick="updateData()">Update Data</button>
+                <p id="update-status" class="last-updated"></p>
+            </div>
+        </div>
+    </header>
+    
+    <div class="container">
+        <a href="index.html" class="back-link">Back to Categories</a>
+        
+        <h2>Solved Problems by Rating ({solved})</h2>
+        <div class="chart-box">
+{histogram}
+        </div>
+        
+        <h2>Tags by Rating</h2>
+        <p class="chart-note">A problem counts once under each of its tags. Darker cells hold more problems.</p>
+        <div class="chart-box">
+{heatmap}
+        </div>
+    </div>
+    
+    <footer>
+        <p>Generated using Codeforces Problem Directory Generator</p>
+    </footer>
+</body>
+</html>
+""", "stats_page", update_script=UPDATE_SCRIPT)
+
+
+def render_stats_page(username, rating_stats):
+    return STATS_PAGE.render(username=username, solved=rating_stats.solved,
+                             histogram=stats.render_histogram(rating_stats),
+                             heatmap=stats.render_heatmap(rating_stats))
+
+
+TIMELINE_PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Timeline - {username}</title>
+    <link rel="stylesheet" href="style.css">
+    <script>
+{update_script}    </script>
+</head>
+<body>
+    <header>
+        <div class="header-content">
+            <h1>Solve Timeline</h1>
+            <p class="timestamp">Problems solved by {username}</p>
+            <div class="update-container">
+                <button id="update-button" class="update-button" onclick="updateData()">Update Data</button>
+                <p id="update-status" class="last-updated"></p>
+            </div>
+        </div>
+    </header>
+    
+    <div class="container">
+        <a href="index.html" class="back-link">Back to Categories</a>
+        
+        <dl class="timeline-summary">
+{summary}        </dl>
+        <p class="chart-note">Each problem counts on the day of its first accepted submission. Days are in UTC.</p>
+        
+        <h2>Last 12 Months</h2>
+        <div class="chart-box">
+{calendar}
+        </div>
+        
+        <h2>Solves per Week</h2>
+        <div class="chart-box">
+{weekly}
+        </div>
+        
+        <h2>Solves per Month</h2>
+        <div class="chart-box">
+{monthly}
+        </div>
+        
+        <h2>Average Rating of Problems Solved in the Last {rolling_days} Days</h2>
+        <div class="chart-box">
+{rating_line}
+        </div>
+    </div>
+    
+    <footer>
+        <p>Generated using Codeforces Problem Directory Generator</p>
+    </footer>
+</body>
+</html>
+""", "timeline_page", update_script=UPDATE_SCRIPT, rolling_days=timelines.ROLLING_DAYS)
+
+
+def render_timeline_page(username, timeline, today=None):
+    series = timeline.series(today)
+    return TIMELINE_PAGE.render(username=username, summary=timelines.render_summary(series),
+                                calendar=timelines.render_calendar(series),
+                                weekly=timelines.render_weekly(series),
+                                monthly=timelines.render_monthly(series),
+                                rating_line=timelines.render_rating_line(series))
+
+
+def render_index(username, compare_handles, problems_by_tag, comparison, timestamp):
+    if compare_handles:
+        comparison_info = f'<div class="comparison-info">Comparing with: {", ".join(compare_handles)}</div>'
+    else:
+        comparison_info = ''
+    parts = [INDEX_HEAD.render(username=username, comparison_info=comparison_info,
+                               timestamp=timestamp)]
+
+    # One card per tag
+    for tag, problems in problems_by_tag.items():
+        if compare_handles:
+            # Count problems also solved by comparison handles (popcounts over the bitsets)
+            comparison_count = (f'<span class="comparison-count" title="{_overlap_title(compare_handles, comparison, tag)}">'
+                                f'{comparison.tag_overlap(tag)}</span>')
+        else:
+            comparison_count = ''
+        parts.append(INDEX_CARD.render(tag=tag, count=len(problems),
+                                       comparison_count=comparison_count,
+                                       tag_file=tag_file_name(tag)))
+
+    parts.append(INDEX_TAIL.render(timestamp=timestamp))
+    return "".join(parts)
+
+
+def render_tag_page(username, compare_handles, tag, problems, comparison):
+    if compare_handles:
+        # Count problems also solved by comparison handles
+        compare_count = comparison.tag_overlap(tag)
+        if len(compare_handles) == 1:
+            compare_summary = f"{compare_handles[0]} ({compare_count}/{len(problems)} also solved)"
+            compare_column = f"Solved by {compare_handles[0]}"
+        else:
+            compare_summary = f"{', '.join(compare_handles)} ({compare_count}/{len(problems)} solved by at least one)"
+            compare_column = f"Solved by (of {len(compare_handles)})"
+        comparison_info = f'<div class="comparison-info">Comparing with: {compare_summary}</div>'
+        compare_header = f'<th>{compare_column}</th>'
+    else:
+        comparison_info = compare_header = ''
+    parts = [TAG_HEAD.render(tag=tag, username=username, comparison_info=comparison_info,
+                             count=len(problems), compare_header=compare_header)]
+
+    # Rows are the hot loop: fields go in positionally, in TAG_ROW.fields order
+    render_row = TAG_ROW.render
+    append = parts.append
+    for number, problem in enumerate(problems, 1):
+        rating = problem.rating if problem.rating > 0 else "Unknown"
+        if compare_handles:
+            # Solved state lives in the comparison bitsets, not on the record
+            solved_by = comparison.solved_count(problem.key)
+            solved_cell = _solved_cell(compare_handles, comparison, problem, solved_by)
+        else:
+            solved_by = 0
+            solved_cell = ''
+        if solved_by:
+            append(render_row(' class="solved-row"', number, " solved-by-compare",
+                              problem.contest_id, problem.index, problem.name, rating, solved_cell))
+        else:
+            append(render_row('', number, '', problem.contest_id, problem.index, problem.name,
+                              rating, solved_cell))
+
+    parts.append(TAG_TAIL.render())
+    return "".join(parts)
+
+
+# Stands in for the generation time while the index page is hashed
+TIMESTAMP_PLACEHOLDER = "\0generated-on\0"
+
+
+def page_hash(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def write_file(path, content):
+    # Write next to the target and swap it in, so readers never see half a
+    # page; the temp name is unique, as two runs may write the same page
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".",
+                                    suffix=".tmp", dir=os.path.dirname(path) or ".")
+    try:
+        os.chmod(tmp_path, FILE_MODE)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class SiteWriter:
+    """Writes pages into site_dir, skipping those whose content is unchanged.
+
+    With compress, every page also gets .gz/.br copies (see compress.py);
+    without it, copies left by an earlier run are removed.
+    """
+
+    def __init__(self, site_dir, compress=False):
+        self.site_dir = site_dir
+        self.compress = compress
+        self.manifest = load_manifest(site_dir)
+        self.old_pages = self.manifest.get("pages", {})
+        self.pages = {}
+        self.written = []
+        self.skipped = []
+        self.removed = []
+        self.bytes_written = 0
+        self.compressed = []  # (name, raw size, {suffix: size}) for this run's copies
+        self.removed_copies = []  # copies deleted because compression is off
+
+    def write(self, name, content, hash_content=None):
+        """Write one page; hash_content is what identifies it, if not content itself"""
+        digest = page_hash(content if hash_content is None else hash_content)
+        self.pages[name] = digest
+        path = os.path.join(self.site_dir, name)
+        if self.old_pages.get(name) == digest and os.path.exists(path):
+            self.skipped.append(name)
+            # An unchanged page keeps its copies, unless it has none yet or should have none
+            if not (self.compress and compression.has_compressed(path)):
+                self._compress(name, path)
+            return False
+        write_file(path, content)
+        self.written.append(name)
+        self.bytes_written += os.path.getsize(path)
+        self._compress(name, path)
+        return True
+
+    def _compress(self, name, path):
+        if self.compress:
+            self.compressed.append((name, os.path.getsize(path), compression.compress_file(path)))
+        else:
+            self.removed_copies.extend(name + suffix
+                                       for suffix in compression.remove_compressed(path))
+
+    def finish(self, info=None):
+        """Remove stale pages and save the manifest, with info's fields merged in"""
+        # Drop pages that are no longer generated, e.g. a tag that disappeared
+        for name in self.old_pages:
+            if name not in self.pages:
+                path = os.path.join(self.site_dir, name)
+                if os.path.exists(path):
+                    os.remove(path)
+                compression.remove_compressed(path)
+                self.removed.append(name)
+        self.manifest.update(info or {})
+        self.manifest["pages"] = self.pages
+        save_manifest(self.site_dir, self.manifest)
+
+    def summary(self):
+        return (f"{len(self.written)} pages written, {len(self.skipped)} unchanged, "
+                f"{len(self.removed)} removed")
+
+    def size_report(self):
+        """Raw vs compressed sizes of the pages compressed in this run, as lines"""
+        return compression.size_report(self.compressed) if self.compressed else []
+
+
+# Set once per worker process so the comparison is not pickled for every page
+_worker_args = None
+
+
+def _init_worker(username, compare_handles, comparison):
+    global _worker_args
+    _worker_args = (username, compare_handles, comparison)
+
+
+def _render_in_worker(item):
+    username, compare_handles, comparison = _worker_args
+    tag, problems = item
+    return render_tag_page(username, compare_handles, tag, problems, comparison)
+
+
+def render_tag_pages(username, compare_handles, problems_by_tag, comparison, workers=1,
+                     pool="thread"):
+    """Yield (tag, html) for every tag, in problems_by_tag order.
+
+    With workers > 1 the pages are rendered in a pool of that many threads
+    or processes while the caller consumes the finished ones.
+    """
+    if pool not in POOLS:
+        raise ValueError(f"pool must be one of {', '.join(POOLS)}, not {pool!r}")
+    items = list(problems_by_tag.items())
+    if workers <= 1 or len(items) <= 1:
+        for tag, problems in items:
+            yield tag, render_tag_page(username, compare_handles, tag, problems, comparison)
+        return
+
+    # Imported here: loading multiprocessing costs more than most sites take to render
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    if pool == "process":
+        executor = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                       initargs=(username, compare_handles, comparison))
+        render = _render_in_worker
+    else:
+        executor = ThreadPoolExecutor(workers)
+
+        def render(item):
+            return render_tag_page(username, compare_handles, item[0], item[1], comparison)
+
+    with executor:
+        # map() hands results back in submission order
+        for (tag, _), page in zip(items, executor.map(render, items)):
+            yield tag, page
+
+
+def write_site(username, compare_handles, problems_by_tag, comparison, site_dir, workers=1,
+               pool="thread", info=None, output="pages", compress=False, timeline=None):
+    """Render the whole site into site_dir and return the SiteWriter.
+
+    info holds extra manifest fields; the render time is added to its timing.
+    compress writes precompressed copies of the pages that changed.
+    timeline (see timeline.py) is saved with the site and drawn on its
+    timeline page; without one the page is empty.
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f"output must be one of {', '.join(OUTPUTS)}, not {output!r}")
+    started = time.perf_counter()
+    writer = SiteWriter(site_dir, compress)
+    writer.write("style.css", CSS)
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    if output == "bundle":
+        writer.write(bundle.DATA_FILE,
+                     bundle.render_data(username, compare_handles, problems_by_tag, comparison))
+        index = bundle.render_app(username, compare_handles, TIMESTAMP_PLACEHOLDER, UPDATE_SCRIPT)
+    else:
+        for tag, page in render_tag_pages(username, compare_handles, problems_by_tag, comparison,
+                                          workers, pool):
+            writer.write(tag_file_name(tag), page)
+        index = render_index(username, compare_handles, problems_by_tag, comparison,
+                             TIMESTAMP_PLACEHOLDER)
+
+    # In bundle mode the search documents are the rows of data.js
+    search_started = time.perf_counter()
+    content, token_count = search.render_search(problems_by_tag, with_docs=output != "bundle")
+    writer.write(search.SEARCH_FILE, content)
+    search_seconds = time.perf_counter() - search_started
+
+    stats_started = time.perf_counter()
+    rating_stats = stats.compute_stats(problems_by_tag)
+    writer.write(stats.STATS_FILE, render_stats_page(username, rating_stats))
+    stats_seconds = time.perf_counter() - stats_started
+
+    # The state goes with the site, so the next update only folds in newer submissions
+    timeline = timeline or timelines.Timeline(username)
+    # Drawn up to today, but only rewritten when the solves change
+    writer.write(timelines.TIMELINE_FILE, render_timeline_page(username, timeline),
+                 hash_content=render_timeline_page(username, timeline, timeline.last_day()))
+    writer.write(timelines.STATE_FILE, timeline.to_json())
+
+    # The index goes last so it never links to a page that is not there yet
+    writer.write("index.html", index.replace(TIMESTAMP_PLACEHOLDER, timestamp), hash_content=index)
+
+    info = dict(info or {})
+    info["search"] = {"tokens": token_count, "bytes": len(content.encode('utf-8'))}
+    info["stats"] = {"buckets": len(rating_stats.buckets), "backend": stats.BACKEND}
+    info["timing"] = dict(info.get("timing", {}), render=round(time.perf_counter() - started, 3),
+                          search=round(search_seconds, 3), stats=round(stats_seconds, 3))
+    writer.finish(info)
+    writer.index_path = os.path.join(site_dir, "index.html")
+    return writer
+
+
+def create_css_file(site_dir):
+    write_file(os.path.join(site_dir, "style.css"), CSS)
+
+
+def generate_multi_page_site(username, compare_handles, problems_by_tag, comparison, site_dir,
+                             compress=False):
+    return write_site(username, compare_handles, problems_by_tag, comparison, site_dir,
+                      compress=compress).index_path
+
+
+def create_tag_page(username, compare_handles, tag, problems, site_dir, tag_file, comparison=None):
+    write_file(os.path.join(site_dir, tag_file),
+               render_tag_page(username, compare_handles, tag, problems, comparison))
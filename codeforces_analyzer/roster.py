@@ -0,0 +1,304 @@
+"""Build the sites of a whole roster of handles in one run.
+
+A roster is a CSV file with a handle column and an optional compare
+column, whose handles are separated by spaces, or by commas inside quotes:
+
+    handle,compare
+    tourist,"Petr, Um_nik"
+    jiangly,club_coach
+
+or a JSON list of handles and {"handle": ..., "compare": [...]} objects
+(or one object mapping each handle to its compare handles). A handle that
+is listed twice gets one site, compared with the handles of both entries.
+
+The run has two stages:
+
+1. fetch: every distinct handle, users and compare handles alike, is
+   fetched once through one FetchCache, FETCH_WORKERS at a time, and the
+   problemset catalog is loaded (or refreshed) once;
+2. build: the sites are organized and rendered, workers at a time, in a
+   pool of threads or processes. Worker processes use every core; they
+   read the submissions the fetch stage left in the store, are handed the
+   catalog, and never call the API themselves.
+
+A site that fails is logged and left out; the others go on. The run ends
+with a summary line:
+
+    Roster finished in 312s: 245 of 250 sites built, 5 failed, 47.1 handles/min
+"""
+import csv
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from .api import CodeforcesAPIError
+from .catalog import default_catalog
+from .core import FetchCache, fetch_handles, generate_directory, parse_handles
+from .metrics import Metrics
+from .modes import POOLS
+from .store import StoredSubmissions, default_store
+
+# Counters of the site runs that are added up into the roster's metrics
+BUILD_COUNTERS = ("problems", "tags", "pages_written", "pages_unchanged", "pages_removed",
+                  "bytes_written", "files_compressed")
+
+# Share of the progress bar the fetch stage takes
+FETCH_PROGRESS = 40
+
+
+class RosterError(Exception):
+    """Raised when a roster file cannot be read"""
+
+
+def _ignore(*args):
+    pass
+
+
+def _is_handle_list(value):
+    return isinstance(value, str) or (isinstance(value, list)
+                                      and all(isinstance(h, str) for h in value))
+
+
+def _add_entry(entries, handle, compare):
+    handle = handle.strip()
+    if not handle or handle.startswith("#"):
+        return
+    # Handles are case-insensitive, so Tourist and tourist are one site
+    entry = entries.setdefault(handle.lower(), {"username": handle, "compare_handles": []})
+    compare_handles = parse_handles(entry["compare_handles"] + parse_handles(compare))
+    entry["compare_handles"] = [h for h in compare_handles if h.lower() != handle.lower()]
+
+
+def parse_roster(text, format="csv"):
+    """Roster entries, as dicts with username and compare_handles, in file order"""
+    entries = {}
+    if format == "json":
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise RosterError(f"not valid JSON: {e}")
+        if isinstance(data, dict):
+            data = [{"handle": handle, "compare": compare} for handle, compare in data.items()]
+        if not isinstance(data, list):
+            raise RosterError("a JSON roster must be a list of handles")
+        for position, item in enumerate(data, 1):
+            if isinstance(item, str):
+                item = {"handle": item}
+            if not isinstance(item, dict) or not isinstance(item.get("handle"), str):
+                raise RosterError(f"entry {position} has no handle")
+            compare = item.get("compare") or []
+            if not _is_handle_list(compare):
+                raise RosterError(f"entry {position}: compare must be a string or a list of handles")
+            _add_entry(entries, item["handle"], compare)
+    else:
+        reader = csv.DictReader(io.StringIO(text))
+        fields = [(name or "").strip().lower() for name in reader.fieldnames or []]
+        if "handle" not in fields:
+            raise RosterError("a CSV roster needs a handle column")
+        reader.fieldnames = fields
+        for row in reader:
+            _add_entry(entries, row.get("handle") or "", row.get("compare") or "")
+    return list(entries.values())
+
+
+def load_roster(path):
+    """Read a roster file: .json files as JSON, anything else as CSV"""
+    try:
+        # utf-8-sig drops the byte order mark spreadsheets put in front of CSV files
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            text = f.read()
+    except OSError as e:
+        raise RosterError(f"cannot read {path}: {e}")
+    try:
+        return parse_roster(text, "json" if path.lower().endswith(".json") else "csv")
+    except RosterError as e:
+        raise RosterError(f"{path}: {e}")
+
+
+class StoredResults:
+    """Stands in for the FetchCache in worker processes.
+
+    fetched maps each lowercased handle to what the fetch stage got for it:
+    (new_count, unsaved, unsaved_count), or the error message. Submissions
+    are read back from the store.
+    """
+
+    def __init__(self, fetched):
+        self.fetched = fetched
+
+    def fetch(self, handle, log=None, metrics=None):
+        result = self.fetched[handle.lower()]
+        if isinstance(result, str):
+            raise CodeforcesAPIError(result)
+        new_count, unsaved, unsaved_count = result
+        return StoredSubmissions(default_store(), handle, unsaved, new_count, unsaved_count)
+
+
+class FixedCatalog:
+    """Stands in for the CatalogCache: every site of the run gets the same catalog"""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def get(self, log=None, max_age=None, metrics=None):
+        return self.catalog
+
+
+def _detach(result):
+    """What a worker process needs to rebuild a fetch result"""
+    if isinstance(result, Exception):
+        return str(result)
+    return result.new_count, result.unsaved, result.unsaved_count
+
+
+# Set once per worker process so the fetch results and the catalog are not
+# pickled for every site
+_worker_cache = None
+_worker_catalog = None
+
+
+def _init_worker(fetched, catalog):
+    global _worker_cache, _worker_catalog
+    _worker_cache = StoredResults(fetched)
+    _worker_catalog = FixedCatalog(catalog)
+
+
+def _build_site(entry, output_dir, options, fetch_cache, catalog_cache, log):
+    """Generate one site; a failure is returned rather than raised"""
+    metrics = Metrics()
+    try:
+        index_path = generate_directory(entry["username"], entry["compare_handles"], output_dir,
+                                        log=log, metrics=metrics, fetch_cache=fetch_cache,
+                                        catalog_cache=catalog_cache, **options)
+        return {"index_path": index_path, "metrics": metrics.snapshot()}
+    except Exception as e:
+        return {"error": str(e), "metrics": metrics.snapshot()}
+
+
+def _build_in_worker(entry, output_dir, options):
+    # The log lines go back with the result; the parent prints them
+    lines = []
+    result = _build_site(entry, output_dir, options, _worker_cache, _worker_catalog,
+                         lines.append)
+    result["log"] = lines
+    return result
+
+
+def build_roster(entries, output_dir, log=None, progress=None, workers=None, pool="thread",
+                 refetch=False, render_workers=1, render_pool="thread", output=None,
+                 compress=None, metrics=None):
+    """Generate a site under output_dir for every roster entry and return a summary.
+
+    workers sites are built at once (default: one per core) in a "thread"
+    or "process" pool. Processes render each site in one worker, so
+    render_workers and render_pool only apply to threads. refetch downloads
+    every handle's full history and rebuilds each site's timeline. metrics gets the
+    catalog, fetch and build phases and the sites' page counters. The
+    summary holds the counts, the error of each failed site and
+    handles_per_minute, the sites built per minute of the whole run.
+    """
+    if pool not in POOLS:
+        raise ValueError(f"pool must be one of {', '.join(POOLS)}, not {pool!r}")
+    log = log or _ignore
+    progress = progress or _ignore
+    metrics = metrics or Metrics()
+    workers = max(1, min(workers or os.cpu_count() or 1, len(entries) or 1))
+    started = time.perf_counter()
+    results = {}
+
+    with metrics.run():
+        # Step 1: Fetch every distinct handle once, whichever sites use it
+        distinct = {}
+        for entry in entries:
+            for handle in [entry["username"]] + entry["compare_handles"]:
+                distinct.setdefault(handle.lower(), handle)
+        log(f"Roster: {len(entries)} sites, {len(distinct)} distinct handles, "
+            f"{workers} {pool} workers")
+        with metrics.phase("catalog"):
+            catalog = default_catalog().get(log, metrics=metrics)
+        fetch_cache = FetchCache(refetch)
+        with metrics.phase("fetch"):
+            fetched = fetch_handles(list(distinct.values()), log, progress, metrics=metrics,
+                                    cache=fetch_cache, start=0, end=FETCH_PROGRESS)
+        fetch_errors = sum(isinstance(result, Exception) for result in fetched.values())
+
+        # Step 2: Organize and render the sites side by side
+        # The handles are already fetched; refetch still makes every site
+        # rebuild its solve timeline from the full history
+        options = {"output": output, "compress": compress, "refetch": refetch}
+        if pool == "process":
+            executor = ProcessPoolExecutor(
+                workers, initializer=_init_worker,
+                initargs=({key: _detach(fetched[handle]) for key, handle in distinct.items()},
+                          catalog))
+
+            def submit(entry):
+                return executor.submit(_build_in_worker, entry, output_dir, options)
+        else:
+            executor = ThreadPoolExecutor(workers)
+            options.update(render_workers=render_workers, render_pool=render_pool)
+
+            def submit(entry):
+                def site_log(message):
+                    # Lines of sites built side by side would be impossible to tell apart
+                    log(f"[{entry['username']}] {message}")
+
+                return executor.submit(_build_site, entry, output_dir, options, fetch_cache,
+                                       FixedCatalog(catalog), site_log)
+
+        os.makedirs(output_dir, exist_ok=True)
+        with metrics.phase("build"), executor:
+            futures = {submit(entry): entry for entry in entries}
+            for done, future in enumerate(as_completed(futures), 1):
+                username = futures[future]["username"]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # e.g. a worker process that was killed
+                    result = {"error": str(e) or type(e).__name__, "metrics": None}
+                results[username] = result
+                for line in result.get("log", ()):
+                    log(f"[{username}] {line}")
+                counters = result["metrics"]["counters"] if result["metrics"] else {}
+                for name in BUILD_COUNTERS:
+                    if name in counters:
+                        metrics.count(name, counters[name])
+                if "error" in result:
+                    log(f"Error building the site of {username}: {result['error']}")
+                    message = f"Failed to build {username}"
+                else:
+                    message = f"Built {username}"
+                progress(FETCH_PROGRESS + (100 - FETCH_PROGRESS) * done // len(entries),
+                         f"{message} ({done}/{len(entries)})")
+
+        # Step 3: Summary
+        failed = {username: result["error"] for username, result in results.items()
+                  if "error" in result}
+        built = len(results) - len(failed)
+        seconds = time.perf_counter() - started
+        metrics.count("sites_built", built)
+        metrics.count("sites_failed", len(failed))
+        summary = {
+            "sites": len(entries),
+            "built": built,
+            "failed": failed,
+            "handles": len(distinct),
+            "handles_fetched": fetch_cache.fetches,
+            "fetch_errors": fetch_errors,
+            "workers": workers,
+            "pool": pool,
+            "fetch_seconds": round(metrics.phases["catalog"] + metrics.phases["fetch"], 3),
+            "build_seconds": round(metrics.phases["build"], 3),
+            "seconds": round(seconds, 3),
+            "handles_per_minute": round(60 * built / seconds, 1) if seconds else 0.0,
+        }
+        log(f"Roster finished in {seconds:.0f}s: {built} of {len(entries)} sites built, "
+            f"{len(failed)} failed, {summary['handles_per_minute']} handles/min")
+        log(f"Fetched {fetch_cache.fetches} distinct handles in {summary['fetch_seconds']:.0f}s "
+            f"({fetch_errors} failed), built the sites in {summary['build_seconds']:.0f}s")
+        for username, error in failed.items():
+            log(f"  {username}: {error}")
+        progress(100, f"Built {built} sites, {len(failed)} failed")
+    return summary
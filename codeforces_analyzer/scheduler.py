@@ -0,0 +1,91 @@
+"""Refresh every registered site on a schedule, until stopped.
+
+Each cycle forgets sites whose directory is gone and refreshes the rest
+through core.refresh_sites: a bounded pool of workers takes the sites off
+a queue, and one FetchCache per cycle makes sure that a handle several
+sites use (typically a shared compare handle) is fetched only once. A
+failing site is logged and retried next cycle; it does not hold up the
+others.
+
+    scheduler = RefreshScheduler(interval=3600, workers=4, log=print)
+    scheduler.run()  # until scheduler.stop() is called from elsewhere
+
+Cycles start interval seconds apart; one that overruns is followed by the
+next straight away. stop() lets the sites already being refreshed finish
+and skips the rest.
+"""
+import datetime
+import threading
+import time
+
+from .registry import default_registry
+
+DEFAULT_INTERVAL = 3600  # seconds
+DEFAULT_WORKERS = 4
+
+
+def _ignore(*args):
+    pass
+
+
+class RefreshScheduler:
+    def __init__(self, interval=DEFAULT_INTERVAL, workers=DEFAULT_WORKERS, registry=None,
+                 log=None, progress=None):
+        self.interval = interval
+        self.workers = workers
+        self.registry = registry or default_registry()
+        self.log = log or _ignore
+        self.progress = progress or _ignore
+        self.cycles = 0
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def run_cycle(self):
+        """Refresh every registered site once; returns a summary of the cycle"""
+        # core is imported here so the command line can read DEFAULT_WORKERS cheaply
+        from .core import FetchCache, refresh_sites
+        started = time.perf_counter()
+        self.cycles += 1
+        for path in self.registry.prune():
+            self.log(f"Forgetting {path}: directory no longer exists")
+        sites = self.registry.sites()
+        self.log(f"Cycle {self.cycles}: refreshing {len(sites)} sites with "
+                 f"{self.workers} workers")
+
+        cache = FetchCache()
+        results = refresh_sites(sites, self.log, self.progress, self.workers, cache, self._stop)
+        failed = [path for path, result in results.items() if isinstance(result, Exception)]
+        summary = {
+            "cycle": self.cycles,
+            "sites": len(sites),
+            "refreshed": len(results) - len(failed),
+            "failed": failed,
+            "skipped": len(sites) - len(results),
+            "handles_fetched": cache.fetches,
+            "fetches_shared": cache.hits,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        self.log(f"Cycle {self.cycles} finished in {summary['seconds']:.0f}s: "
+                 f"{summary['refreshed']} refreshed, {len(failed)} failed, "
+                 f"{summary['skipped']} skipped; {cache.fetches} handles fetched, "
+                 f"{cache.hits} fetches saved by sharing")
+        return summary
+
+    def run(self, cycles=None):
+        """Run cycles every interval seconds until stopped, or cycles times"""
+        while not self.stopped:
+            started = time.monotonic()
+            self.run_cycle()
+            if cycles is not None and self.cycles >= cycles:
+                break
+            wait = self.interval - (time.monotonic() - started)
+            if wait > 0:
+                next_start = datetime.datetime.now() + datetime.timedelta(seconds=wait)
+                self.log(f"Next cycle at {next_start:%H:%M:%S}")
+                self._stop.wait(wait)
@@ -0,0 +1,155 @@
+"""Prebuilt search index shipped with every site as search.js.
+
+An inverted index maps each token to the problems (documents) that
+contain it. The tokens are:
+
+- the words of the problem name;
+- the contest id, the index and both together ("1520", "f", "1520f");
+- the words of every tag;
+- the rating, as "*1900" (Codeforces' own notation for difficulty).
+
+Documents are numbered in the order of bundle.build_bundle(), so in bundle
+mode a document number is also a row of data.js and the index carries no
+copy of the problems. In page mode it carries [contestId, index, name,
+rating] per document for the result list.
+
+    window.CF_SEARCH = {"tokens": ["1520", "1520f", "*1900", "dp", ...],
+                        "postings": [[4, 1], [5], ...],
+                        "docs": [[1520, "F", "Name", 1900], ...]};
+
+Tokens are sorted so the browser can binary-search them and match
+prefixes ("tree" finds "trees"). Posting lists are sorted document numbers
+stored as gaps from the previous one, which keeps them short. A query is
+the intersection of its words' matches; a bare number matches either a
+contest id or a rating.
+"""
+import json
+import re
+from collections import defaultdict
+
+from .records import PROBLEM_URL
+
+SEARCH_FILE = "search.js"
+_WORD = re.compile(r"[0-9a-z]+")
+
+
+def document_tokens(problem):
+    contest_id = str(problem.contest_id)
+    index = problem.index.lower()
+    tokens = set(_WORD.findall(problem.name.lower()))
+    tokens.update((contest_id, index, contest_id + index))
+    for tag in problem.tags:
+        tokens.update(_WORD.findall(tag.lower()))
+    if problem.rating > 0:
+        tokens.add(f"*{problem.rating}")
+    return tokens
+
+
+def build_index(problems):
+    """Return the sorted tokens and their gap-encoded posting lists"""
+    postings = defaultdict(list)
+    for doc, problem in enumerate(problems):
+        for token in document_tokens(problem):
+            postings[token].append(doc)  # docs arrive in order, so lists are sorted
+    tokens = sorted(postings)
+    encoded = []
+    for token in tokens:
+        previous = 0
+        gaps = []
+        for doc in postings[token]:
+            gaps.append(doc - previous)
+            previous = doc
+        encoded.append(gaps)
+    return tokens, encoded
+
+
+# Query runtime, appended to the data. Wires up a #search-input with a
+# #search-results list if the page has one (the index page in page mode).
+RUNTIME = r"""(function (index) {
+    var decoded = {};
+
+    function postings(i) {
+        if (!decoded[i]) {
+            var docs = [], doc = 0, gaps = index.postings[i];
+            for (var k = 0; k < gaps.length; k++) { doc += gaps[k]; docs.push(doc); }
+            decoded[i] = docs;
+        }
+        return decoded[i];
+    }
+
+    function lowerBound(word) {
+        var lo = 0, hi = index.tokens.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (index.tokens[mid] < word) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    }
+
+    // Documents with a token starting with word (or equal to it, if exact)
+    function lookup(word, exact, into) {
+        for (var i = lowerBound(word); i < index.tokens.length; i++) {
+            var token = index.tokens[i];
+            if (exact ? token !== word : token.lastIndexOf(word, 0) !== 0) break;
+            postings(i).forEach(function (doc) { into.add(doc); });
+        }
+        return into;
+    }
+
+    index.query = function (text) {
+        var words = text.toLowerCase().match(/\*?[0-9a-z]+/g) || [];
+        var result = null;
+        words.forEach(function (word) {
+            var docs = lookup(word, false, new Set());
+            if (/^[0-9]+$/.test(word)) lookup('*' + word, true, docs);
+            result = result === null ? docs
+                : new Set(Array.from(result).filter(function (doc) { return docs.has(doc); }));
+        });
+        return result === null ? [] : Array.from(result).sort(function (a, b) { return a - b; });
+    };
+
+    var input = document.getElementById('search-input');
+    var list = document.getElementById('search-results');
+    if (!input || !list || !index.docs) return;
+    var LIMIT = 50;
+    input.addEventListener('input', function () {
+        list.replaceChildren();
+        if (!input.value.trim()) return;
+        var docs = index.query(input.value);
+        docs.slice(0, LIMIT).forEach(function (doc) {
+            var p = index.docs[doc];
+            var item = document.createElement('li');
+            var link = document.createElement('a');
+            link.className = 'problem-link';
+            link.href = '%(problem_url)s/' + p[0] + '/' + p[1];
+            link.target = '_blank';
+            link.textContent = p[0] + p[1] + ' - ' + p[2];
+            item.appendChild(link);
+            var rating = document.createElement('span');
+            rating.className = 'rating';
+            rating.textContent = p[3] > 0 ? ' ' + p[3] : '';
+            item.appendChild(rating);
+            list.appendChild(item);
+        });
+        var more = document.createElement('li');
+        more.textContent = docs.length > LIMIT ? '... and ' + (docs.length - LIMIT) + ' more'
+            : docs.length ? '' : 'No problems found';
+        if (more.textContent) list.appendChild(more);
+    });
+})(window.CF_SEARCH);
+"""
+
+
+def render_search(problems_by_tag, with_docs=True):
+    """Return the contents of search.js and the number of tokens in it"""
+    # Imported here: bundle.py names SEARCH_FILE in its app page
+    from .bundle import build_bundle
+    _, problems = build_bundle(problems_by_tag)
+    problems = [problem for problem, _ in problems]
+    tokens, postings = build_index(problems)
+    data = {"tokens": tokens, "postings": postings}
+    data["docs"] = ([[p.contest_id, p.index, p.name, p.rating] for p in problems]
+                    if with_docs else None)
+    content = ("window.CF_SEARCH = " + json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+               + ";\n" + RUNTIME % {"problem_url": PROBLEM_URL})
+    return content, len(tokens)
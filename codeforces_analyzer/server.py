@@ -0,0 +1,149 @@
+"""Local web server for generated sites, with a working Update Data button.
+
+Serves every codeforces_<handle> site under a root directory, e.g.
+http://127.0.0.1:8000/codeforces_tourist/, and answers
+
+    POST /codeforces_tourist/refresh
+
+by updating that site (core.update_directory) and replying with what
+changed, after which the page reloads itself:
+
+    {"status": "ok", "site": "codeforces_tourist", "username": "tourist",
+     "generated_at": "2024-03-01 10:05:00", "new_submissions": 3,
+     "pages_written": 5, "shared": false}
+
+Refreshes go through two single-flight caches. Requests for a site that
+is already being refreshed wait for that refresh, and its result is
+reused for ttl seconds, so repeated clicks cost nothing ("shared" is then
+true). Handles are fetched through a FetchCache with the same ttl, so
+sites that share a compare handle fetch it once. Only successes are
+reused: after a failure, the next request tries again.
+
+Only the standard library is used; pages are served with no-cache so a
+reload always revalidates.
+"""
+import json
+import os
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from .api import CodeforcesAPIError
+from .core import FetchCache, NoSubmissionsError, SingleFlight, read_site_info, update_directory
+from .metrics import Metrics
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_TTL = 60  # seconds
+SITE_PREFIX = "codeforces_"
+
+
+def _ignore(*args):
+    pass
+
+
+class SiteNotFound(Exception):
+    pass
+
+
+class SiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, root, address=(DEFAULT_HOST, DEFAULT_PORT), ttl=DEFAULT_TTL, log=None):
+        self.root = os.path.abspath(root)
+        self.log = log or _ignore
+        # A failed refresh, e.g. the API being down, is tried again on the
+        # next click rather than handed out for the whole ttl
+        self.refreshes = SingleFlight(ttl, keep_errors=False)
+        self.fetch_cache = FetchCache(max_age=ttl, keep_errors=False)
+        super().__init__(address, SiteRequestHandler)
+
+    def site_dir(self, name):
+        """The directory of the site called name, or SiteNotFound"""
+        if not name.startswith(SITE_PREFIX) or name != os.path.basename(name):
+            raise SiteNotFound(name)
+        path = os.path.join(self.root, name)
+        if not os.path.isdir(path):
+            raise SiteNotFound(name)
+        return path
+
+    def refresh(self, name):
+        """Update the site called name, once however many ask at the same time"""
+        site_dir = self.site_dir(name)
+        # Keyed by the site's path, not by the release it points at: a
+        # refresh that publishes moves it to a new release
+        result, shared = self.refreshes.run(os.path.abspath(site_dir),
+                                            lambda: self._refresh(name, site_dir))
+        return dict(result, shared=shared)
+
+    def _refresh(self, name, site_dir):
+        info = read_site_info(site_dir)
+        if info is None or not info["username"]:
+            raise SiteNotFound(name)
+        metrics = Metrics()
+        update_directory(site_dir, info["username"], info["compare_handles"],
+                         log=lambda message: self.log(f"[{name}] {message}"),
+                         metrics=metrics, fetch_cache=self.fetch_cache)
+        manifest = read_site_info(site_dir)["manifest"]
+        return {
+            "status": "ok",
+            "site": name,
+            "username": info["username"],
+            "generated_at": manifest.get("generated_at"),
+            "new_submissions": metrics.counters.get("submissions_new", 0),
+            "pages_written": metrics.counters.get("pages_written", 0),
+        }
+
+
+class SiteRequestHandler(SimpleHTTPRequestHandler):
+    def __init__(self, request, client_address, server):
+        super().__init__(request, client_address, server, directory=server.root)
+
+    def end_headers(self):
+        # Sites change underneath the server; make browsers revalidate
+        self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        self.server.log(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, status, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        parts = unquote(urlsplit(self.path).path).strip("/").split("/")
+        if len(parts) != 2 or parts[1] != "refresh":
+            self._send_json(HTTPStatus.NOT_FOUND, {"status": "error", "error": "not found"})
+            return
+        try:
+            self._send_json(HTTPStatus.OK, self.server.refresh(parts[0]))
+        except SiteNotFound:
+            self._send_json(HTTPStatus.NOT_FOUND,
+                            {"status": "error", "error": f"no site called {parts[0]}"})
+        except (CodeforcesAPIError, NoSubmissionsError) as e:
+            self._send_json(HTTPStatus.BAD_GATEWAY, {"status": "error", "error": str(e)})
+        except Exception as e:
+            self.server.log(f"Error refreshing {parts[0]}: {e}")
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR,
+                            {"status": "error", "error": str(e)})
+
+
+def serve(root, host=DEFAULT_HOST, port=DEFAULT_PORT, ttl=DEFAULT_TTL, log=None):
+    """Serve root until interrupted"""
+    log = log or _ignore
+    server = SiteServer(root, (host, port), ttl, log)
+    url = f"http://{host}:{server.server_address[1]}/"
+    sites = sorted(name for name in os.listdir(server.root)
+                   if name.startswith(SITE_PREFIX) and os.path.isdir(os.path.join(server.root, name)))
+    log(f"Serving {server.root} at {url}")
+    for name in sites:
+        log(f"  {url}{name}/")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
@@ -0,0 +1,213 @@
+"""Solved problems by rating, and tags by rating, for the stats page.
+
+One pass over problems_by_tag turns every (tag, problem) pair into two
+small integers, a tag id and a rating bucket. Both charts are then counts
+over those arrays:
+
+    histogram   distinct solved problems per rating bucket
+    matrix      per tag, solved problems per rating bucket
+
+With NumPy installed the counting is two bincounts (the matrix over
+tag_id * buckets + bucket); without it, one loop over the same arrays
+does it. Either way the result is plain lists of ints, so stats.html is
+byte-identical with or without NumPy and is only rewritten when the
+counts change.
+
+The charts are inline SVG, shaded by classes in style.css, so the page
+draws without any script. Their size depends on the number of tags and
+buckets (at most a few dozen of each), not on the number of solves.
+"""
+from html import escape
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+STATS_FILE = "stats.html"
+BUCKET_WIDTH = 100  # Codeforces ratings are multiples of 100
+UNRATED = "Unrated"
+BACKEND = "numpy" if numpy is not None else "python"
+
+# Histogram geometry, in SVG user units
+BAR_WIDTH = 26
+BAR_GAP = 6
+BAR_HEIGHT = 180
+# Heatmap geometry
+LABEL_WIDTH = 190
+CELL_WIDTH = 32
+CELL_HEIGHT = 22
+TOTAL_WIDTH = 50
+# Cells shaded at least this much get light text
+DARK_SHADE = 0.55
+
+
+class RatingStats:
+    """The counts behind the stats page.
+
+    buckets are the column labels, "800" to the highest rating solved, then
+    "Unrated" if any solved problem has no rating. tags are in
+    problems_by_tag order and matrix has one row of counts per tag.
+    """
+
+    def __init__(self, buckets, histogram, tags, matrix):
+        self.buckets = buckets
+        self.histogram = histogram
+        self.tags = tags
+        self.matrix = matrix
+
+    @property
+    def solved(self):
+        return sum(self.histogram)
+
+    def __bool__(self):
+        return bool(self.buckets)
+
+
+def _count_numpy(tag_ids, keys, buckets, tag_count, bucket_count):
+    buckets = numpy.asarray(buckets, dtype=numpy.int64)
+    cells = numpy.asarray(tag_ids, dtype=numpy.int64) * bucket_count + buckets
+    matrix = numpy.bincount(cells, minlength=tag_count * bucket_count)
+    # A problem with several tags counts once in the histogram: its first pair
+    _, first = numpy.unique(numpy.asarray(keys, dtype=numpy.int64), return_index=True)
+    histogram = numpy.bincount(buckets[first], minlength=bucket_count)
+    return histogram.tolist(), matrix.reshape(tag_count, bucket_count).tolist()
+
+
+def _count_python(tag_ids, keys, buckets, tag_count, bucket_count):
+    counts = [0] * (tag_count * bucket_count)
+    histogram = [0] * bucket_count
+    seen = set()
+    for tag_id, key, bucket in zip(tag_ids, keys, buckets):
+        counts[tag_id * bucket_count + bucket] += 1
+        if key not in seen:
+            seen.add(key)
+            histogram[bucket] += 1
+    return histogram, [counts[row * bucket_count:(row + 1) * bucket_count]
+                       for row in range(tag_count)]
+
+
+def compute_stats(problems_by_tag, width=BUCKET_WIDTH, use_numpy=None):
+    """Count the solved problems of problems_by_tag by rating bucket and tag.
+
+    use_numpy picks the counting backend; by default NumPy when it is
+    installed. Both return the same RatingStats.
+    """
+    use_numpy = numpy is not None if use_numpy is None else use_numpy
+    tags = list(problems_by_tag)
+
+    # Step 1: One entry per (tag, problem) pair
+    tag_ids = []
+    keys = []
+    ratings = []
+    for tag_id, tag in enumerate(tags):
+        problems = problems_by_tag[tag]
+        tag_ids.extend([tag_id] * len(problems))
+        keys.extend(problem.key for problem in problems)
+        ratings.extend(problem.rating for problem in problems)
+    if not ratings:
+        return RatingStats([], [], tags, [[] for _ in tags])
+
+    # Step 2: Buckets from the lowest to the highest rating solved, then unrated
+    rated = [rating for rating in ratings if rating > 0]
+    low = min(rated) // width * width if rated else 0
+    rated_count = (max(rated) // width * width - low) // width + 1 if rated else 0
+    labels = [str(low + i * width) for i in range(rated_count)]
+    if len(rated) < len(ratings):
+        labels.append(UNRATED)
+    buckets = [(rating - low) // width if rating > 0 else rated_count for rating in ratings]
+
+    # Step 3: Count
+    count = _count_numpy if use_numpy else _count_python
+    histogram, matrix = count(tag_ids, keys, buckets, len(tags), len(labels))
+    return RatingStats(labels, histogram, tags, matrix)
+
+
+def _shade(count, top):
+    """Fill opacity for a heatmap cell, 0.15 to 1 as count goes to top"""
+    return round(0.15 + 0.85 * count / top, 2)
+
+
+def bar_chart(counts, ticks, titles, svg_class, label, bar_classes=None, bar_width=BAR_WIDTH,
+              gap=BAR_GAP):
+    """Bar chart as an inline SVG element.
+
+    ticks label the axis under each bar ("" for none) and titles are the
+    bars' tooltips. Counts are printed over bars wide enough to hold them.
+    """
+    top = max(counts, default=0) or 1
+    label_room = 30
+    count_room = 18
+    width = len(counts) * (bar_width + gap) + gap
+    height = count_room + BAR_HEIGHT + label_room
+    parts = [f'<svg class="chart {svg_class}" viewBox="0 0 {width} {height}" width="{width}" '
+             f'height="{height}" role="img" aria-label="{label}">\n']
+    baseline = count_room + BAR_HEIGHT
+    for i, (count, tick, title) in enumerate(zip(counts, ticks, titles)):
+        x = gap + i * (bar_width + gap)
+        middle = x + bar_width // 2
+        bar = round(BAR_HEIGHT * count / top)
+        bar_class = bar_classes[i] if bar_classes else "bar"
+        parts.append(f'<rect class="{bar_class}" x="{x}" y="{baseline - bar}" width="{bar_width}" '
+                     f'height="{bar}"><title>{title}</title></rect>')
+        if count and bar_width >= BAR_WIDTH:
+            parts.append(f'<text class="bar-count" x="{middle}" y="{baseline - bar - 4}">'
+                         f'{count}</text>')
+        if tick:
+            parts.append(f'<text class="axis-label" x="{middle}" y="{baseline + 16}">{tick}</text>')
+        parts.append("\n")
+    parts.append('</svg>')
+    return "".join(parts)
+
+
+def render_histogram(stats):
+    """Bar chart of stats.histogram as an inline SVG element"""
+    if not stats:
+        return '<p class="chart-empty">No solved problems yet.</p>'
+    return bar_chart(stats.histogram,
+                     ["?" if label == UNRATED else label for label in stats.buckets],
+                     [f"{label}: {count} solved" for label, count in zip(stats.buckets,
+                                                                         stats.histogram)],
+                     "histogram", "Solved problems by rating",
+                     ["bar unrated" if label == UNRATED else "bar" for label in stats.buckets])
+
+
+def render_heatmap(stats):
+    """Tag x rating matrix as an inline SVG element, busiest tags first"""
+    if not stats:
+        return '<p class="chart-empty">No solved problems yet.</p>'
+    rows = sorted(zip(stats.tags, stats.matrix), key=lambda row: (-sum(row[1]), row[0]))
+    top = max(max(counts) for _, counts in rows) or 1
+    header = 26
+    width = LABEL_WIDTH + len(stats.buckets) * CELL_WIDTH + TOTAL_WIDTH
+    height = header + len(rows) * CELL_HEIGHT
+    text_y = CELL_HEIGHT // 2 + 4
+    parts = [f'<svg class="chart heatmap" viewBox="0 0 {width} {height}" width="{width}" '
+             f'height="{height}" role="img" aria-label="Solved problems by tag and rating">\n']
+    for column, label in enumerate(stats.buckets):
+        middle = LABEL_WIDTH + column * CELL_WIDTH + CELL_WIDTH // 2
+        short = "?" if label == UNRATED else label
+        parts.append(f'<text class="axis-label" x="{middle}" y="{header - 9}">{short}</text>')
+    parts.append(f'<text class="axis-label" x="{width - TOTAL_WIDTH // 2}" y="{header - 9}">'
+                 f'Total</text>\n')
+    grid_width = len(stats.buckets) * CELL_WIDTH - 1
+    for row, (tag, counts) in enumerate(rows):
+        # One strip per row stands in for its empty cells; only the others are drawn
+        parts.append(f'<g transform="translate(0,{header + row * CELL_HEIGHT})">'
+                     f'<text class="row-label" x="{LABEL_WIDTH - 8}" y="{text_y}">{escape(tag)}</text>'
+                     f'<rect class="empty" x="{LABEL_WIDTH}" width="{grid_width}" '
+                     f'height="{CELL_HEIGHT - 1}"/>')
+        for column, count in enumerate(counts):
+            if not count:
+                continue
+            x = LABEL_WIDTH + column * CELL_WIDTH
+            shade = _shade(count, top)
+            # Cells are most of the page, so they are styled by element, not by class
+            text_class = ' class="on-dark"' if shade >= DARK_SHADE else ''
+            parts.append(f'<rect x="{x}" width="{CELL_WIDTH - 1}" height="{CELL_HEIGHT - 1}" '
+                         f'fill-opacity="{shade}"/>'
+                         f'<text{text_class} x="{x + CELL_WIDTH // 2}" y="{text_y}">{count}</text>')
+        parts.append(f'<text class="row-total" x="{width - TOTAL_WIDTH // 2}" y="{text_y}">'
+                     f'{sum(counts)}</text></g>\n')
+    parts.append('</svg>')
+    return "".join(parts)
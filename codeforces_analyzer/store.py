@@ -0,0 +1,239 @@
+"""Persistent per-handle submission store.
+
+Each handle gets one JSON-lines file: a header line with the high-water mark
+followed by the handle's accepted submissions, newest first, one per line,
+reduced to the fields the directory uses.
+
+    {"handle": "tourist", "last_id": 245678901, "total": 9120, "accepted": 3120}
+    {"id":245678901,"verdict":"OK","creationTimeSeconds":1707900000,"problem":{...}}
+    ...
+
+The store has seen exactly the handle's submissions with id <= last_id, so
+a later run only has to page through user.status until it reaches last_id.
+Submissions that are still being judged keep the high-water mark below them
+and are fetched again next time.
+
+Both writing and reading stream line by line: new submissions are spooled
+to disk as they arrive and the stored history is never loaded as a list.
+
+Processes that share the store (a server and a scheduler, say) update a
+handle one at a time: each update holds an flock on <handle>.lock next to
+the file, and writes its spool and new file under unique temp names.
+"""
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: updates are only serialized within a process
+    fcntl = None
+
+from .paths import data_dir
+
+# Verdicts that can still change after we have seen them
+PENDING_VERDICTS = ("TESTING", None)
+PROBLEM_FIELDS = ("contestId", "index", "name", "rating", "tags")
+
+# The header is rewritten in place once the counts are known
+HEADER_SIZE = 256
+
+
+def is_final(submission):
+    return submission.get("verdict") not in PENDING_VERDICTS
+
+
+def compact(submission):
+    """Keep only the fields the directory uses"""
+    problem = submission.get("problem") or {}
+    return {
+        "id": submission["id"],
+        "verdict": submission.get("verdict"),
+        "creationTimeSeconds": submission.get("creationTimeSeconds", 0),
+        "problem": {field: problem[field] for field in PROBLEM_FIELDS if field in problem},
+    }
+
+
+def _write_row(f, row):
+    f.write(json.dumps(row, separators=(',', ':')) + "\n")
+
+
+class StoredSubmissions:
+    """Re-iterable view of a handle's accepted submissions, newest first.
+
+    Iterating reads the store file lazily; unsaved holds accepted
+    submissions newer than a still-pending one, which are not stored yet.
+    """
+
+    def __init__(self, store, handle, unsaved=(), new_count=0, unsaved_count=0):
+        self.store = store
+        self.handle = handle
+        self.unsaved = list(unsaved)
+        self.new_count = new_count
+        self.unsaved_count = unsaved_count
+        header = store.header(handle) or {}
+        # Every submission seen, whatever its verdict
+        self.total = header.get("total", header.get("count", 0)) + unsaved_count
+
+    def __iter__(self):
+        yield from self.unsaved
+        yield from self.store.iter_accepted(self.handle)
+
+    def __bool__(self):
+        return self.total > 0
+
+
+class SubmissionStore:
+    def __init__(self, root=None):
+        self.root = root or os.path.join(data_dir(), "submissions")
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock_for(self, handle):
+        # One lock per handle: updates stream from the network while holding
+        # it, so a store-wide lock would serialize concurrent fetches
+        with self._locks_lock:
+            return self._locks.setdefault(handle.lower(), threading.Lock())
+
+    @contextmanager
+    def _locked(self, handle):
+        """Hold handle's lock in this process and, where flock exists, in every other"""
+        with self._lock_for(handle):
+            os.makedirs(self.root, exist_ok=True)
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.root, f"{handle.lower()}.lock"), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def path_for(self, handle):
+        # Codeforces handles are case-insensitive
+        return os.path.join(self.root, f"{handle.lower()}.jsonl")
+
+    def header(self, handle):
+        path = self.path_for(handle)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.loads(f.readline())
+
+    def last_id(self, handle):
+        """High-water mark for handle, or None if nothing is stored yet"""
+        header = self.header(handle)
+        return header.get("last_id") if header else None
+
+    def iter_accepted(self, handle):
+        """Yield the stored accepted submissions for handle, newest first"""
+        path = self.path_for(handle)
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            f.readline()  # header
+            for line in f:
+                if line.strip():
+                    submission = json.loads(line)
+                    if submission.get("verdict") == "OK":
+                        yield submission
+
+    def update(self, handle, new_submissions):
+        """Stream freshly fetched submissions into the store.
+
+        new_submissions must be newest first and cover everything newer
+        than the current high-water mark. Returns a StoredSubmissions view
+        of the full accepted history.
+        """
+        with self._locked(handle):
+            path = self.path_for(handle)
+            old_header = self.header(handle) or {}
+            old_last_id = old_header.get("last_id")
+            prefix = f"{handle.lower()}.jsonl."
+            spool_fd, spool_path = tempfile.mkstemp(prefix=prefix, suffix=".new", dir=self.root)
+            os.close(spool_fd)
+            tmp_fd, tmp_path = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=self.root)
+            os.close(tmp_fd)
+            try:
+                # Pass 1: spool the new rows to disk as they arrive
+                newest_id = None
+                previous_id = None
+                cutoff = None
+                new_count = 0
+                unsaved_count = 0
+                with open(spool_path, 'w', encoding='utf-8') as spool:
+                    for submission in new_submissions:
+                        submission_id = submission["id"]
+                        # Pages can shift while we read them; ids only go down
+                        if previous_id is not None and submission_id >= previous_id:
+                            continue
+                        if old_last_id is not None and submission_id <= old_last_id:
+                            continue
+                        previous_id = submission_id
+                        if newest_id is None:
+                            newest_id = submission_id
+                        new_count += 1
+                        if not is_final(submission):
+                            cutoff = submission_id
+                            unsaved_count = new_count
+                        if submission.get("verdict") == "OK":
+                            _write_row(spool, compact(submission))
+
+                # Pass 2: everything at or above the oldest pending submission
+                # stays out of the store (and out of the high-water mark)
+                unsaved = []
+                saved_accepted = 0
+                with open(tmp_path, 'w', encoding='utf-8') as out:
+                    out.write(" " * (HEADER_SIZE - 1) + "\n")
+                    with open(spool_path, 'r', encoding='utf-8') as spool:
+                        for line in spool:
+                            submission = json.loads(line)
+                            if cutoff is not None and submission["id"] >= cutoff:
+                                unsaved.append(submission)
+                            else:
+                                out.write(line)
+                                saved_accepted += 1
+                    if os.path.exists(path):
+                        with open(path, 'r', encoding='utf-8') as old:
+                            old.readline()
+                            for line in old:
+                                out.write(line)
+
+                    if cutoff is None:
+                        last_id = newest_id if newest_id is not None else old_last_id
+                    else:
+                        last_id = cutoff - 1
+                    header = {
+                        "handle": handle,
+                        "last_id": last_id,
+                        "total": old_header.get("total", old_header.get("count", 0)) + new_count - unsaved_count,
+                        "accepted": old_header.get("accepted", old_header.get("count", 0)) + saved_accepted,
+                    }
+                    out.seek(0)
+                    out.write(json.dumps(header).ljust(HEADER_SIZE - 1))
+                # Swap in the new file so an interrupted run never leaves a torn store
+                os.replace(tmp_path, path)
+            finally:
+                for leftover in (spool_path, tmp_path):
+                    if os.path.exists(leftover):
+                        os.remove(leftover)
+            return StoredSubmissions(self, handle, unsaved, new_count, unsaved_count)
+
+    def clear(self, handle):
+        with self._locked(handle):
+            path = self.path_for(handle)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+_default_store = None
+
+
+def default_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = SubmissionStore()
+    return _default_store
@@ -0,0 +1,49 @@
+"""Minimal templates compiled once into Python functions.
+
+A Template is plain text with {field} placeholders ({{ and }} for literal
+braces, as in str.format). When it is created, the text is parsed a
+single time and turned into a function whose body is one f-string, so
+rendering costs a single string build with no parsing and no per-call
+conditionals:
+
+    ROW = Template("<td>{number}</td><td>{name}</td>\\n")
+    ROW.render(number=1, name="Watermelon")
+
+Fields are plain names; anything conditional is decided by the caller.
+Keyword arguments to Template() are constants, substituted once at
+compile time. render() also takes the fields positionally, in the order
+they first appear (Template.fields), which is cheaper in hot loops.
+"""
+import keyword
+import string
+
+
+class Template:
+    def __init__(self, source, name="template", **constants):
+        self.name = name
+        self.fields = []
+        pieces = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            if field in constants:
+                literal += str(constants[field])
+                field = None
+            if literal:
+                escaped = literal.replace("{", "{{").replace("}", "}}")
+                pieces.append("f" + repr(escaped))
+            if field is None:
+                continue
+            if spec or conversion or not field.isidentifier() or keyword.iskeyword(field):
+                raise ValueError(f"{name}: unsupported placeholder {{{field}}}")
+            if field not in self.fields:
+                self.fields.append(field)
+            pieces.append(f"f'{{{field}}}'")
+
+        # Adjacent f-string literals are joined by the compiler into one build
+        code = (f"def render({', '.join(self.fields)}):\n"
+                f"    return {' '.join(pieces) or repr('')}\n")
+        namespace = {}
+        exec(compile(code, f"<template {name}>", "exec"), namespace)
+        self.render = namespace["render"]
+
+    def __repr__(self):
+        return f"Template({self.name!r}, fields={self.fields})"
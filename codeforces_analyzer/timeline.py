@@ -0,0 +1,337 @@
+"""When problems were solved: first-AC times, streaks and the timeline page.
+
+A Timeline keeps the time of every problem's first accepted submission and,
+per UTC day, how many problems were first solved that day and the sum of
+their ratings. It is saved in the site as timeline.json, together with the
+submission store's high-water mark it has seen up to:
+
+    {"format": 1, "handle": "tourist", "last_id": 245678901,
+     "first_ac": {"1520_F": [1620000000, 1900], ...},
+     "days": {"18762": [3, 3, 5400], ...}}
+
+A refresh loads it and folds in only the submissions above last_id. The
+store hands submissions over newest first and reads its file lazily, so
+this stops after the new rows and costs time proportional to the new
+activity, not to the whole history. Folding keeps the earliest time per
+problem whatever the order, so seeing a submission twice (one that was
+still pending last time, say) changes nothing. Every run gives the stored
+solves the ratings of its catalog, so problems rated or re-rated after
+they were solved are counted at their current rating.
+
+The page is derived from the days in one pass: solves per day (the last
+year, as a calendar), per week and per month, the longest and current
+streak of days with a solve, and the average rating of the problems
+solved in the trailing ROLLING_DAYS days, week by week. It is drawn up to
+today but identified by the page drawn up to last_day(), so it is only
+rewritten when the solves change, not every day.
+"""
+import datetime
+import json
+import os
+import time
+from collections import deque
+from html import escape
+
+from .stats import bar_chart
+
+TIMELINE_FILE = "timeline.html"
+STATE_FILE = "timeline.json"
+FORMAT = 1
+DAY = 86400
+ROLLING_DAYS = 30
+EPOCH = datetime.date(1970, 1, 1)
+
+# Calendar geometry, in SVG user units
+CALENDAR_WEEKS = 53
+CALENDAR_CELL = 13
+CALENDAR_LEFT = 30
+CALENDAR_TOP = 20
+# Rating line geometry
+LINE_HEIGHT = 200
+LINE_LEFT = 50
+LINE_STEP = 4  # between weeks
+WEEKDAYS = ("Mon", "", "Wed", "", "Fri", "", "")
+
+
+def day_of(timestamp):
+    """UTC day number since 1970-01-01"""
+    return int(timestamp // DAY)
+
+
+def date_of(day):
+    return EPOCH + datetime.timedelta(days=day)
+
+
+def week_of(day):
+    """First day (a Monday) of the week holding day; 1970-01-01 was a Thursday"""
+    return day - (day + 3) % 7
+
+
+def _streak(length, start):
+    return {"days": length, "start": date_of(start).isoformat() if length else None,
+            "end": date_of(start + length - 1).isoformat() if length else None}
+
+
+class Timeline:
+    def __init__(self, handle, last_id=None, first_ac=None, days=None):
+        self.handle = handle
+        self.last_id = last_id
+        self.first_ac = first_ac if first_ac is not None else {}  # problem_id -> [time, rating]
+        self.days = days if days is not None else {}  # day -> [solves, rated, rating_sum]
+
+    def __len__(self):
+        return len(self.first_ac)
+
+    def _count(self, timestamp, rating, sign):
+        day = day_of(timestamp)
+        counts = self.days.setdefault(day, [0, 0, 0])
+        counts[0] += sign
+        if rating > 0:
+            counts[1] += sign
+            counts[2] += sign * rating
+        if not counts[0]:
+            del self.days[day]
+
+    def add(self, problem_id, timestamp, rating):
+        """Record an accepted submission; returns True if it is the problem's first AC"""
+        entry = self.first_ac.get(problem_id)
+        if entry is not None:
+            if timestamp >= entry[0]:
+                return False
+            self._count(entry[0], entry[1], -1)
+        self.first_ac[problem_id] = [timestamp, rating]
+        self._count(timestamp, rating, 1)
+        return entry is None
+
+    def last_day(self):
+        """Day of the latest first solve, or 0 without any"""
+        return max(self.days, default=0)
+
+    def update(self, submissions, table, last_id):
+        """Fold in the accepted submissions above self.last_id and return how many
+        problems were solved for the first time.
+
+        submissions are newest first; table (a ProblemTable) supplies the
+        ratings. last_id is the store's high-water mark for the handle,
+        which the next update starts from.
+        """
+        solved = 0
+        for submission in submissions:
+            if self.last_id is not None and submission["id"] <= self.last_id:
+                break
+            if submission.get("verdict") == "OK" and "problem" in submission:
+                problem = table[table.add(submission["problem"])]
+                solved += self.add(problem.problem_id, submission.get("creationTimeSeconds", 0),
+                                   problem.rating)
+
+        # Problems are rated a few days after their contest, often after they
+        # were solved, and are sometimes re-rated later: every solve takes the
+        # rating the table has now
+        for problem_id, (timestamp, rating) in self.first_ac.items():
+            contest_id, index = problem_id.rsplit("_", 1)
+            key = table.key_of(int(contest_id), index)
+            if key is not None and 0 < table[key].rating != rating:
+                self._count(timestamp, rating, -1)
+                self.first_ac[problem_id] = [timestamp, table[key].rating]
+                self._count(timestamp, table[key].rating, 1)
+        self.last_id = last_id
+        return solved
+
+    def to_json(self):
+        return json.dumps({"format": FORMAT, "handle": self.handle, "last_id": self.last_id,
+                           "first_ac": self.first_ac,
+                           "days": {str(day): counts for day, counts in sorted(self.days.items())}},
+                          separators=(',', ':'), sort_keys=True) + "\n"
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        if data.get("format") != FORMAT:
+            raise ValueError(f"unknown timeline format {data.get('format')!r}")
+        return cls(data["handle"], data["last_id"], data["first_ac"],
+                   {int(day): counts for day, counts in data["days"].items()})
+
+    def series(self, today=None):
+        """Everything the timeline page shows, from one pass over the active days"""
+        today = today if today is not None else day_of(time.time())
+        weekly = {}
+        monthly = {}
+        longest = (0, 0)
+        run = (0, 0)
+        previous = None
+        for day in sorted(self.days):
+            solves = self.days[day][0]
+            week = week_of(day)
+            weekly[week] = weekly.get(week, 0) + solves
+            date = date_of(day)
+            monthly[(date.year, date.month)] = monthly.get((date.year, date.month), 0) + solves
+            run = (run[0] + 1, run[1]) if previous == day - 1 else (1, day)
+            if run[0] > longest[0]:
+                longest = run
+            previous = day
+        # The current streak survives until a whole day passes without a solve
+        current = run if previous is not None and previous >= today - 1 else (0, 0)
+
+        # Weekly rolling average, over the days before each week's end
+        rolling = []
+        if self.days:
+            window = deque()
+            rated = rating_sum = 0
+            days = iter(sorted(self.days.items()))
+            pending = next(days, None)
+            for week in range(week_of(min(self.days)), week_of(today) + 1, 7):
+                end = week + 6
+                while pending is not None and pending[0] <= end:
+                    window.append(pending)
+                    rated += pending[1][1]
+                    rating_sum += pending[1][2]
+                    pending = next(days, None)
+                while window and window[0][0] <= end - ROLLING_DAYS:
+                    _, counts = window.popleft()
+                    rated -= counts[1]
+                    rating_sum -= counts[2]
+                rolling.append((week, round(rating_sum / rated) if rated else None))
+
+        return {
+            "today": today,
+            "solved": len(self.first_ac),
+            "active_days": len(self.days),
+            "first_day": date_of(min(self.days)).isoformat() if self.days else None,
+            "longest": _streak(*longest),
+            "current": _streak(*current),
+            "daily": {day: counts[0] for day, counts in self.days.items()},
+            "weekly": weekly,
+            "monthly": monthly,
+            "rolling": rolling,
+        }
+
+
+def load_timeline(site_dir, handle):
+    """The timeline saved in site_dir, or None if it has none for handle"""
+    try:
+        with open(os.path.join(site_dir, STATE_FILE), 'r', encoding='utf-8') as f:
+            timeline = Timeline.from_json(f.read())
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+    # Codeforces handles are case-insensitive
+    return timeline if timeline.handle.lower() == handle.lower() else None
+
+
+def render_calendar(series):
+    """The last year as a grid of days, a column per week, shaded by solves"""
+    first_week = week_of(series["today"]) - (CALENDAR_WEEKS - 1) * 7
+    daily = series["daily"]
+    top = max((daily.get(day, 0) for day in range(first_week, series["today"] + 1)),
+              default=0) or 1
+    width = CALENDAR_LEFT + CALENDAR_WEEKS * CALENDAR_CELL
+    height = CALENDAR_TOP + 7 * CALENDAR_CELL
+    parts = [f'<svg class="chart calendar" viewBox="0 0 {width} {height}" width="{width}" '
+             f'height="{height}" role="img" aria-label="Solves per day over the last year">\n']
+    for row, name in enumerate(WEEKDAYS):
+        if name:
+            parts.append(f'<text class="row-label" x="{CALENDAR_LEFT - 4}" '
+                         f'y="{CALENDAR_TOP + row * CALENDAR_CELL + 10}">{name}</text>')
+    month = None
+    for column in range(CALENDAR_WEEKS):
+        week = first_week + column * 7
+        x = CALENDAR_LEFT + column * CALENDAR_CELL
+        if date_of(week).month != month:
+            month = date_of(week).month
+            parts.append(f'<text class="month-label" x="{x}" y="{CALENDAR_TOP - 6}">'
+                         f'{date_of(week):%b}</text>')
+        for row in range(7):
+            day = week + row
+            if day > series["today"]:
+                break
+            solves = daily.get(day, 0)
+            # Four shades, from a single solve up to the busiest day of the year
+            level = -(-4 * solves // top)
+            parts.append(f'<rect class="l{level}" x="{x}" y="{CALENDAR_TOP + row * CALENDAR_CELL}" '
+                         f'width="{CALENDAR_CELL - 2}" height="{CALENDAR_CELL - 2}">'
+                         f'<title>{date_of(day).isoformat()}: {solves}</title></rect>')
+        parts.append("\n")
+    parts.append('</svg>')
+    return "".join(parts)
+
+
+def render_weekly(series, weeks=CALENDAR_WEEKS):
+    """Solves per week over the last year"""
+    last = week_of(series["today"])
+    starts = [last - (weeks - 1 - i) * 7 for i in range(weeks)]
+    counts = [series["weekly"].get(week, 0) for week in starts]
+    # A tick every four weeks keeps the dates readable
+    ticks = [f"{date_of(week):%d %b}" if i % 4 == 0 else "" for i, week in enumerate(starts)]
+    titles = [f"Week of {date_of(week).isoformat()}: {count}" for week, count in zip(starts, counts)]
+    return bar_chart(counts, ticks, titles, "weekly", "Solves per week", bar_width=10, gap=4)
+
+
+def render_monthly(series):
+    """Solves per month, from the first solve to today"""
+    if not series["monthly"]:
+        return '<p class="chart-empty">No solved problems yet.</p>'
+    first = min(series["monthly"])
+    today = date_of(series["today"])
+    months = []
+    year, month = first
+    while (year, month) <= (today.year, today.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    counts = [series["monthly"].get(key, 0) for key in months]
+    ticks = [str(year) if month == 1 or i == 0 else "" for i, (year, month) in enumerate(months)]
+    titles = [f"{year}-{month:02d}: {count}" for (year, month), count in zip(months, counts)]
+    return bar_chart(counts, ticks, titles, "monthly", "Solves per month", bar_width=10, gap=4)
+
+
+def render_rating_line(series):
+    """Trailing average rating of solved problems, one point per week"""
+    values = [value for _, value in series["rolling"] if value is not None]
+    if not values:
+        return '<p class="chart-empty">No rated problems solved yet.</p>'
+    low = min(values) // 100 * 100
+    high = -(-max(values) // 100) * 100
+    span = (high - low) or 100
+    width = LINE_LEFT + len(series["rolling"]) * LINE_STEP + 10
+    height = LINE_HEIGHT + 40
+    parts = [f'<svg class="chart rating-line" viewBox="0 0 {width} {height}" width="{width}" '
+             f'height="{height}" role="img" aria-label="Average rating of solved problems">\n']
+    # Gridlines every 100 (or 200 when the range is wide), labelled on the left
+    step = 100 if span <= 1000 else 200
+    for rating in range(low, high + 1, step):
+        y = 10 + round(LINE_HEIGHT * (high - rating) / span)
+        parts.append(f'<line class="grid" x1="{LINE_LEFT}" y1="{y}" x2="{width - 10}" y2="{y}"/>'
+                     f'<text class="row-label" x="{LINE_LEFT - 6}" y="{y + 4}">{rating}</text>\n')
+    # Weeks with nothing rated in the window break the line
+    segments = [[]]
+    for i, (week, value) in enumerate(series["rolling"]):
+        if value is None:
+            if segments[-1]:
+                segments.append([])
+            continue
+        x = LINE_LEFT + i * LINE_STEP
+        y = 10 + round(LINE_HEIGHT * (high - value) / span)
+        segments[-1].append(f"{x},{y}")
+        if date_of(week).month == 1 and date_of(week).day <= 7:
+            parts.append(f'<text class="axis-label" x="{x}" y="{height - 12}">'
+                         f'{date_of(week).year}</text>')
+    for points in segments:
+        if points:
+            parts.append(f'<polyline class="line" points="{" ".join(points)}"/>\n')
+    parts.append('</svg>')
+    return "".join(parts)
+
+
+def render_summary(series):
+    """The headline numbers, as definition list items"""
+    def streak(value):
+        if not value["days"]:
+            return "none"
+        plural = "" if value["days"] == 1 else "s"
+        return f'{value["days"]} day{plural} ({value["start"]} to {value["end"]})'
+
+    items = [("Problems solved", series["solved"]),
+             ("Days with a solve", series["active_days"]),
+             ("First solve", series["first_day"] or "none"),
+             ("Longest streak", streak(series["longest"])),
+             ("Current streak", streak(series["current"]))]
+    return "".join(f'            <div><dt>{name}</dt><dd>{escape(str(value))}</dd></div>\n'
+                   for name, value in items)
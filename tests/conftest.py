@@ -0,0 +1,60 @@
+import pytest
+
+from codeforces_analyzer import api, catalog, registry, store
+from codeforces_analyzer.api import CodeforcesAPIError
+
+
+def submission(submission_id, contest_id, index, verdict="OK", rating=1500, tags=("dp",),
+               time=1700000000):
+    return {"id": submission_id, "verdict": verdict, "creationTimeSeconds": time,
+            "problem": {"contestId": contest_id, "index": index, "name": f"{contest_id}{index}",
+                        "rating": rating, "tags": list(tags)}}
+
+
+class FakeClient:
+    """Stands in for api.CodeforcesClient, answering from memory.
+
+    submissions maps each handle to its submissions, newest first; a
+    handle in failures raises that error instead. calls records every
+    (method, params) asked for.
+    """
+
+    def __init__(self):
+        self.submissions = {}
+        self.problems = {"problems": [], "problemStatistics": []}
+        self.failures = {}
+        self.calls = []
+
+    def call(self, method, params=None, log=None, metrics=None):
+        self.calls.append((method, dict(params or {})))
+        if method != "problemset.problems":
+            raise CodeforcesAPIError(f"{method}: not faked")
+        return self.problems
+
+    def stream(self, method, params=None, log=None, metrics=None):
+        self.calls.append((method, dict(params or {})))
+        handle = params["handle"]
+        if handle in self.failures:
+            raise self.failures[handle]
+        if handle not in self.submissions:
+            raise CodeforcesAPIError(f"handle: User with handle {handle} not found")
+        rows = self.submissions[handle]
+        if "from" in params:
+            rows = rows[params["from"] - 1:params["from"] - 1 + params["count"]]
+        yield from rows
+
+    def user_status_calls(self, handle):
+        return [params for method, params in self.calls
+                if method == "user.status" and params["handle"] == handle]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """A FakeClient as the shared client, with the store, catalog and registry under tmp_path"""
+    monkeypatch.setenv("CODEFORCES_ANALYZER_HOME", str(tmp_path / "home"))
+    monkeypatch.setattr(store, "_default_store", None)
+    monkeypatch.setattr(catalog, "_default_cache", None)
+    monkeypatch.setattr(registry, "_default_registry", None)
+    fake = FakeClient()
+    monkeypatch.setattr(api, "_default_client", fake)
+    return fake
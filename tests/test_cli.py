@@ -0,0 +1,63 @@
+import os
+
+import pytest
+from conftest import submission
+
+from codeforces_analyzer import api, cli
+from codeforces_analyzer.manifest import load_manifest
+
+
+@pytest.mark.parametrize("command", [["generate", "--handle", "x"], ["update", "--dir", "d"],
+                                     ["roster", "club.csv"]])
+def test_run_options_go_after_the_command(command):
+    args = cli.build_parser().parse_args(command + [
+        "--output", "bundle", "--compress", "--render-workers", "2", "--render-pool", "process",
+        "--metrics-file", "run.prom", "--metrics-format", "json", "--log-file", "run.log"])
+    assert (args.output, args.compress, args.render_workers, args.render_pool) == \
+        ("bundle", True, 2, "process")
+    assert (args.metrics_file, args.metrics_format, args.log_file) == \
+        ("run.prom", "json", "run.log")
+
+
+@pytest.mark.parametrize("command", [["sites", "refresh"], ["sites", "schedule"]])
+def test_sites_commands_take_a_log_file(command):
+    assert cli.build_parser().parse_args(command + ["--log-file", "run.log"]).log_file == "run.log"
+
+
+def test_client_options_go_before_the_command():
+    args = cli.build_parser().parse_args(["--rate", "2", "--max-retries", "1", "generate",
+                                          "--handle", "x", "--no-compress"])
+    assert (args.rate, args.max_retries, args.compress) == (2, 1, False)
+
+
+def test_run_options_are_not_global():
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(["--output", "bundle", "generate", "--handle", "x"])
+
+
+def test_generate_then_update(client, tmp_path, monkeypatch):
+    # main() configures the shared client from the options; keep the fake one
+    monkeypatch.setattr(api, "configure_client", lambda **kwargs: client)
+    client.submissions["x"] = [submission(2, 1, "A"), submission(1, 2, "B", tags=("math",))]
+    out = str(tmp_path / "out")
+    metrics_file = str(tmp_path / "run.json")
+
+    with pytest.raises(SystemExit) as exit:
+        cli.main(["generate", "--handle", "x", "--out", out, "--output", "bundle",
+                  "--metrics-file", metrics_file])
+    assert exit.value.code == 0
+    site_dir = os.path.join(out, "codeforces_x")
+    assert load_manifest(site_dir)["output"] == "bundle"
+    assert os.path.exists(metrics_file)
+
+    with pytest.raises(SystemExit) as exit:
+        cli.main(["update", "--dir", site_dir])
+    assert exit.value.code == 0
+
+
+def test_unknown_handle_is_an_error(client, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(api, "configure_client", lambda **kwargs: client)
+    with pytest.raises(SystemExit) as exit:
+        cli.main(["generate", "--handle", "nobody", "--out", str(tmp_path / "out")])
+    assert exit.value.code == 1
+    assert "not found" in capsys.readouterr().err
@@ -0,0 +1,146 @@
+import errno
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+from codeforces_analyzer import publish
+
+
+def release(live, text):
+    """Stage, write index.html and publish, the way core does"""
+    with publish.site_lock(live):
+        staging = publish.stage(live)
+        tmp_path = os.path.join(staging, "index.html.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, os.path.join(staging, "index.html"))
+        publish.publish(live, staging)
+    return os.path.basename(staging)
+
+
+def served(live):
+    with open(os.path.join(live, "index.html"), encoding='utf-8') as f:
+        return f.read()
+
+
+def release_names(live):
+    return [os.path.basename(r) for r in publish.list_releases(live)]
+
+
+def test_publish_swaps_the_link(tmp_path):
+    live = str(tmp_path / "codeforces_x")
+    first = release(live, "R1")
+    assert os.path.islink(live) and served(live) == "R1"
+    second = release(live, "R2")
+    assert served(live) == "R2"
+    assert release_names(live) == [first, second]
+
+
+def test_legacy_directory_becomes_the_previous_release(tmp_path):
+    live = str(tmp_path / "codeforces_x")
+    os.mkdir(live)
+    with open(os.path.join(live, "index.html"), 'w') as f:
+        f.write("legacy")
+    release(live, "R1")
+    assert served(live) == "R1"
+    assert publish.rollback(live).endswith(publish.LEGACY_RELEASE)
+    assert served(live) == "legacy"
+
+
+def test_rollback_then_publish_keeps_the_release_rolled_back_to(tmp_path):
+    live = str(tmp_path / "codeforces_x")
+    r1 = release(live, "R1")
+    release(live, "R2")
+    publish.rollback(live)
+    assert served(live) == "R1"
+    release(live, "R3")
+    assert r1 in release_names(live)
+    publish.rollback(live)
+    assert served(live) == "R1"
+    with pytest.raises(FileNotFoundError):
+        publish.rollback(live)
+
+
+def test_prune_keeps_live_and_previous(tmp_path):
+    live = str(tmp_path / "codeforces_x")
+    for text in ("R1", "R2", "R3", "R4"):
+        last = release(live, text)
+    assert len(release_names(live)) == 2
+    assert last in release_names(live)
+
+
+def test_symlinked_parent_directory(tmp_path):
+    (tmp_path / "data").mkdir()
+    os.symlink(tmp_path / "data", tmp_path / "sites")
+    live = str(tmp_path / "sites" / "codeforces_x")
+    release(live, "R1")
+    assert served(live) == "R1"
+    release(live, "R2")
+    release(live, "R3")
+    assert served(live) == "R3"
+    assert len(release_names(live)) == 2
+    publish.rollback(live)
+    assert served(live) == "R2"
+
+
+def test_prune_leaves_newer_stagings_alone(tmp_path):
+    live = str(tmp_path / "codeforces_x")
+    release(live, "R1")
+    release(live, "R2")
+    other = publish.stage(live)  # another run's staging, not under the lock
+    release(live, "R3")
+    assert os.path.isdir(other)
+
+
+def test_concurrent_threads(tmp_path):
+    live = str(tmp_path / "codeforces_x")
+    errors = []
+
+    def run(n):
+        try:
+            for i in range(5):
+                release(live, f"{n}-{i}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert os.path.exists(os.path.join(live, "index.html"))
+    assert len(release_names(live)) == 2
+
+
+def _release_many(live):
+    for i in range(5):
+        release(live, f"{os.getpid()}-{i}")
+
+
+def test_concurrent_processes(tmp_path):
+    live = str(tmp_path / "codeforces_x")
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_release_many, args=(live,)) for _ in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0, 0, 0]
+    assert os.path.exists(os.path.join(live, "index.html"))
+
+
+def test_symlink_probe_errors(tmp_path, monkeypatch):
+    def refuse(error):
+        def symlink(*args):
+            raise OSError(error, os.strerror(error))
+        return symlink
+
+    monkeypatch.setattr(os, "symlink", refuse(errno.EPERM))
+    assert not publish._symlinks_supported(str(tmp_path))
+    # Anything else is a real failure, not a missing feature
+    monkeypatch.setattr(os, "symlink", refuse(errno.EEXIST))
+    with pytest.raises(OSError):
+        publish._symlinks_supported(str(tmp_path))
@@ -0,0 +1,119 @@
+import os
+import time
+
+import pytest
+from conftest import submission
+
+from codeforces_analyzer import publish, timeline
+from codeforces_analyzer.core import generate_directory, update_directory
+from codeforces_analyzer.manifest import load_manifest
+from codeforces_analyzer.metrics import Metrics
+from codeforces_analyzer.registry import default_registry
+
+TAGS = (("dp",), ("graphs", "dfs and similar"), ("math",), ("dp", "math"), ("greedy",))
+
+
+def history(count, start_id=1, now=None):
+    """count accepted submissions over count problems and TAGS, newest first"""
+    now = now or int(time.time())
+    rows = [submission(start_id + i, 1000 + i, "A", rating=800 + 100 * (i % 20),
+                       tags=TAGS[i % len(TAGS)], time=now - (count - i) * 3600)
+            for i in range(count)]
+    return rows[::-1]
+
+
+def site_files(site_dir):
+    files = {}
+    for name in sorted(os.listdir(site_dir)):
+        with open(os.path.join(site_dir, name), 'rb') as f:
+            files[name] = f.read()
+    return files
+
+
+def test_generate_writes_and_registers_a_site(client, tmp_path):
+    client.submissions["x"] = history(40)
+    out = str(tmp_path / "out")
+    index_path = generate_directory("x", [], out)
+    site_dir = os.path.join(out, "codeforces_x")
+    assert index_path == os.path.join(site_dir, "index.html")
+    assert os.path.islink(site_dir)
+    for name in ("index.html", "style.css", "dp.html", "search.js", "stats.html",
+                 "timeline.html", "timeline.json", "manifest.json"):
+        assert os.path.exists(os.path.join(site_dir, name)), name
+    assert load_manifest(site_dir)["output"] == "pages"
+    assert default_registry().get(site_dir)["username"] == "x"
+
+
+def test_update_without_new_submissions_writes_nothing(client, tmp_path):
+    client.submissions["x"] = history(40)
+    out = str(tmp_path / "out")
+    generate_directory("x", [], out)
+    site_dir = os.path.join(out, "codeforces_x")
+    releases = publish.list_releases(site_dir)
+
+    metrics = Metrics()
+    update_directory(site_dir, "x", [], metrics=metrics)
+    assert metrics.counters["pages_written"] == 0
+    assert metrics.counters["pages_unchanged"] > 0
+    # The live release is kept and no staging is left behind
+    assert publish.list_releases(site_dir) == releases
+
+
+def test_update_with_a_new_solve_publishes_a_release(client, tmp_path):
+    client.submissions["x"] = history(40)
+    out = str(tmp_path / "out")
+    generate_directory("x", [], out)
+    site_dir = os.path.join(out, "codeforces_x")
+    before = publish.current_release(site_dir)
+
+    client.submissions["x"] = [submission(100, 2000, "B", tags=("greedy",))] + \
+        client.submissions["x"]
+    metrics = Metrics()
+    update_directory(site_dir, "x", [], metrics=metrics)
+    assert metrics.counters["submissions_new"] == 1
+    assert 0 < metrics.counters["pages_written"] < len(load_manifest(site_dir)["pages"])
+    assert publish.current_release(site_dir) != before
+    with open(os.path.join(site_dir, "greedy.html"), encoding='utf-8') as f:
+        assert "2000B" in f.read()
+
+
+def test_site_keeps_its_output_mode_and_compression(client, tmp_path):
+    client.submissions["x"] = history(40)
+    out = str(tmp_path / "out")
+    generate_directory("x", [], out, output="bundle", compress=True)
+    site_dir = os.path.join(out, "codeforces_x")
+    assert not os.path.exists(os.path.join(site_dir, "dp.html"))
+    assert os.path.exists(os.path.join(site_dir, "data.js.gz"))
+
+    update_directory(site_dir, "x", [])
+    manifest = load_manifest(site_dir)
+    assert manifest["output"] == "bundle" and manifest["compress"]
+
+    update_directory(site_dir, "x", [], compress=False)
+    assert not os.path.exists(os.path.join(site_dir, "data.js.gz"))
+
+
+def test_timeline_page_is_not_rewritten_the_next_day(client, tmp_path, monkeypatch):
+    client.submissions["x"] = history(40)
+    out = str(tmp_path / "out")
+    generate_directory("x", [], out)
+    site_dir = os.path.join(out, "codeforces_x")
+
+    tomorrow = time.time() + timeline.DAY
+    monkeypatch.setattr(timeline.time, "time", lambda: tomorrow)
+    metrics = Metrics()
+    update_directory(site_dir, "x", [], metrics=metrics)
+    assert metrics.counters["pages_written"] == 0
+
+
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_render_pools_write_the_same_pages(client, tmp_path, pool):
+    client.submissions["x"] = history(60)
+    generate_directory("x", [], str(tmp_path / "sequential"))
+    generate_directory("x", [], str(tmp_path / pool), render_workers=3, render_pool=pool)
+    sequential = site_files(str(tmp_path / "sequential" / "codeforces_x"))
+    pooled = site_files(str(tmp_path / pool / "codeforces_x"))
+    # The index and manifest carry the time of the run
+    for name in ("index.html", "manifest.json"):
+        del sequential[name], pooled[name]
+    assert pooled == sequential
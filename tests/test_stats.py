@@ -0,0 +1,33 @@
+import pytest
+from conftest import submission
+
+from codeforces_analyzer import stats
+from codeforces_analyzer.core import organize_problems_by_tags
+
+
+def problems_by_tag():
+    rows = [submission(i, 100 + i % 37, "ABC"[i % 3], rating=(800 + 100 * (i % 25)) * (i % 7 > 0),
+                       tags=[("dp", "math", "greedy", "graphs")[j] for j in range(i % 4 + 1)])
+            for i in range(1, 300)]
+    return organize_problems_by_tags(rows)[0]
+
+
+def test_counts():
+    rating_stats = stats.compute_stats(problems_by_tag(), use_numpy=False)
+    assert rating_stats.buckets[0] == "800" and rating_stats.buckets[-1] == stats.UNRATED
+    assert rating_stats.tags == list(problems_by_tag())
+    # Every problem is counted once in the histogram, once per tag in the matrix
+    assert sum(rating_stats.histogram) == len({p.key for ps in problems_by_tag().values()
+                                                for p in ps})
+    assert [sum(row) for row in rating_stats.matrix] == \
+        [len(ps) for ps in problems_by_tag().values()]
+
+
+def test_numpy_and_python_count_the_same():
+    pytest.importorskip("numpy")
+    with_numpy = stats.compute_stats(problems_by_tag(), use_numpy=True)
+    without = stats.compute_stats(problems_by_tag(), use_numpy=False)
+    assert stats.render_histogram(with_numpy) == stats.render_histogram(without)
+    assert stats.render_heatmap(with_numpy) == stats.render_heatmap(without)
+    assert (with_numpy.buckets, with_numpy.histogram, with_numpy.matrix) == \
+        (without.buckets, without.histogram, without.matrix)
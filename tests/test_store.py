@@ -0,0 +1,80 @@
+from conftest import submission
+
+from codeforces_analyzer.api import CodeforcesAPIError
+from codeforces_analyzer.core import fetch_user_submissions
+from codeforces_analyzer.store import SubmissionStore
+
+
+def ids(submissions):
+    return [s["id"] for s in submissions]
+
+
+def test_update_keeps_accepted_submissions_and_the_high_water_mark(tmp_path):
+    store = SubmissionStore(str(tmp_path))
+    result = store.update("Tourist", [submission(5, 1, "A"), submission(4, 1, "B", "WRONG_ANSWER"),
+                                      submission(3, 1, "B")])
+    assert ids(result) == [5, 3]
+    assert result.new_count == 3 and result.total == 3
+    # Handles are case-insensitive
+    assert store.last_id("tourist") == 5
+    assert store.header("TOURIST")["accepted"] == 2
+
+
+def test_update_only_adds_submissions_above_the_mark(tmp_path):
+    store = SubmissionStore(str(tmp_path))
+    store.update("x", [submission(3, 1, "A"), submission(1, 1, "B")])
+    # A page that shifted under us repeats rows the store already has
+    result = store.update("x", [submission(7, 2, "A"), submission(6, 2, "B"),
+                                submission(3, 1, "A")])
+    assert ids(result) == [7, 6, 3, 1]
+    assert result.new_count == 2 and result.total == 4
+    assert store.last_id("x") == 7
+
+
+def test_pending_submission_holds_back_the_mark(tmp_path):
+    store = SubmissionStore(str(tmp_path))
+    result = store.update("x", [submission(9, 3, "A"), submission(8, 3, "B", "TESTING"),
+                                submission(7, 3, "C"), submission(5, 2, "A")])
+    # Everything from the pending one up is handed out but not stored
+    assert store.last_id("x") == 7
+    assert ids(result.unsaved) == [9]
+    assert ids(result) == [9, 7, 5]
+    assert ids(store.iter_accepted("x")) == [7, 5]
+
+    # Once judged, it and everything above it are fetched and stored once
+    result = store.update("x", [submission(10, 4, "A"), submission(9, 3, "A"),
+                                submission(8, 3, "B")])
+    assert store.last_id("x") == 10
+    assert ids(result) == [10, 9, 8, 7, 5]
+    assert result.total == 5
+
+
+def test_fetch_pages_from_the_mark(client):
+    client.submissions["x"] = [submission(i, i, "A") for i in range(30, 0, -1)]
+    fetch_user_submissions("x")
+    assert client.user_status_calls("x") == [{"handle": "x"}]
+
+    client.submissions["x"] = [submission(32, 32, "A"), submission(31, 31, "A")] + \
+        client.submissions["x"]
+    result = fetch_user_submissions("x")
+    assert result.new_count == 2 and len(ids(result)) == 32
+    # Paged, stopping at the first page that reaches the stored mark
+    calls = client.user_status_calls("x")
+    assert len(calls) == 2 and calls[1]["from"] == 1
+
+
+def test_fetch_falls_back_to_the_store_on_a_transient_error(client):
+    client.submissions["x"] = [submission(2, 1, "A"), submission(1, 1, "B")]
+    fetch_user_submissions("x")
+    client.failures["x"] = CodeforcesAPIError("HTTP 503", retryable=True)
+    lines = []
+    result = fetch_user_submissions("x", lines.append)
+    assert ids(result) == [2, 1]
+    assert any("Using stored submissions" in line for line in lines)
+
+
+def test_refetch_starts_over(client):
+    client.submissions["x"] = [submission(2, 1, "A"), submission(1, 1, "B")]
+    fetch_user_submissions("x")
+    client.submissions["x"] = [submission(1, 1, "B")]
+    assert ids(fetch_user_submissions("x", refetch=True)) == [1]